@@ -0,0 +1,320 @@
+"""
+Benchmarks of 'melancholia.py' module
+
+The script prints 1D (vertically and horizontally) and 2D NumPy arrays of
+sizes from 10 up to 10^8 entries, with integer, floating point and NaN-heavy
+entries, in several formats and with lines wrapped by 'iMaxCols' and
+'iMaxEntr'. Every case is timed for printA and dumpA, and for two baselines:
+numpy.savetxt and numpy.array2string. The number of printed entries per
+second and bytes per second are reported, and all the results are saved to
+a JSON file, so that the results of two versions can be compared.
+
+Run it:
+$ python benchmark.py
+
+Options:
+$ python benchmark.py --max-size 100000000     (up to 10^8 entries)
+$ python benchmark.py --output results.json    (JSON file with results)
+$ python benchmark.py --compare old.json       (compare with old results)
+$ python benchmark.py --quick                  (only a few cases)
+
+
+*License*:
+    BSD 2-Clause
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import numpy as np
+import melancholia
+
+# Sizes of benchmarked arrays (the number of entries)
+lSizes = [10, 1000, 100000, 1000000, 10000000, 100000000]
+
+# Layouts of benchmarked arrays: name, the number of dimensions and bVert1D
+lLayouts = [('1Dvert', 1, 1), ('1Dhori', 1, 0), ('2D', 2, 1)]
+
+# Kinds of entries and formats used to print them
+dFormats = {'int': ['%d', '%.2f'],
+            'float': ['%f', '%.3f', '%.4e', '%g'],
+            'nan': ['%f', '%.4e']}
+
+# Wrapping of lines: name and the printing parameters
+lWraps = [('none', {}),
+          ('maxcols', {'iMaxCols': 80}),
+          ('maxentr', {'iMaxEntr': 10})]
+
+# Baselines are not timed for arrays larger than this (numpy.array2string
+# is very slow for large arrays)
+nMaxBaseline = 1000000
+
+
+# %%##########################################################################
+def _createArray(nDim, strData, nSize):
+    """
+    Function creates an array to be benchmarked
+
+    Input:
+
+    - 1 **nDim** (*int*)             The number of dimensions of the array
+
+    - 2 **strData** (*string*)       Kind of entries: 'int', 'float' or 'nan'
+
+    - 3 **nSize** (*int*)            The number of entries in the array
+
+    Output:
+
+    - 1 **arrA** (*NumPy array*)     The array
+
+    """
+
+    hRng = np.random.RandomState(0)
+    if strData == 'int':
+        arrA = hRng.randint(-100000, 100000, nSize)
+    else:
+        arrA = hRng.randn(nSize) * 1000
+        if strData == 'nan':
+            arrA[hRng.rand(nSize) < 0.5] = np.nan   # Half of entries is nan
+
+    # 2D arrays have up to 1000 columns
+    if nDim == 2:
+        nCols = min(nSize, 1000)
+        arrA = arrA.reshape(nSize // nCols, nCols)
+    return arrA
+
+
+# %%##########################################################################
+def _timeIt(fFunction, nRepeat):
+    """
+    Function measures the shortest time of running a function
+
+    Input:
+
+    - 1 **fFunction** (*function*)   Function to be timed, it returns
+                                     the number of printed bytes
+
+    - 2 **nRepeat** (*int*)          The number of runs
+
+    Output:
+
+    - 1 **tTime** (*float*)          The shortest time of a run [s]
+
+    - 2 **nBytes** (*int*)           The number of printed bytes
+
+    """
+
+    tTime = np.inf
+    for _ in range(nRepeat):
+        tStart = time.perf_counter()
+        nBytes = fFunction()
+        tTime = min(tTime, time.perf_counter() - tStart)
+    return (tTime, nBytes)
+
+
+# %%##########################################################################
+def _getFunctions(arrA, strFormat, bVert1D, dWrap, strFile):
+    """
+    Function creates functions which print the benchmarked array
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)     Array to be printed
+
+    - 2 **strFormat** (*string*)     Format of entries
+
+    - 3 **bVert1D** (*int*)          Is 1D array printed vertically?
+
+    - 4 **dWrap** (*dict*)           Parameters which wrap lines
+
+    - 5 **strFile** (*string*)       Name of a temporary file
+
+    Output:
+
+    - 1 **lFunctions** (*list*)      List with names of the functions and
+                                     the functions
+
+    """
+
+    def printA():
+        return len(melancholia.printA(arrA, strFormat=strFormat,
+                                      bVert1D=bVert1D, **dWrap))
+
+    def dumpA():
+        melancholia.dumpA(arrA, strFile, strFormat=strFormat,
+                          bVert1D=bVert1D, **dWrap)
+        return os.path.getsize(strFile)
+
+    def savetxt():
+        hFile = io.StringIO()
+        np.savetxt(hFile, arrA, fmt=strFormat, delimiter='   ')
+        return len(hFile.getvalue())
+
+    def array2string():
+        fFormat = (lambda x: strFormat % x)
+        strArray = np.array2string(arrA, threshold=sys.maxsize,
+                                   max_line_width=dWrap.get('iMaxCols', 75),
+                                   formatter={'int_kind': fFormat,
+                                              'float_kind': fFormat})
+        return len(strArray)
+
+    lFunctions = [('printA', printA), ('dumpA', dumpA)]
+    if arrA.size <= nMaxBaseline:
+        lFunctions += [('savetxt', savetxt), ('array2string', array2string)]
+    return lFunctions
+
+
+# %%##########################################################################
+def _iterCases(nMaxSize, bQuick):
+    """
+    Function gives all the benchmarked cases
+
+    Input:
+
+    - 1 **nMaxSize** (*int*)         The highest number of entries in
+                                     benchmarked arrays
+
+    - 2 **bQuick** (*int*)           Only a few cases?
+
+    Output:
+
+    - 1 **iterCases** (*generator*)  Generator which yields layout, the number
+                                     of dimensions, bVert1D, kind of entries,
+                                     size, format and wrapping of a case
+
+    """
+
+    for (strLayout, nDim, bVert1D) in lLayouts:
+        for strData in sorted(dFormats):
+            for nSize in lSizes:
+                if nSize > nMaxSize:
+                    continue
+                for strFormat in dFormats[strData]:
+                    for (strWrap, dWrap) in lWraps:
+
+                        # Lines of vertical 1D arrays are not wrapped
+                        if (bVert1D == 1) and (nDim == 1) and \
+                                (strWrap != 'none'):
+                            continue
+                        # Only the first format and no wrapping, if quick
+                        bOther = (strFormat != dFormats[strData][0]) or \
+                            (strWrap != 'none')
+                        if bQuick and bOther:
+                            continue
+                        yield (strLayout, nDim, bVert1D, strData, nSize,
+                               strFormat, strWrap, dWrap)
+
+
+# %%##########################################################################
+def runBenchmarks(nMaxSize, bQuick):
+    """
+    Function runs all the benchmarks
+
+    Input:
+
+    - 1 **nMaxSize** (*int*)         The highest number of entries in
+                                     benchmarked arrays
+
+    - 2 **bQuick** (*int*)           Only a few cases?
+
+    Output:
+
+    - 1 **lResults** (*list*)        List with a dictionary for every
+                                     benchmarked function in every case
+
+    """
+
+    lResults = []
+    (iFile, strFile) = tempfile.mkstemp(suffix='.txt')
+    os.close(iFile)
+    try:
+        for tCase in _iterCases(nMaxSize, bQuick):
+            (strLayout, nDim, bVert1D, strData, nSize, strFormat, strWrap,
+             dWrap) = tCase
+            arrA = _createArray(nDim, strData, nSize)
+            nRepeat = 3 if nSize <= 1000000 else 1
+            for (strFunction, fFunction) in _getFunctions(arrA, strFormat,
+                                                          bVert1D, dWrap,
+                                                          strFile):
+                (tTime, nBytes) = _timeIt(fFunction, nRepeat)
+                dResult = {'case': '%s|%s|%d|%s|%s|%s'
+                           % (strFunction, strLayout, nSize, strData,
+                              strFormat, strWrap),
+                           'function': strFunction,
+                           'layout': strLayout,
+                           'size': nSize,
+                           'data': strData,
+                           'format': strFormat,
+                           'wrap': strWrap,
+                           'time': tTime,
+                           'bytes': nBytes,
+                           'entries_per_s': nSize / tTime,
+                           'bytes_per_s': nBytes / tTime}
+                lResults.append(dResult)
+                print('%-50s %10.4f s %14.0f entries/s %14.0f B/s'
+                      % (dResult['case'], tTime, dResult['entries_per_s'],
+                         dResult['bytes_per_s']))
+                sys.stdout.flush()
+    finally:
+        os.remove(strFile)
+    return lResults
+
+
+# %%##########################################################################
+def compareResults(lResults, lOldResults):
+    """
+    Function compares results with the old results
+
+    Input:
+
+    - 1 **lResults** (*list*)        The current results
+
+    - 2 **lOldResults** (*list*)     The old results
+
+    Output: none
+
+    """
+
+    dOld = dict([(dResult['case'], dResult) for dResult in lOldResults])
+    print('\n%-50s %10s %10s %8s' % ('case', 'old [s]', 'new [s]', 'speedup'))
+    for dResult in lResults:
+        if dResult['case'] not in dOld:
+            continue
+        tOld = dOld[dResult['case']]['time']
+        print('%-50s %10.4f %10.4f %8.2f'
+              % (dResult['case'], tOld, dResult['time'],
+                 tOld / dResult['time']))
+
+
+if __name__ == '__main__':
+
+    hParser = argparse.ArgumentParser(description='Benchmarks of melancholia')
+    hParser.add_argument('--max-size', type=int, default=1000000,
+                         help='the highest number of entries in arrays')
+    hParser.add_argument('--output', default='benchmark_results.json',
+                         help='JSON file with the results')
+    hParser.add_argument('--compare', default=None,
+                         help='JSON file with old results to compare with')
+    hParser.add_argument('--quick', action='store_true',
+                         help='benchmark only a few cases')
+    hArgs = hParser.parse_args()
+
+    lResults = runBenchmarks(hArgs.max_size, hArgs.quick)
+
+    # Save the results with information about the environment
+    dOutput = {'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+               'python': platform.python_version(),
+               'numpy': np.__version__,
+               'platform': platform.platform(),
+               'results': lResults}
+    with open(hArgs.output, 'w') as hFile:
+        json.dump(dOutput, hFile, indent=1)
+
+    if hArgs.compare is not None:
+        with open(hArgs.compare) as hFile:
+            compareResults(lResults, json.load(hFile)['results'])
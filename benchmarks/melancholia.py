@@ -0,0 +1 @@
+../melancholia.py
\ No newline at end of file
@@ -6,11 +6,41 @@ This module prints NumPy arrays in a human readable way. |br|
 
         Functions which should be accessed by user:
 
-            A - dumpA:  Function prints 1D of 2D numpy array to a text file
+            A - dumpA:  Function prints 1D, 2D or N-D numpy array to a text
+                        file
 
-            B - printA:  Function prints 1D or 2D numpy array to a
+            B - printA:  Function prints 1D, 2D or N-D numpy array to a
                          string variable
 
+            C - iterA:   Function prints 1D, 2D or N-D numpy array lazily,
+                         line by line or chunk by chunk
+
+            D - adumpA:  Function prints 1D, 2D or N-D numpy array to a text
+                         file, without blocking the asyncio event loop
+
+            E - aiterA:  Function prints 1D, 2D or N-D numpy array lazily,
+                         without blocking the asyncio event loop
+
+            F - PrintStats:  Class with statistics of printing arrays
+
+            G - DumpQueue:  Class which prints numpy arrays to one text file
+                            in the background
+
+            H - Report:  Class which prints many numpy arrays, with captions,
+                         to one text file
+
+            I - loadA:   Function reads 1D, 2D or N-D numpy array printed to
+                         a text file by dumpA
+
+            J - readRows:  Function reads rows of an array written to a text
+                           file by dumpA with the index of rows
+
+            K - planA:   Function computes the layout of printing an array,
+                         which is reused by printA, dumpA and iterA
+
+            L - PrintPlan:  Class with the layout of printing 1D or 2D
+                            numpy array
+
         Internal functions:
 
             general usage:
@@ -18,18 +48,187 @@ This module prints NumPy arrays in a human readable way. |br|
                 - _printHeader:      function prints a header before a NumPy
                                      array is printed
 
+                - _iterArray:        function picks the printing function
+                                     suitable for the array
+
+                - _getWindow:        function takes the selected window of
+                                     an array
+
+                - _bufferChunks:     function collects parts of a printed
+                                     array into larger chunks
+
+                - _splitLines:       function splits parts of a printed
+                                     array into lines
+
+                - _splitChunks:      function splits parts of a printed
+                                     array into chunks of a fixed size
+
+                - _timeParts:        function measures time of printing
+                                     an array
+
+                - _addTime:          function adds time of a phase of
+                                     printing to statistics of printing
+
+                - _aiterPieces:      function takes parts of a printed
+                                     array in an executor
+
+                - _takePieces:       function takes a batch of parts of
+                                     a printed array
+
+                - _closePieces:      function closes a generator with parts
+                                     of a printed array
+
+                - _timeIO:           function runs a file operation and adds
+                                     its time to statistics of printing
+
+                - _countBytes:       function counts bytes of encoded text
+
+                - _openFile:         function opens a text file, to which
+                                     a printed array is written
+
+                - _getCompression:   function gets compression of a file
+
+                - _BorrowedFile:     class which writes text to an open
+                                     file, which is not closed
+
+                - _CompressedWriter:  class which compresses and writes text
+                                      to a file in a background thread
+
+                - _dumpMap:          function writes 2D numpy array straight
+                                     into a memory-mapped file
+
+                - _dumpMapRows:      function puts printed rows of 2D numpy
+                                     array into a memory-mapped file
+
+                - _RowIndex:         class which collects offsets of
+                                     printed rows of an array and saves
+                                     them to a sidecar file
+
+                - _getIndexName:     function gives the name of the sidecar
+                                     file with the index of rows
+
+                - _iterLineBlocks:   function reads a text file in large
+                                     blocks of whole lines
+
+                - _ArrayParser:      class which parses lines of a printed
+                                     numpy array
+
+                - _parseHeader:      function parses a header of a printed
+                                     array
+
+                - _getSlicesShape:   function computes the leading
+                                     dimensions of N-D array from the label
+                                     of its last 2D slice
+
+                - _fromString:       function converts printed entries to
+                                     numbers in one call
+
+                - _fromIntString:    function converts printed integer
+                                     entries to integers of the given type
+
+                - _loadErr:          function raises an error of reading
+                                     an array
+
                 - _decodeString:     function decodes the string with
                                      printing format
 
                 - _decodeStringErr:  function prints error message, if
                                      the given format is incorrect
 
+                - _createEntryFormat:  function creates the format which
+                                       prints one aligned entry of an array
+
+                - _formatEntries:    function prints a run of entries of
+                                     an array in one batched call
+
+                - _isBulkFormat:     function checks if entries of an array
+                                     can be printed in bulk
+
+                - _formatBulkEntries:  function prints entries of an array
+                                       in bulk
+
+                - _formatIntEntries:   function prints integer entries of an
+                                       array with '%d' format in bulk
+
+                - _formatFloatEntries:  function prints floating point
+                                        entries of an array with '%.Nf'
+                                        format in bulk
+
+                - _formatExpEntries:  function prints floating point
+                                      entries of an array with '%e' or '%g'
+                                      formats in bulk
+
+                - _splitExpEntries:  function splits floating point entries
+                                     of an array into parts printed with
+                                     '%e' or '%g' formats
+
+                - _createCharMatrix:  function creates a matrix of
+                                      characters for entries printed in bulk
+
+                - _countDigits:      function counts decimal digits in
+                                     unsigned integer entries of an array
+
+                - _printDigits:      function prints unsigned integers into
+                                     a matrix of characters
+
+                - _printDigitsAt:    function prints unsigned integers into
+                                     a matrix of characters, in their own
+                                     columns
+
+                - _iterBlocks:       function takes blocks of rows from
+                                     an array
+
+                - _getMemoryMap:     function gets the memory map of
+                                     a memory-mapped array
+
+                - _scanArray:        function scans entries of an array in
+                                     one pass
+
+                - _getEntryWidths:   function computes the highest and the
+                                     lowest number of characters in printed
+                                     entries of an array
+
+                - _getExpWidths:     function computes the highest and the
+                                     lowest number of characters in entries
+                                     printed with '%e' or '%g' formats
+
+                - _getColumnWidths:  function computes the highest number of
+                                     characters in printed entries of every
+                                     column of 2D array
+
+                - _getPlan:          function gets the layout of printing
+                                     an array
+
+                - _getCachedPlan:    function gets the layout of printing
+                                     an array from the cache
+
+                - _getIndexSize:     function computes the highest printed
+                                     index + 1
+
+                - _getEdgeSize:      function computes the number of printed
+                                     entries in a dimension of an array
+
+                - _getEdgeParts:     function takes the printed parts of
+                                     an array
+
+                - _getLines:         function computes places for entries
+                                     printed in every line
+
+                - _getSegments:      function splits printed lines into
+                                     segments of consecutive entries
+
+                - _printGap:         function prints a gap between the first
+                                     and the last printed entries
+
 
             1D array printing:
 
                 - _1DarrayVert:      function prints 1D numpy array
                                      vertically
 
+                - _1DprintBlockVert:  function prints vertically a block of
+                                      entries of 1D numpy array
+
                 - _1DarrayHori:      function prints 1D numpy array
                                      horizontally
 
@@ -52,6 +251,33 @@ This module prints NumPy arrays in a human readable way. |br|
 
                 - _2Darray:           function prints 2D numpy array
 
+                - _2DprintRows:       function prints consecutive rows of 2D
+                                      numpy array
+
+                - _2DprintBlocks:     function prints 2D numpy array block
+                                      of rows by block of rows
+
+                - _2DprintBlock:      function prints one block of rows of
+                                      2D numpy array
+
+                - _2DtakeBlock:       function takes a printed block of rows
+                                      and adds statistics of printing it
+
+                - _2DrunTasks:        function prints blocks of rows given
+                                      as tasks, in order
+
+                - _2DgetPool:         function gets a pool of processes
+                                      which print blocks of rows
+
+                - _2DclosePools:      function closes the pools of processes
+                                      (when the interpreter exits)
+
+                - _2DcutFields:       function cuts fields of columns out of
+                                      rows of 2D array printed in bulk
+
+                - _2DgetRowSizes:     function computes the number of
+                                      characters in a printed row of 2D array
+
                 - _2DgetTechnical:    function computes technical parameters
                                       of 2D-array printing
 
@@ -61,6 +287,14 @@ This module prints NumPy arrays in a human readable way. |br|
                 - _2DgetLineParam:    function computes the line printing
                                       parameters for 2D printing
 
+                - _2DgetLineWidths:   function computes the line printing
+                                      parameters for 2D printing, if every
+                                      column has its own width
+
+                - _2DcreateFieldFormats:  function creates formats which
+                                          print indices and entries of
+                                          columns with their own widths
+
                 - _2DprintColumns:    function prints indices of columns
                                       for 2D array
 
@@ -70,6 +304,14 @@ This module prints NumPy arrays in a human readable way. |br|
                 - _2DprintRow:        function prints selected entries from
                                       the current row for a 2D array
 
+            N-D array printing:
+
+                - _NDarray:           function prints N-D numpy array as 2D
+                                      slices
+
+                - _NDiterSlices:      function takes printed 2D slices of
+                                      N-D numpy array
+
 Copyright (C) <2014-2016>  Jacek Pierzchlewski
                            pierzchlewski dot jacek [at] gmail.com
 
@@ -91,15 +333,68 @@ Copyright (C) <2014-2016>  Jacek Pierzchlewski
     OS X
 """
 from __future__ import division
+import asyncio
+import atexit
+import bz2
+import collections
+import functools
+import gzip
+import io
+import itertools
+import locale
+import lzma
+import mmap
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+import tracemalloc
+import warnings
 import numpy as np
 
+# The number of characters collected before they are written to a file
+_nChrBuf = 1048576
+
+# The number of characters printed in one call in an executor (asyncio)
+_nChrBatch = 65536
+
+# The number of bytes of a file read in one block
+_nChrBlock = 8388608
+
+# The number of bytes of printed text between seek points of a compressed
+# file with the index of rows
+_nChrSeek = 4194304
+
+# The number of chunks which wait to be compressed and written to a file
+_nChunksQueue = 4
+
+# Functions which open compressed files (gzip with the default level of
+# the gzip tool, which is much faster than the highest level), and
+# extensions of compressed files
+_dCompressions = {'gzip': functools.partial(gzip.open, compresslevel=6),
+                  'bz2': bz2.open, 'xz': lzma.open}
+_dExtensions = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+# The number of layouts of printed arrays kept in the cache
+_nPlans = 256
+
+# Pools of processes which print blocks of rows of 2D arrays, one pool for
+# every number of processes, shared by all the printing functions
+_dPools = {}
+_hPoolsLock = threading.Lock()
+
 
 # %%##########################################################################
 def dumpA(arrA, strFile, strMode='w', strArrayName='', strFormat='%f',
           iRowBrake=20, strDelimiter='   ', iMaxCols=4096, iMaxEntr=np.inf,
-          bVert1D=1, bPrintHeader=0, iLineSpaces=1, iRowSpaces=1):
+          bVert1D=1, bPrintHeader=0, iLineSpaces=1, iRowSpaces=1,
+          bStream=1, iBlockSize=65536, bMemMap=0, nWorkers=1, iEdgeItems=0,
+          slcRows=None, slcCols=None, bColWidths=0, hStats=None,
+          strCompression='auto', bRowIndex=0, hPlan=None):
     """
-    Function prints 1D or 2D numpy array to a text file
+    Function prints 1D, 2D or N-D numpy array to a text file
 
     This is the function which prints a NumPy array to a text file.
     Take a look at files: 'report_1Darray_example'
@@ -110,9 +405,15 @@ def dumpA(arrA, strFile, strMode='w', strArrayName='', strFormat='%f',
 
     - 1 **arrA** (*NumPy array*)     Array to be printed
 
-    - 2 **strFile** (*string*)       Name of the file to save the array
+    - 2 **strFile** (*string*)       Name of the file to save the array,
+                                     or an open text or binary file (e.g.
+                                     sys.stdout, a pipe), or a file
+                                     descriptor. An open file is written
+                                     in large chunks, and it is flushed,
+                                     but not closed
 
-    - 3 **strMode** (*string*)       File opening mode
+    - 3 **strMode** (*string*)       File opening mode (not used for open
+                                     files)
                                      [optional, default = 'w']
 
     - 4 **strArrayName** (*string*)  Name of the array [optional, default = '']
@@ -120,7 +421,8 @@ def dumpA(arrA, strFile, strMode='w', strArrayName='', strFormat='%f',
     - 5 **strFormat** (*string*)     Format of printing entires of the array
                                      [optional, default = '%f']
                                      Acceptable formats are %d, %f, %.1f, %.2f,
-                                     %.3f, %.4f, ...
+                                     %.3f, ..., %e, %.1e, %.2e, ..., %g,
+                                     %.1g, %.2g, ...
 
     - 6 **iRowBrake** (*int*)        The number of rows before the column
                                      indices are printed again
@@ -157,24 +459,162 @@ def dumpA(arrA, strFile, strMode='w', strArrayName='', strFormat='%f',
                                      (only for 2D arrays)
                                      [optional, default = 1]
 
+    - 14 **bStream** (*int*)         Write the array to the file while it is
+                                     printed, row by row, through a buffer of
+                                     a constant size?
+                                     1 - yes, 0 - print the whole array to
+                                     a string first
+                                     [optional, default = 1]
+
+    - 15 **iBlockSize** (*int*)      The number of entries of the array which
+                                     are scanned and printed in one block
+                                     (whole rows are always taken)
+                                     [optional, default = 65536]
+
+    - 16 **bMemMap** (*int*)         Write a 2D array straight into the file
+                                     mapped to memory, every printed row at
+                                     its own offset?
+                                     1 - yes, 0 - no
+                                     (other arrays, or arrays which can not be
+                                     written in this way, are streamed)
+                                     [optional, default = 0]
+
+    - 17 **nWorkers** (*int*)        The number of processes which print
+                                     blocks of rows of a 2D array
+                                     (1D arrays are printed by one process)
+                                     [optional, default = 1]
+
+    - 18 **iEdgeItems** (*int*)      The number of the first and the last
+                                     entries (rows and columns) printed in
+                                     every dimension of the array, the rest
+                                     is replaced by '...'
+                                     [optional, default = 0 <-- the whole
+                                      array is printed]
+
+    - 19 **slcRows** (*slice*)        Rows of a 2D array (entries of a 1D
+                                     array, rows of every slice of N-D
+                                     array) which are printed, with their
+                                     indices in the whole array
+                                     [optional, default = None <-- all
+                                      the rows are printed]
+
+    - 20 **slcCols** (*slice*)        Columns of a 2D (or N-D) array
+                                     which are printed, with their indices
+                                     in the whole array
+                                     [optional, default = None <-- all
+                                      the columns are printed]
+
+    - 21 **bColWidths** (*int*)     Print every column of a 2D (or N-D)
+                                     array with its own width?
+                                     1 - yes, 0 - all the columns have
+                                     the same width
+                                     [optional, default = 0]
+
+    - 22 **hStats** (*PrintStats*)   Statistics of printing: time of phases
+                                     of printing (with time of writing to
+                                     the file), the numbers of printed
+                                     entries and bytes are added to it
+                                     [optional, default = None <-- no
+                                      statistics are collected]
+
+    - 23 **strCompression** (*string*)  Compression of the file: 'gzip',
+                                        'bz2', 'xz', '' (no compression)
+                                        or 'auto' (taken from extension
+                                        of the file: '.gz', '.bz2', '.xz').
+                                        The array is compressed in
+                                        a background thread, while it is
+                                        printed. In the 'a' (append) mode
+                                        a new compressed member is added
+                                        to the file
+                                        [optional, default = 'auto']
+
+    - 24 **bRowIndex** (*int*)       Write a sidecar file (strFile +
+                                     '.midx') with offsets of all the
+                                     printed rows and their wrapped lines,
+                                     which are read by readRows?
+                                     (only for 2D arrays and 1D arrays
+                                     printed vertically, printed whole,
+                                     and files given by their names;
+                                     the array is streamed, a compressed
+                                     file gets a new compressed member
+                                     every few MB, to be read from there)
+                                     1 - yes, 0 - no
+                                     [optional, default = 0]
+
+    - 25 **hPlan** (*PrintPlan*)     Layout of printing the array made
+                                     by planA, with the same printing
+                                     parameters: entries are not scanned
+                                     [optional, default = None <-- the
+                                      layout is computed]
+
     Output:  none
 
     """
 
-    hFile = open(strFile, strMode)
-    strArray = printA(arrA, strArrayName, strFormat, iRowBrake, strDelimiter,
-                      iMaxCols, iMaxEntr, bVert1D, bPrintHeader, iLineSpaces,
-                      iRowSpaces)
-    hFile.write(strArray)
-    hFile.close()
+    # Offsets of rows are taken from the printed text, so the array is
+    # streamed
+    hIndex = None
+    if bRowIndex == 1:
+        hIndex = _RowIndex(arrA, strFile, strMode, strCompression, bVert1D,
+                           iEdgeItems, slcRows, slcCols, strDelimiter)
+        (bMemMap, bStream) = (0, 1)
+
+    # Write a 2D array straight into the memory-mapped file, if requested
+    # (arrays printed only partly, compressed files and open files are
+    # always streamed)
+    if (bMemMap == 1) and (iEdgeItems == 0) and \
+            isinstance(strFile, (str, bytes, os.PathLike)) and \
+            (_getCompression(strFile, strCompression) == ''):
+        if _dumpMap(arrA, strFile, strMode, strArrayName, strFormat,
+                    iRowBrake, strDelimiter, iMaxCols, iMaxEntr,
+                    bPrintHeader, iLineSpaces, iRowSpaces, iBlockSize,
+                    nWorkers, slcRows, slcCols, bColWidths, hStats,
+                    hPlan) == 1:
+            return
+
+    tStart = time.perf_counter()
+    hFile = _openFile(strFile, strMode, strCompression, hIndex is not None)
+    _addTime(hStats, 'io', tStart)
+    try:
+        if bStream == 1:
+            # Write the printed array part by part
+            iterArray = _iterArray(arrA, strArrayName, strFormat, iRowBrake,
+                                   strDelimiter, iMaxCols, iMaxEntr, bVert1D,
+                                   bPrintHeader, iLineSpaces, iRowSpaces,
+                                   iBlockSize, nWorkers, iEdgeItems, slcRows,
+                                   slcCols, bColWidths, hStats, hPlan)
+            for strChunk in _bufferChunks(_timeParts(iterArray, hStats),
+                                          _nChrBuf):
+                tStart = time.perf_counter()
+                hFile.write(strChunk)
+                _addTime(hStats, 'io', tStart)
+                if hIndex is not None:
+                    hIndex.scan(strChunk, hFile)
+        else:
+            strArray = printA(arrA, strArrayName, strFormat, iRowBrake,
+                              strDelimiter, iMaxCols, iMaxEntr, bVert1D,
+                              bPrintHeader, iLineSpaces, iRowSpaces,
+                              iBlockSize, nWorkers, iEdgeItems, slcRows,
+                              slcCols, bColWidths, hStats, hPlan)
+            tStart = time.perf_counter()
+            hFile.write(strArray)
+            _addTime(hStats, 'io', tStart)
+    finally:
+        tStart = time.perf_counter()
+        hFile.close()
+        _addTime(hStats, 'io', tStart)
+    if hIndex is not None:
+        hIndex.save(hFile)
 
 
 # %%##########################################################################
 def printA(arrA, strArrayName='', strFormat='%f', iRowBrake=20,
            strDelimiter='   ', iMaxCols=4096, iMaxEntr=np.inf, bVert1D=1,
-           bPrintHeader=0, iLineSpaces=1, iRowSpaces=1):
+           bPrintHeader=0, iLineSpaces=1, iRowSpaces=1, iBlockSize=65536,
+           nWorkers=1, iEdgeItems=0, slcRows=None, slcCols=None,
+           bColWidths=0, hStats=None, hPlan=None):
     """
-    Function prints 1D or 2D numpy array to a string variable
+    Function prints 1D, 2D or N-D numpy array to a string variable
 
 
     This is the function which prints a NumPy array to a string variable.
@@ -182,6 +622,11 @@ def printA(arrA, strArrayName='', strFormat='%f', iRowBrake=20,
     and 'report_2Darray_example'
     for examples of usage.
 
+    An array with more than 2 dimensions is printed as a stream of 2D slices
+    (the last two dimensions), every slice is labelled with its leading
+    indices. Widths of entries are computed once for the whole array, so
+    all the slices share one layout and are aligned in the same way.
+
 
     Input:
 
@@ -194,7 +639,8 @@ def printA(arrA, strArrayName='', strFormat='%f', iRowBrake=20,
                                      array
                                      [optional, default = '%f']
                                      Acceptable formats are %d, %f, %.1f, %.2f,
-                                     %.3f, %.4f, ...
+                                     %.3f, ..., %e, %.1e, %.2e, ..., %g,
+                                     %.1g, %.2g, ...
 
     - 4 **iRowBrake** (*int*)        The number of rows before the column
                                      indices are printed again
@@ -230,189 +676,4803 @@ def printA(arrA, strArrayName='', strFormat='%f', iRowBrake=20,
     - 11 **iRowSpaces** (*int*)      The number of spaces between printed rows
                                      (only for 2D arrays)
                                      [optional, default = 1]
-    Output:
 
-    - 1 **strArray** (*string*)    String with entries of the numpy array
-    """
+    - 12 **iBlockSize** (*int*)      The number of entries of the array which
+                                     are scanned and printed in one block
+                                     (whole rows are always taken)
+                                     [optional, default = 65536]
 
-    # Check if the input array has 1 or 2 dimensions
-    if (arrA.ndim == 1):
+    - 13 **nWorkers** (*int*)        The number of processes which print
+                                     blocks of rows of a 2D array
+                                     (1D arrays are printed by one process)
+                                     [optional, default = 1]
 
-        # For 1 dimensinal array, the array may be printed horizontally
-        # or vertically
-        if bVert1D == 1:
-            strArray = _1DarrayVert(arrA, strArrayName, strFormat, iRowBrake,
-                                    bPrintHeader)
-        else:
-            strArray = _1DarrayHori(arrA, strArrayName, strFormat, iRowBrake,
-                                    strDelimiter, iMaxCols, iMaxEntr,
-                                    bPrintHeader, iLineSpaces)
+    - 14 **iEdgeItems** (*int*)      The number of the first and the last
+                                     entries (rows and columns) printed in
+                                     every dimension of the array, the rest
+                                     is replaced by '...'. Only the printed
+                                     entries are scanned, so huge arrays
+                                     are printed quickly
+                                     [optional, default = 0 <-- the whole
+                                      array is printed]
+
+    - 15 **slcRows** (*slice*)        Rows of a 2D array (entries of a 1D
+                                     array, rows of every slice of N-D
+                                     array) which are printed, with their
+                                     indices in the whole array
+                                     [optional, default = None <-- all
+                                      the rows are printed]
+
+    - 16 **slcCols** (*slice*)        Columns of a 2D (or N-D) array
+                                     which are printed, with their indices
+                                     in the whole array
+                                     [optional, default = None <-- all
+                                      the columns are printed]
+
+    - 17 **bColWidths** (*int*)     Print every column of a 2D (or N-D)
+                                     array with its own width?
+                                     1 - yes, 0 - all the columns have
+                                     the same width
+                                     [optional, default = 0]
 
-    elif (arrA.ndim == 2):
-        strArray = _2Darray(arrA, strArrayName, strFormat, iRowBrake,
-                            strDelimiter, iMaxCols, iMaxEntr, bPrintHeader,
-                            iLineSpaces, iRowSpaces)
+    - 18 **hStats** (*PrintStats*)   Statistics of printing: time of phases
+                                     of printing, the numbers of printed
+                                     entries and characters are added to it
+                                     [optional, default = None <-- no
+                                      statistics are collected]
 
-    # If the array has neither 1 nor 2 dimensions, it is an error
-    else:
-        strErr = 'NumPy array which is to be printed to a file must '
-        strErr += 'be of 1- or 2-dimensions!'
-        raise ValueError(strErr)
+    - 19 **hPlan** (*PrintPlan*)     Layout of printing the array made
+                                     by planA, with the same printing
+                                     parameters: entries are not scanned
+                                     [optional, default = None <-- the
+                                      layout is computed]
+
+    Output:
+
+    - 1 **strArray** (*string*)    String with entries of the numpy array
+    """
 
+    # Print the array part by part and join the parts only once
+    iterArray = _iterArray(arrA, strArrayName, strFormat, iRowBrake,
+                           strDelimiter, iMaxCols, iMaxEntr, bVert1D,
+                           bPrintHeader, iLineSpaces, iRowSpaces, iBlockSize,
+                           nWorkers, iEdgeItems, slcRows, slcCols,
+                           bColWidths, hStats, hPlan)
+    strArray = ''.join(_timeParts(iterArray, hStats))
     return strArray
 
 
 # %%##########################################################################
-def _printHeader(arrA, strArrayName, bPrintHeader):
+def iterA(arrA, strArrayName='', strFormat='%f', iRowBrake=20,
+          strDelimiter='   ', iMaxCols=4096, iMaxEntr=np.inf, bVert1D=1,
+          bPrintHeader=0, iLineSpaces=1, iRowSpaces=1, iChunkSize=0,
+          iBlockSize=65536, nWorkers=1, iEdgeItems=0, slcRows=None,
+          slcCols=None, bColWidths=0, hStats=None, hPlan=None):
     """
-    Function prints a header before a NumPy array is printed
+    Function prints 1D, 2D or N-D numpy array lazily, line by line or chunk
+    by chunk
+
+
+    This is the function which prints a NumPy array piece by piece. The array
+    is printed only as far as the returned generator is consumed, so
+    a printed array may be sent to a socket, a pager or a log without keeping
+    the whole printed array in memory. Joined pieces are exactly the same as
+    the string returned by printA.
 
 
     Input:
 
-    - 1. **arrA** (*NumPy array*)    Array to be printed
+    - 1 **arrA** (*NumPy array*)     Array to be printed
 
-    - 2 **strArrayName** (*string*)  Name of the array
+    - 2 ... 11                       The printing parameters, the same as
+                                     for printA
 
-    - 3 **bPrintHeader** (*int*)     Flag  which switched on header printing
-                                     1 - switch on, 0 - switch off
+    - 12 **iChunkSize** (*int*)      The number of characters in one piece
+                                     of the printed array. If 0, the array
+                                     is printed line by line
+                                     [optional, default = 0]
+
+    - 13 **iBlockSize** (*int*)      The number of entries of the array which
+                                     are scanned and printed in one block
+                                     [optional, default = 65536]
+
+    - 14 **nWorkers** (*int*)        The number of processes which print
+                                     blocks of rows of a 2D array
+                                     [optional, default = 1]
+
+    - 15 **iEdgeItems** (*int*)      The number of the first and the last
+                                     entries (rows and columns) printed in
+                                     every dimension of the array
+                                     [optional, default = 0 <-- the whole
+                                      array is printed]
+
+    - 16 **slcRows** (*slice*)        Rows of a 2D array (entries of a 1D
+                                     array, rows of every slice of N-D
+                                     array) which are printed, with their
+                                     indices in the whole array
+                                     [optional, default = None <-- all
+                                      the rows are printed]
+
+    - 17 **slcCols** (*slice*)        Columns of a 2D (or N-D) array
+                                     which are printed, with their indices
+                                     in the whole array
+                                     [optional, default = None <-- all
+                                      the columns are printed]
+
+    - 18 **bColWidths** (*int*)     Print every column of a 2D (or N-D)
+                                     array with its own width?
+                                     1 - yes, 0 - all the columns have
+                                     the same width
+                                     [optional, default = 0]
+
+    - 19 **hStats** (*PrintStats*)   Statistics of printing, they are
+                                     collected as far as the generator is
+                                     consumed
+                                     [optional, default = None <-- no
+                                      statistics are collected]
+
+    - 20 **hPlan** (*PrintPlan*)     Layout of printing the array made
+                                     by planA (the same as for printA)
+                                     [optional, default = None]
 
     Output:
 
-    - 1 **strArray** (*string*)    String with the header, of an empty string
-                                   if the header is switched off
+    - 1 **iterArray** (*generator*)  Generator which yields strings with
+                                     consecutive lines (or chunks) of
+                                     the printed array, lines end with '\\n'
+    """
+
+    # Get the generator with parts of the printed array
+    iterArray = _iterArray(arrA, strArrayName, strFormat, iRowBrake,
+                           strDelimiter, iMaxCols, iMaxEntr, bVert1D,
+                           bPrintHeader, iLineSpaces, iRowSpaces, iBlockSize,
+                           nWorkers, iEdgeItems, slcRows, slcCols,
+                           bColWidths, hStats, hPlan)
+    iterArray = _timeParts(iterArray, hStats)
+
+    # Split the parts into lines or chunks
+    if iChunkSize == 0:
+        return _splitLines(iterArray)
+    if iChunkSize < 0:
+        raise ValueError('The size of a chunk can not be negative!')
+    return _splitChunks(iterArray, int(iChunkSize))
 
+
+# %%##########################################################################
+async def adumpA(arrA, strFile, strMode='w', strArrayName='', strFormat='%f',
+                 iRowBrake=20, strDelimiter='   ', iMaxCols=4096,
+                 iMaxEntr=np.inf, bVert1D=1, bPrintHeader=0, iLineSpaces=1,
+                 iRowSpaces=1, iBlockSize=65536, nWorkers=1, iEdgeItems=0,
+                 slcRows=None, slcCols=None, bColWidths=0, hStats=None,
+                 hExecutor=None, strCompression='auto', hPlan=None):
     """
+    Function prints 1D, 2D or N-D numpy array to a text file, without
+    blocking the asyncio event loop
 
-    # If header printing is switched off, return an empty string
-    if bPrintHeader == 0:
-        return ''
 
-    # Print name of the array, if requested
-    if (strArrayName == ''):
-        strArray = ''
-    else:
-        strArray = ' \'%s\'  ' % (strArrayName)
+    This is the coroutine which prints a NumPy array to a text file in
+    asyncio programs. The array is printed chunk by chunk in an executor,
+    and the chunks are written to the file in the executor too, so the event
+    loop keeps running while a large array is printed. The next chunk is
+    printed while the current one is written, and no more chunks are
+    printed before they are written, so memory used by printing stays
+    bounded. The file is exactly the same as the one written by dumpA.
 
-    # Print dimension, size and type of the array
-    strType = arrA.dtype.name  # Get the name of the array
-    if arrA.ndim == 2:
-        (nRows, nCols) = arrA.shape  # Get shape of the array
-        strArray += '2D-array (shape - %d rows x %d cols, type - %s):\n' \
-            % (nRows, nCols, strType)
-    else:
-        iSize = arrA.size          # Get the size of the array
-        strArray += '1D-array (size - %d, type - %s):\n'\
-            % (iSize, strType)
 
-    return strArray
+    Input:
+
+    - 1 **arrA** (*NumPy array*)     Array to be printed
+
+    - 2 **strFile** (*string*)       Name of the file to save the array,
+                                     or an open file, or a file descriptor
+                                     (the same as for dumpA)
+
+    - 3 **strMode** (*string*)       File opening mode
+                                     [optional, default = 'w']
+
+    - 4 ... 13                       The printing parameters, the same as
+                                     for printA
+
+    - 14 **iBlockSize** (*int*)      The number of entries of the array which
+                                     are scanned and printed in one block
+                                     [optional, default = 65536]
+
+    - 15 **nWorkers** (*int*)        The number of processes which print
+                                     blocks of rows of a 2D array
+                                     [optional, default = 1]
+
+    - 16 ... 20                      The printing parameters and statistics
+                                     of printing, the same as for dumpA
+                                     (iEdgeItems, slcRows, slcCols,
+                                     bColWidths, hStats)
+
+    - 21 **hExecutor** (*Executor*)  Executor which prints and writes chunks
+                                     of the array
+                                     [optional, default = None <-- the
+                                      default executor of the event loop]
+
+    - 22 **strCompression** (*string*)  Compression of the file, the same
+                                        as for dumpA
+                                        [optional, default = 'auto']
+
+    - 23 **hPlan** (*PrintPlan*)     Layout of printing the array made
+                                     by planA (the same as for printA)
+                                     [optional, default = None]
+
+    Output:  none
+
+    """
+
+    hLoop = asyncio.get_running_loop()
+
+    # Get the generator with chunks of the printed array
+    iterArray = _iterArray(arrA, strArrayName, strFormat, iRowBrake,
+                           strDelimiter, iMaxCols, iMaxEntr, bVert1D,
+                           bPrintHeader, iLineSpaces, iRowSpaces, iBlockSize,
+                           nWorkers, iEdgeItems, slcRows, slcCols,
+                           bColWidths, hStats, hPlan)
+    iterChunks = _aiterPieces(_bufferChunks(_timeParts(iterArray, hStats),
+                                            _nChrBuf),
+                              hExecutor, _nChrBatch)
+
+    hFile = await hLoop.run_in_executor(hExecutor, _timeIO, _openFile,
+                                        hStats, strFile, strMode,
+                                        strCompression)
+    try:
+        # Write the printed array chunk by chunk
+        async for strChunk in iterChunks:
+            await hLoop.run_in_executor(hExecutor, _timeIO, hFile.write,
+                                        hStats, strChunk)
+    finally:
+        await iterChunks.aclose()
+        await hLoop.run_in_executor(hExecutor, _timeIO, hFile.close, hStats)
 
 
 # %%##########################################################################
-def _decodeString(strFormat):
+def aiterA(arrA, strArrayName='', strFormat='%f', iRowBrake=20,
+           strDelimiter='   ', iMaxCols=4096, iMaxEntr=np.inf, bVert1D=1,
+           bPrintHeader=0, iLineSpaces=1, iRowSpaces=1, iChunkSize=0,
+           iBlockSize=65536, nWorkers=1, iEdgeItems=0, slcRows=None,
+           slcCols=None, bColWidths=0, hStats=None, hExecutor=None,
+           hPlan=None):
     """
-    Function decodes the string with printing format
+    Function prints 1D, 2D or N-D numpy array lazily, line by line or chunk
+    by chunk, without blocking the asyncio event loop
+
+
+    This is the asynchronous version of iterA. It returns an asynchronous
+    generator, which yields exactly the same lines (or chunks) as iterA.
+    The lines are printed in an executor in batches, the next batch is
+    printed while the current one is consumed, so memory used by printing
+    stays bounded. The generator should be closed (aclose) if it is not
+    consumed to the end.
 
 
     Input:
 
-    - 1 **strFormat** (*string*)     Format of printing entires of the array
-                                     Acceptable formats are %d, %f, %.1f,
-                                     %.2f, %.3f, %.4f, ...
+    - 1 **arrA** (*NumPy array*)     Array to be printed
+
+    - 2 ... 19                       The printing parameters and statistics
+                                     of printing, the same as for iterA
+
+    - 20 **hExecutor** (*Executor*)  Executor which prints the array
+                                     [optional, default = None <-- the
+                                      default executor of the event loop]
+
+    - 21 **hPlan** (*PrintPlan*)     Layout of printing the array made
+                                     by planA (the same as for printA)
+                                     [optional, default = None]
 
     Output:
 
-    - 1 **bIntegerOnly** (*number*)      If 1 - only integers are printed
-                                         (no mantissa)
+    - 1 **iterArray** (*async generator*)  Asynchronous generator which
+                                           yields strings with consecutive
+                                           lines (or chunks) of the printed
+                                           array
+    """
 
-    - 2 **iNDigitsAfterDot** (*int*)     The number of digits printed after
-                                         dot
+    iterArray = iterA(arrA, strArrayName, strFormat, iRowBrake, strDelimiter,
+                      iMaxCols, iMaxEntr, bVert1D, bPrintHeader, iLineSpaces,
+                      iRowSpaces, iChunkSize, iBlockSize, nWorkers, iEdgeItems,
+                      slcRows, slcCols, bColWidths, hStats, hPlan)
+    return _aiterPieces(iterArray, hExecutor, _nChrBatch)
 
+
+# %%##########################################################################
+def loadA(strFile, strDelimiter='   ', iOffset=0, nBytes=0,
+          strCompression='auto'):
     """
+    Function reads 1D, 2D or N-D numpy array printed to a text file by
+    dumpA (or printA)
 
-    if len(strFormat) == 0:    # String cannot be empty
-        _decodeStringErr(strFormat)
 
-    # Check if the first character is '%', otherwise - error
-    if not (strFormat[0] == '%'):
-        _decodeStringErr(strFormat)
+    This is the function which reads back an array printed by melancholia.
+    1D arrays printed vertically or horizontally, 2D arrays (with wrapped
+    lines and repeated indices of columns) and N-D arrays printed as 2D
+    slices are read. If the array was printed with a header, the shape and
+    the type of entries are taken from the header, and lines before the
+    header are skipped (e.g. a caption). Otherwise, the shape is taken from
+    the printed indices, and entries are read as float64.
 
-    # -----------------------------------------------------------------------
-    # Check if the second character is 'd', 'f' or '.':
+    The file is mapped to memory (compressed files are decompressed on the
+    fly) and read in large blocks, and entries of a whole block are
+    converted to numbers in one call, so large files are read quickly.
+    Only the first array in the file (from iOffset) is read: reading stops
+    at the next header. Arrays printed only partly (with '...') can not be
+    read.
 
-    # -----------------------------------------------------------------------
-    # It is 'd':
-    if (strFormat[1] == 'd'):
-        # It must be the last element in the format string
-        if len(strFormat) > 2:
-            _decodeStringErr(strFormat)
-        bIntegerOnly = 1
-        iNDigitsAfterDot = 0
 
-    # -----------------------------------------------------------------------
-    # It is 'f':
-    elif (strFormat[1] == 'f'):  # It is 'f'
-        # It must be the last element in the format string
-        if len(strFormat) > 2:
-            _decodeStringErr(strFormat)
-        bIntegerOnly = 0
-        iNDigitsAfterDot = 6
+    Input:
 
-    # -----------------------------------------------------------------------
-    # It is '.' (dot):
-    elif (strFormat[1] == '.'):  # It is dot
+    - 1 **strFile** (*string*)       Name of the file with the array
 
-        if len(strFormat) == 2:    # Dot can not be the last digit
-            _decodeStringErr(strFormat)
+    - 2 **strDelimiter** (*string*)  Delimiter printed between the entries
+                                     of the array
+                                     [optional, default = '   ']
 
-        # There must be a number after the dot
-        if not ('0' <= strFormat[2] <= '9'):
-            _decodeStringErr(strFormat)
+    - 3 **iOffset** (*int*)          Offset of the array in the file [bytes]
+                                     (in the uncompressed text, if the file
+                                     is compressed)
+                                     [optional, default = 0]
 
-        # Now read all the numbers after dot
-        iNDigitsAfterDot = 0   # Number after dot
-        for inxChr in np.arange(2, len(strFormat) - 1):  # Loop over all
-            cChr = strFormat[inxChr]
-            if not ('0' <= cChr <= '9'):
-                _decodeStringErr(strFormat)
+    - 4 **nBytes** (*int*)           The number of bytes read from the file
+                                     [optional, default = 0 <-- to the end
+                                      of the file]
 
-            # Translate from character to the number
-            iChrNum = ord(cChr) - 48
+    - 5 **strCompression** (*string*)  Compression of the file, the same
+                                       as for dumpA
+                                       [optional, default = 'auto']
 
-            # Update the number after dot
-            iNDigitsAfterDot = iNDigitsAfterDot * 10 + iChrNum
-            bIntegerOnly = 0
+    Output:
 
-        # The last letter after the number must be 'f'
-        if not ((strFormat[len(strFormat) - 1]) == 'f'):
-            _decodeStringErr(strFormat)
+    - 1 **arrA** (*NumPy array*)     The array read from the file
 
-    # -----------------------------------------------------------------------
-    # The second character is neither 'd', 'f' nor '.', which is incorrect
-    else:
-        _decodeStringErr(strFormat)
+    """
 
-    return (bIntegerOnly, iNDigitsAfterDot)
+    hParser = _ArrayParser(strDelimiter)
+    for lLines in _iterLineBlocks(strFile, iOffset, nBytes, strCompression):
+        if hParser.parseLines(lLines) == 1:
+            break
+    return hParser.getArray()
 
 
-# Print error message, if the given format is incorrect
-def _decodeStringErr(strFormat):
+# %%##########################################################################
+def readRows(strFile, iStart=0, iStop=None):
+    """
+    Function reads rows of an array written to a text file by dumpA with
+    the index of rows
+
+
+    This is the function which reads only the selected rows of a large
+    array written by dumpA with bRowIndex=1. Offsets of the rows are taken
+    from the sidecar file with the index of rows (strFile + '.midx'), and
+    reading of the file starts straight at the first selected row, so the
+    file is not scanned. A compressed file is read from the nearest seek
+    point before the first selected row (a start of a compressed member).
+    Seek points are put only between written chunks of the printed array,
+    when at least 4 MB of text was written since the previous seek point,
+    so random access to a compressed file is per block: up to a few MB of
+    text before the first selected row are decompressed, however few rows
+    are read.
+
+    Rows are counted in the printed array (if only a window of the array
+    was printed, the first printed row is row 0). Entries of 1D array
+    printed vertically are its rows.
+
+
+    Input:
+
+    - 1 **strFile** (*string*)       Name of the file with the array
+
+    - 2 **iStart** (*int*)           The first read row
+                                     [optional, default = 0]
+
+    - 3 **iStop** (*int*)            The row after the last read row
+                                     (the same as in slices, negative
+                                     values are counted from the end)
+                                     [optional, default = None <-- rows
+                                      up to the last row are read]
+
+    Output:
+
+    - 1 **arrA** (*NumPy array*)     The read rows
+
+    """
+
+    with np.load(_getIndexName(strFile)) as dIndex:
+        arrLines = dIndex['lines']
+        arrRows = dIndex['rows']
+        arrSeeks = dIndex['seeks']
+        tShape = tuple(dIndex['shape'])
+        dType = np.dtype(str(dIndex['type']))
+        strDelimiter = str(dIndex['delimiter'])
+        strCompression = str(dIndex['compression'])
+        nFileBytes = int(dIndex['size'])
+    if os.path.getsize(strFile) < nFileBytes:
+        raise ValueError('The index of rows does not match the file (the file '
+                         'was written again)!')
+
+    (iStart, iStop, _) = slice(iStart, iStop).indices(arrRows.size - 1)
+    iStop = max(iStop, iStart)
+    iFrom = int(arrLines[arrRows[iStart]])
+    iTo = int(arrLines[arrRows[iStop]])
+
+    # Reading starts at the nearest seek point before the first row
+    iSeek = np.searchsorted(arrSeeks[:, 0], iFrom, side='right') - 1
+    (iText, iFileOffset) = (int(arrSeeks[iSeek, 0]), int(arrSeeks[iSeek, 1]))
+    with open(strFile, 'rb') as hFile:
+        hFile.seek(iFileOffset)
+        if strCompression == '':
+            hFile.seek(iFrom - iText, os.SEEK_CUR)
+            bytText = hFile.read(iTo - iFrom)
+        else:
+            with _dCompressions[strCompression](hFile, 'rb') as hData:
+                hData.seek(iFrom - iText)
+                bytText = hData.read(iTo - iFrom)
+
+    hParser = _ArrayParser(strDelimiter)
+    hParser.tHeader = ((iStop - iStart,) + tShape[1:], dType)
+    hParser.parseLines(bytText.split(b'\n'))
+    return hParser.getArray()
+
+
+# %%##########################################################################
+def planA(arrA, strFormat='%f', iRowBrake=20, strDelimiter='   ',
+          iMaxCols=4096, iMaxEntr=np.inf, bVert1D=1, iBlockSize=65536,
+          iEdgeItems=0, slcRows=None, slcCols=None, bColWidths=0):
+    """
+    Function computes the layout of printing 1D, 2D or N-D numpy array
+
+
+    This is the function for printing many arrays of the same shape with
+    the same printing parameters. Entries of the array are scanned once,
+    and the returned layout is given to printA, dumpA or iterA (hPlan),
+    which then only print entries of the arrays. The layout can be pickled
+    and sent to other processes.
+
+    Arrays printed with the layout must have the same shape (N-D arrays:
+    the same two last dimensions) and must be printed with the same
+    printing parameters, otherwise ValueError is raised. Their entries
+    must not be printed with more characters than entries of the array the
+    layout was made for, if they are, printed columns are not aligned.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)     Array for which the layout is computed
+
+    - 2 ... 12                       The printing parameters, the same as
+                                     for iterA
+                                     (strFormat, iRowBrake, strDelimiter,
+                                     iMaxCols, iMaxEntr, bVert1D,
+                                     iBlockSize, iEdgeItems, slcRows,
+                                     slcCols, bColWidths)
+
+    Output:
+
+    - 1 **hPlan** (*PrintPlan*)      The layout of printing the array
+
+    """
+
+    if iEdgeItems < 0:
+        raise ValueError('The number of edge items can not be negative!')
+    iEdgeItems = int(iEdgeItems)
+    (arrA, rRows, rCols) = _getWindow(arrA, slcRows, slcCols)
+    if arrA.ndim == 0:
+        strErr = 'NumPy array which is to be printed to a file must '
+        strErr += 'have at least 1 dimension!'
+        raise ValueError(strErr)
+
+    # The layout is computed with the same parameters as the printing
+    # functions use for 1D array printed vertically, 1D array printed
+    # horizontally, and 2D (N-D) array
+    if (arrA.ndim == 1) and (bVert1D == 1):
+        return _getPlan(arrA, strFormat, iRowBrake, '', 0, 0, 1, iBlockSize,
+                        iEdgeItems, rRows, None, 0, None)
+    if arrA.ndim == 1:
+        return _getPlan(arrA, strFormat, iRowBrake, strDelimiter, iMaxCols,
+                        iMaxEntr, 0, iBlockSize, iEdgeItems, rRows, None, 0,
+                        None)
+    return _getPlan(arrA, strFormat, iRowBrake, strDelimiter, iMaxCols,
+                    iMaxEntr, 0, iBlockSize, iEdgeItems, rRows, rCols,
+                    bColWidths, None)
+
+
+# %%##########################################################################
+class PrintPlan(object):
+    """
+    Class with the layout of printing 1D or 2D numpy array
+
+    The layout is everything which is needed to print any part of an array:
+    printing equalization spaces, the line printing parameters, the format
+    of entries and printed indices of columns. It depends only on the shape
+    of an array, the printing parameters and the highest and the lowest
+    number of characters in printed entries, so arrays which share all of
+    these are printed with the same layout. Layouts are kept in a cache
+    (see _getCachedPlan), and they can be pickled and sent to other
+    processes. A layout made by planA can be given to printA, dumpA and
+    iterA, so that entries of arrays are not scanned again (tParams keeps
+    the shape and the printing parameters the layout was made for).
+
+    If only the first and the last iEdgeItems entries (rows and columns)
+    are printed, the layout has a gap printed with '...' between them.
+    Printed indices of rows (entries) and columns are taken from ranges
+    rRows and rCols, so a window of a larger array is printed with indices
+    in the larger array.
+
+    If widths of printed columns of 2D array are given in tColWidths, every
+    column is printed in its own field: as wide as the widest entry and
+    the index of the column. Lines are wrapped after as many fields as fit
+    in a line.
+
+    Attributes of a layout of 1D array:
+
+        nEnt, nD, nMaxChrInd, nMaxChrEnt, nMinChrEnt, lSpacesInd,
+        lSpacesEnt, strAddSpaceInd, strAddSpaceEnt, iRowBrake, iEdgeItems,
+        rRows (printed indices of entries) and, if the array is printed
+        horizontally, nLines, nEntrypLine, nEntrypLastLine, strEntryFormat,
+        nEntV (the number of printed entries), lSegments (see _getSegments),
+        strGapInd, strGapEnt (printed gaps between indices and entries)
+
+    Attributes of a layout of 2D array:
+
+        nRows, nCols, nD, nMaxChrEnt, nMinChrEnt, nMaxChrIndR, nMaxChrIndC,
+        lSpacesIndC, lSpacesIndR, lSpacesEnt, strAddSpaceIndC,
+        strAddSpaceEnt, nLines, nEntrypLine, nEntrypLastLine, iRowBrake,
+        iEdgeItems, rRows, rCols (printed indices of rows and columns),
+        strEntryFormat, nColsV (the number of printed columns),
+        lSegments (see _getSegments), strGapInd, strGapEnt (printed gaps
+        between indices of columns and entries), lColumns (printed indices
+        of columns, one string for every line of a row), tColWidths,
+        arrFieldStart (index of the first character of every printed column
+        in a printed row) and, if every column has its own width, lFields
+        (widths of fields of printed columns), arrFieldMask (characters of
+        uniformly printed entries kept in the fields) and lFormats (formats
+        which print entries of every segment of every line)
+    """
+
+    def __init__(self, tShape, nMaxChrEnt, nMinChrEnt, strFormat='%f',
+                 iRowBrake=20, strDelimiter='   ', iMaxCols=4096,
+                 iMaxEntr=np.inf, bVert1D=1, iEdgeItems=0, rRows=None,
+                 rCols=None, tColWidths=None):
+        """
+        Input:
+
+        - 1 **tShape** (*tuple*)         Shape of the array to be printed
+
+        - 2 **nMaxChrEnt** (*int*)       The maximum number of characters
+                                         in entries of the array
+
+        - 3 **nMinChrEnt** (*int*)       The minimum number of characters
+                                         in entries of the array
+
+        - 4 ... 10                       The printing parameters, the same
+                                         as for printA
+                                         (strFormat, iRowBrake, strDelimiter,
+                                         iMaxCols, iMaxEntr, bVert1D,
+                                         iEdgeItems)
+
+        - 11 **rRows** (*range*)         Printed indices of rows (entries)
+                                         [optional, default = None <--
+                                          range(number of rows)]
+
+        - 12 **rCols** (*range*)         Printed indices of columns
+                                         [optional, default = None <--
+                                          range(number of columns)]
+
+        - 13 **tColWidths** (*tuple*)    The maximum number of characters
+                                         in entries of every printed column
+                                         [optional, default = None <-- all
+                                          the columns have the same width]
+
+        """
+
+        self.tShape = tuple(tShape)
+        self.strFormat = strFormat
+        self.strDelimiter = strDelimiter
+        self.nMaxChrEnt = int(nMaxChrEnt)
+        self.nMinChrEnt = int(nMinChrEnt)
+        self.iRowBrake = int(iRowBrake)
+        self.iEdgeItems = int(iEdgeItems)
+        self.tColWidths = tColWidths
+
+        # Printed indices of rows (entries) and columns
+        if rRows is None:
+            rRows = range(self.tShape[0])
+        if (rCols is None) and (len(self.tShape) > 1):
+            rCols = range(self.tShape[1])
+        self.rRows = rRows
+        self.rCols = rCols
+
+        # The shape and the printing parameters the layout was made for
+        self.tParams = (self.tShape, strFormat, iRowBrake, strDelimiter,
+                        iMaxCols, iMaxEntr, bVert1D, iEdgeItems, rRows, rCols,
+                        tColWidths is not None)
+
+        if len(self.tShape) == 1:
+            self._plan1D(iMaxCols, iMaxEntr, bVert1D)
+        else:
+            self._plan2D(iMaxCols, iMaxEntr)
+
+    def _plan1D(self, iMaxCols, iMaxEntr, bVert1D):
+        """
+        Method computes the layout of 1D array printing
+
+        Input:
+
+        - 1 **iMaxCols** (*int*)         The maximum number of text columns
+                                         used to print a single line
+
+        - 2 **iMaxEntr** (*int*)         The maximum number of entries
+                                         printed in a single line
+
+        - 3 **bVert1D** (*int*)          Is the array printed vertically?
+
+        Output: none
+
+        """
+
+        # Get technial parameters of 1D array printing
+        self.nEnt = self.tShape[0]
+        (self.nD, self.nMaxChrInd) = \
+            _1DgetTechnical(_getIndexSize(self.rRows), self.strDelimiter)
+
+        # Get the printing equalization spaces
+        (self.lSpacesInd, self.lSpacesEnt, self.strAddSpaceInd,
+         self.strAddSpaceEnt) = \
+            _1DcreateEqSpaces(self.nMaxChrInd, self.nMaxChrEnt,
+                              self.nMinChrEnt)
+
+        # Lines are wrapped only if the array is printed horizontally
+        if bVert1D == 1:
+            return
+
+        # The number of printed entries, and the number of printed places
+        # for entries (the gap between the first and the last entries takes
+        # the place of one entry)
+        self.nEntV = _getEdgeSize(self.nEnt, self.iEdgeItems)
+        nEntP = self.nEntV + (self.nEntV < self.nEnt)
+
+        # Get the line printing parameters: the number of lines and number of
+        # entries in one line
+        (nLines, nEntrypLine, nEntrypLastLine) = \
+            _1DgetLineParam(iMaxCols, iMaxEntr, nEntP, self.nD,
+                            self.nMaxChrEnt, self.strAddSpaceEnt)
+        self.nLines = int(nLines)
+        self.nEntrypLine = int(nEntrypLine)
+        self.nEntrypLastLine = int(nEntrypLastLine)
+        self.lSegments = _getSegments(
+            _getLines(self.nLines, self.nEntrypLine, self.nEntrypLastLine),
+            self.nEnt, self.nEntV)
+
+        # Create the format which prints one aligned entry
+        self.strEntryFormat = \
+            _createEntryFormat(self.strFormat, self.nMaxChrEnt,
+                               self.strAddSpaceEnt, self.strDelimiter)
+
+        # Print the gaps between the first and the last entries
+        self.strGapInd = \
+            _printGap(len(self.strAddSpaceInd) + self.nMaxChrInd) + \
+            self.nD * ' '
+        self.strGapEnt = \
+            _printGap(len(self.strAddSpaceEnt) + self.nMaxChrEnt) + \
+            self.strDelimiter
+
+    def _plan2D(self, iMaxCols, iMaxEntr):
+        """
+        Method computes the layout of 2D array printing
+
+        Input:
+
+        - 1 **iMaxCols** (*int*)         The maximum number of text columns
+                                         used to print a single row
+
+        - 2 **iMaxEntr** (*int*)         The maximum number of entries
+                                         printed in a single line
+
+        Output: none
+
+        """
+
+        # Get technical parameters of 2D array printing
+        (self.nRows, self.nCols) = self.tShape
+        (self.nD, self.nMaxChrIndR, self.nMaxChrIndC) = \
+            _2DgetTechnical(_getIndexSize(self.rRows),
+                            _getIndexSize(self.rCols), self.strDelimiter)
+
+        # Get the printing equalization spaces
+        (self.lSpacesIndC, self.lSpacesIndR, self.lSpacesEnt,
+         self.strAddSpaceIndC, self.strAddSpaceEnt) = \
+            _2DcreateEqSpaces(self.nMaxChrEnt, self.nMaxChrIndR,
+                              self.nMaxChrIndC, self.nMinChrEnt)
+
+        # The number of printed columns, and the number of printed places
+        # for columns (the gap between the first and the last columns takes
+        # the place of one column)
+        self.nColsV = _getEdgeSize(self.nCols, self.iEdgeItems)
+        nColsP = self.nColsV + (self.nColsV < self.nCols)
+
+        # Every column has the same width: get the line printing
+        # parameters, the number of lines and number of entries in one line
+        if self.tColWidths is None:
+            (nLines, nEntrypLine, nEntrypLastLine) = \
+                _2DgetLineParam(iMaxCols, iMaxEntr, nColsP, self.nD,
+                                self.nMaxChrEnt, self.nMaxChrIndR,
+                                self.strAddSpaceEnt)
+            lLines = _getLines(int(nLines), int(nEntrypLine),
+                               int(nEntrypLastLine))
+
+        # Every column has its own width: a field of a column is as wide as
+        # the widest entry and the index of the column, the gap between
+        # the first and the last columns takes a field of 3 characters
+        else:
+            self.lFields = \
+                [max(nChrCol, len('%d:' % self.rCols[iCol]))
+                 for (iCol, nChrCol) in zip(self._getPrintedColumns(),
+                                            self.tColWidths)]
+            lPlaces = [nField + self.nD for nField in self.lFields]
+            if nColsP > self.nColsV:
+                lPlaces.insert(self.nColsV // 2, 3 + self.nD)
+            lLines = _2DgetLineWidths(iMaxCols, iMaxEntr, lPlaces,
+                                      self.nMaxChrIndR)
+        self.nLines = len(lLines)
+        self.nEntrypLine = max([iStop - iStart for (iStart, iStop) in lLines])
+        self.nEntrypLastLine = lLines[-1][1] - lLines[-1][0]
+        self.lSegments = _getSegments(lLines, self.nCols, self.nColsV)
+
+        # If rows must be broke into many lines, indices of
+        # columns must be printed after every row
+        if (self.nLines > 1):
+            self.iRowBrake = 1
+
+        # Create the format which prints one aligned entry
+        self.strEntryFormat = \
+            _createEntryFormat(self.strFormat, self.nMaxChrEnt,
+                               self.strAddSpaceEnt, self.strDelimiter)
+
+        # Print the gaps between the first and the last columns
+        if self.tColWidths is None:
+            self.strGapInd = \
+                _printGap(len(self.strAddSpaceIndC) + self.nMaxChrIndC) + \
+                self.nD * ' '
+            self.strGapEnt = \
+                _printGap(len(self.strAddSpaceEnt) + self.nMaxChrEnt) + \
+                self.strDelimiter
+        else:
+            self.strGapInd = _printGap(3) + self.nD * ' '
+            self.strGapEnt = _printGap(3) + self.strDelimiter
+
+        # Index of the first character of every printed column in a row of
+        # entries (printed columns are uniform, or they are fields which
+        # are cut out from uniformly printed entries)
+        nChr1Entry = len(self.strAddSpaceEnt) + self.nMaxChrEnt + self.nD
+        if self.tColWidths is None:
+            self.arrFieldStart = np.arange(self.nColsV + 1) * nChr1Entry
+        else:
+            arrPlaces = np.array(self.lFields, dtype=np.intp) + self.nD
+            self.arrFieldStart = np.concatenate(([0], np.cumsum(arrPlaces)))
+            self.arrFieldMask = \
+                np.arange(nChr1Entry)[np.newaxis, :] >= \
+                (nChr1Entry - arrPlaces)[:, np.newaxis]
+            self.arrFieldMask = self.arrFieldMask.ravel()
+
+        # Print indices of columns for every line of a row: space which is
+        # over indices of rows + 2 characters margin, indices of columns
+        # in every segment of the line. If every column has its own width,
+        # create also the formats which print entries of every segment.
+        self.lColumns = []
+        self.lFormats = []
+        for lSegments in self.lSegments:
+            lColumns = [(self.nMaxChrIndR + 2) * ' ']
+            lFormats = []
+            for tSegment in lSegments:
+                if tSegment is None:
+                    lColumns.append(self.strGapInd)
+                    lFormats.append(None)
+                    continue
+                (iStartVis, iStartCol, nEntries) = tSegment
+                rInd = self.rCols[iStartCol:iStartCol + nEntries]
+                if self.tColWidths is None:
+                    lColumns.append(
+                        _2DprintColumns(rInd, self.strAddSpaceIndC,
+                                        self.lSpacesIndC, self.nD))
+                    continue
+                (strIndFormat, strEntryFormat) = \
+                    _2DcreateFieldFormats(
+                        self.lFields[iStartVis:iStartVis + nEntries],
+                        self.strFormat, self.strDelimiter)
+                lColumns.append(strIndFormat % tuple(rInd))
+                lFormats.append(strEntryFormat)
+            lColumns.append('\n')
+            self.lColumns.append(''.join(lColumns))
+            self.lFormats.append(lFormats)
+
+    def _getPrintedColumns(self):
+        """
+        Method gives indices of the printed columns of 2D array
+
+        Output:
+
+        - 1 **lCols** (*list*)           Indices of the printed columns
+                                         in the array
+
+        """
+
+        iEdgeItems = self.nColsV // 2
+        if self.nColsV < self.nCols:
+            return list(range(iEdgeItems)) + \
+                list(range(self.nCols - iEdgeItems, self.nCols))
+        return list(range(self.nCols))
+
+
+# %%##########################################################################
+class PrintStats(object):
+    """
+    Class with statistics of printing arrays
+
+    Statistics are collected, if an object of this class is given to printA,
+    iterA or dumpA (argument hStats). One object may be given to many calls,
+    then the statistics of all the printed arrays are added up.
+
+    Time of printing is split into phases:
+
+        'decode'   - decoding of the format of entries,
+        'widths'   - scanning of entries for their widths,
+        'layout'   - computing of the layout of the printed array
+                     (printing equalization spaces, the line printing
+                     parameters, indices of columns),
+        'format'   - formatting of entries,
+        'assembly' - the rest of printing: joining of printed entries with
+                     indices into rows and lines,
+        'io'       - writing to a file (only dumpA).
+
+    If blocks of rows are printed in many processes, 'format' is the time of
+    formatting summed over all the processes, so it may be longer than
+    the time of printing. Peak allocation is measured with module
+    tracemalloc, only if it is requested (tracing of memory slows down
+    printing), and only for memory allocated by the calling process.
+
+    Attributes:
+
+        dTimes (time of every phase [s]), nArrays (the number of printed
+        arrays), nEntries (the number of printed entries), nBytes
+        (the number of printed characters, or bytes written to files mapped
+        to memory), nPeakMemory (the highest peak of memory allocated while
+        an array was printed [bytes], 0 if not measured), bTraceMemory
+    """
+
+    # Phases of printing, in order
+    tPhases = ('decode', 'widths', 'layout', 'format', 'assembly', 'io')
+
+    def __init__(self, bTraceMemory=0):
+        """
+        Input:
+
+        - 1 **bTraceMemory** (*int*)     Measure peak allocation while arrays
+                                         are printed?
+                                         1 - yes, 0 - no
+                                         [optional, default = 0]
+
+        """
+
+        self.bTraceMemory = bTraceMemory
+        self.dTimes = dict([(strPhase, 0.0) for strPhase in self.tPhases])
+        self.nArrays = 0
+        self.nEntries = 0
+        self.nBytes = 0
+        self.nPeakMemory = 0
+
+    def addTime(self, strPhase, tTime):
+        """
+        Method adds time spent in a phase of printing
+
+        Input:
+
+        - 1 **strPhase** (*string*)      Name of the phase
+
+        - 2 **tTime** (*float*)          Time spent in the phase [s]
+
+        """
+
+        self.dTimes[strPhase] = self.dTimes[strPhase] + tTime
+
+    def merge(self, hStats):
+        """
+        Method adds statistics from another object to this object
+
+        Input:
+
+        - 1 **hStats** (*PrintStats*)    Statistics to be added
+
+        """
+
+        for strPhase in self.tPhases:
+            self.addTime(strPhase, hStats.dTimes[strPhase])
+        self.nArrays = self.nArrays + hStats.nArrays
+        self.nEntries = self.nEntries + hStats.nEntries
+        self.nBytes = self.nBytes + hStats.nBytes
+        self.nPeakMemory = max(self.nPeakMemory, hStats.nPeakMemory)
+
+    def getTotalTime(self):
+        """
+        Method gives the total time of printing
+
+        Output:
+
+        - 1 **tTime** (*float*)          Time of all the phases [s]
+
+        """
+
+        return sum(self.dTimes.values())
+
+    def report(self):
+        """
+        Method prints the statistics to a string variable
+
+        Output:
+
+        - 1 **strReport** (*string*)     String with a table with time of
+                                         every phase, and the counters
+
+        """
+
+        tTotal = self.getTotalTime()
+        lReport = ['%-10s %12s %8s\n' % ('phase', 'time [s]', 'share')]
+        for strPhase in self.tPhases + ('total',):
+            tTime = tTotal if strPhase == 'total' else self.dTimes[strPhase]
+            lReport.append('%-10s %12.6f %7.1f%%\n'
+                           % (strPhase, tTime,
+                              100 * tTime / tTotal if tTotal > 0 else 0))
+        lReport.append('arrays:  %d\n' % (self.nArrays))
+        lReport.append('entries: %d\n' % (self.nEntries))
+        lReport.append('bytes:   %d\n' % (self.nBytes))
+        if tTotal > 0:
+            lReport.append('entries per second: %.0f\n'
+                           % (self.nEntries / tTotal))
+        if self.bTraceMemory:
+            lReport.append('peak memory: %d bytes\n' % (self.nPeakMemory))
+        return ''.join(lReport)
+
+    def _startArray(self):
+        """
+        Method starts collecting statistics of printing one array
+
+        Output:
+
+        - 1 **tStart** (*tuple*)         Time of the phases measured inside
+                                         printing, so far, memory allocated
+                                         at the start, and a flag: was
+                                         tracing of memory started here?
+
+        """
+
+        tTime = sum([self.dTimes[strPhase]
+                     for strPhase in ('decode', 'widths', 'layout', 'format')])
+        nMemory = 0
+        bStarted = 0
+        if self.bTraceMemory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                bStarted = 1
+            tracemalloc.reset_peak()
+            nMemory = tracemalloc.get_traced_memory()[0]
+        return (tTime, nMemory, bStarted)
+
+    def _stopArray(self, tStart, tRender, nChr):
+        """
+        Method finishes collecting statistics of printing one array
+
+        Time of assembly is the time of printing the array, without the time
+        of the phases measured inside printing.
+
+        Input:
+
+        - 1 **tStart** (*tuple*)         Output of _startArray
+
+        - 2 **tRender** (*float*)        Time of printing the array [s]
+
+        - 3 **nChr** (*int*)             The number of printed characters
+
+        """
+
+        (tTime, nMemory, bStarted) = tStart
+        tInside = sum([self.dTimes[strPhase]
+                       for strPhase in ('decode', 'widths', 'layout',
+                                        'format')]) - tTime
+        self.addTime('assembly', max(0.0, tRender - tInside))
+        self.nBytes = self.nBytes + nChr
+        if self.bTraceMemory:
+            nPeak = tracemalloc.get_traced_memory()[1] - nMemory
+            self.nPeakMemory = max(self.nPeakMemory, nPeak)
+            if bStarted:
+                tracemalloc.stop()
+
+
+# %%##########################################################################
+class DumpQueue(object):
+    """
+    Class which prints numpy arrays to one text file in the background
+
+    Arrays put into the queue are printed and written to the file by
+    a background thread, in the order in which they were put. The file is
+    opened once, when the queue is created, and it is closed when the queue
+    is closed, so arrays may be dumped every iteration of a loop without
+    reopening the file and without waiting for the arrays to be printed.
+
+    An array is copied when it is put into the queue, so it may be changed
+    right after it is put. If arrays are not copied (bCopy = 0), the array
+    is made read-only until it is written: changing it raises an error
+    instead of changing the printed array. Only an array which owns its
+    memory (or a memory-mapped array) is made read-only, a view of another
+    array is always copied, because the other array (and its other views)
+    would stay writeable. Views made from the put array before it was put
+    are not made read-only. The number of arrays which wait
+    in the queue is limited, if the queue is full, putting an array waits
+    until there is room in the queue.
+
+    Errors of printing or writing are raised by the next call to put, flush
+    or close, arrays put after an error are not written.
+
+    Attributes:
+
+        strFile, strMode, nMaxQueue, bCopy, strCompression
+    """
+
+    def __init__(self, strFile, strMode='w', nMaxQueue=16, bCopy=1,
+                 strCompression='auto'):
+        """
+        Input:
+
+        - 1 **strFile** (*string*)       Name of the file to save the arrays,
+                                         or an open file, or a file
+                                         descriptor (the same as for dumpA)
+
+        - 2 **strMode** (*string*)       File opening mode
+                                         [optional, default = 'w']
+
+        - 3 **nMaxQueue** (*int*)        The maximum number of arrays which
+                                         wait in the queue
+                                         [optional, default = 16]
+
+        - 4 **bCopy** (*int*)            Copy arrays put into the queue?
+                                         1 - yes, 0 - the arrays are
+                                         read-only until they are written
+                                         (views of other arrays are
+                                         copied)
+                                         [optional, default = 1]
+
+        - 5 **strCompression** (*string*)  Compression of the file,
+                                           the same as for dumpA
+                                           [optional, default = 'auto']
+
+        """
+
+        if nMaxQueue < 1:
+            raise ValueError('The size of a queue must be at least 1!')
+        self.strFile = strFile
+        self.strMode = strMode
+        self.nMaxQueue = int(nMaxQueue)
+        self.bCopy = bCopy
+        self.strCompression = strCompression
+
+        self._hFile = _openFile(strFile, strMode, strCompression)
+        self._hQueue = queue.Queue(self.nMaxQueue)
+        self._hLock = threading.Lock()
+        self._dHeld = {}         # Read-only arrays: the number of waiting puts
+        self._hError = None      # The first error of the background thread
+        self._bClosed = 0
+
+        self._hThread = threading.Thread(target=self._run)
+        self._hThread.daemon = True
+        self._hThread.start()
+
+    def put(self, arrA, bWait=1, **dParams):
+        """
+        Method puts an array into the queue
+
+        Input:
+
+        - 1 **arrA** (*NumPy array*)     Array to be printed
+
+        - 2 **bWait** (*int*)            Wait, if the queue is full?
+                                         1 - yes, 0 - raise queue.Full
+                                         [optional, default = 1]
+
+        - 3 **dParams**                  The printing parameters, the same
+                                         as for printA (given by keywords,
+                                         e.g. strFormat='%.2f'), the size
+                                         of chunks is set by the queue
+
+        """
+
+        if self._bClosed:
+            raise ValueError('The queue is closed!')
+        self._raiseError()
+
+        # The parameters are checked here, an error raised by the background
+        # thread would come only with the next call
+        lParams = iterA.__code__.co_varnames[1:iterA.__code__.co_argcount]
+        for strParam in dParams:
+            if strParam == 'iChunkSize':
+                raise TypeError('The size of chunks is set by the queue, '
+                                'it can not be given to put!')
+            if strParam not in lParams:
+                raise TypeError('Unknown printing parameter: \'%s\'!'
+                                % (strParam))
+
+        # Take a snapshot of the array, or make it read-only (a view of
+        # another array is copied, the other array would stay writeable)
+        arrA = np.asanyarray(arrA)
+        if (self.bCopy == 1) or isinstance(arrA.base, np.ndarray):
+            arrA = np.array(arrA, copy=True)
+            bHeld = 0
+        else:
+            bHeld = self._hold(arrA)
+        try:
+            self._hQueue.put((arrA, dParams, bHeld), block=bool(bWait))
+        except queue.Full:
+            if bHeld:
+                self._release(arrA)
+            raise
+
+    def flush(self):
+        """
+        Method waits until all the arrays in the queue are written, and
+        flushes the file
+
+        """
+
+        self._hQueue.join()
+        if not self._bClosed:
+            self._hFile.flush()
+        self._raiseError()
+
+    def close(self):
+        """
+        Method writes all the arrays in the queue, stops the background
+        thread and closes the file
+
+        """
+
+        if not self._bClosed:
+            self._bClosed = 1
+            self._hQueue.put(None)
+            self._hThread.join()
+            self._hFile.close()
+        self._raiseError()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, hType, hValue, hTraceback):
+        self.close()
+
+    def _run(self):
+        """
+        Method which is run by the background thread: it prints arrays
+        taken from the queue and writes them to the file
+
+        """
+
+        while True:
+            tItem = self._hQueue.get()
+            try:
+                if tItem is None:
+                    return
+                (arrA, dParams, bHeld) = tItem
+                try:
+                    if self._hError is None:
+                        hStats = dParams.get('hStats')
+                        for strChunk in iterA(arrA, iChunkSize=_nChrBuf,
+                                              **dParams):
+                            _timeIO(self._hFile.write, hStats, strChunk)
+                except Exception as hError:
+                    self._hError = hError
+                finally:
+                    if bHeld:
+                        self._release(arrA)
+            finally:
+                self._hQueue.task_done()
+
+    def _hold(self, arrA):
+        """
+        Method makes an array read-only until it is written
+
+        Output:
+
+        - 1 **bHeld** (*int*)            1 - the array is released when it
+                                         is written, 0 - the array was
+                                         read-only before
+
+        """
+
+        with self._hLock:
+            iId = id(arrA)
+            if iId in self._dHeld:
+                self._dHeld[iId] = self._dHeld[iId] + 1
+                return 1
+            if not arrA.flags.writeable:
+                return 0
+            arrA.flags.writeable = False
+            self._dHeld[iId] = 1
+            return 1
+
+    def _release(self, arrA):
+        """
+        Method makes an array writeable again, if it does not wait in
+        the queue any more
+
+        """
+
+        with self._hLock:
+            iId = id(arrA)
+            self._dHeld[iId] = self._dHeld[iId] - 1
+            if self._dHeld[iId] == 0:
+                del self._dHeld[iId]
+                arrA.flags.writeable = True
+
+    def _raiseError(self):
+        """
+        Method raises the error of the background thread, if there was one
+
+        """
+
+        if self._hError is not None:
+            raise self._hError
+
+
+# %%##########################################################################
+class Report(object):
+    """
+    Class which prints many numpy arrays, with captions, to one text file
+
+    The file is opened once, when the report is created, and every added
+    array is streamed to the file chunk by chunk, so the report is never
+    kept whole in memory. Arrays of the same shape printed with the same
+    parameters share one layout from the cache of layouts. The report
+    may be used as a context manager, the file is closed at the end of
+    the 'with' block.
+
+    Offsets and sizes (in bytes) of all the added arrays are kept in
+    lIndex, and, if requested, they are written as a table of contents at
+    the end of the report. Offsets point at the printed arrays (after
+    their captions), so an array may be read back by loadA. Offsets are
+    counted from the start of the file (from the start of the report, if
+    the report is written to an open file or appended to a compressed
+    file, and in the uncompressed text, if the file is compressed).
+
+    Offsets in the uncompressed text do not point at anything in
+    a compressed file, so every array added to a compressed file (given by
+    its name) starts a new compressed member. Offsets of the members in
+    the file are kept in lFileOffsets, the file may be decompressed from
+    there, and the decompressed text starts with the array. If the file is
+    not compressed, lFileOffsets are the offsets of the arrays. Compressed
+    members can not be started in a compressed open file, and its
+    lFileOffsets are None.
+
+    Attributes:
+
+        strFile, strMode, bIndex, strCompression, lIndex (list with
+        a caption, offset and size of every added array), lFileOffsets
+        (list with offsets of every added array in the file), nBytes (size
+        of the report [bytes])
+    """
+
+    def __init__(self, strFile, strMode='w', bIndex=0, strCompression='auto'):
+        """
+        Input:
+
+        - 1 **strFile** (*string*)       Name of the file with the report,
+                                         or an open file, or a file
+                                         descriptor (the same as for dumpA)
+
+        - 2 **strMode** (*string*)       File opening mode
+                                         [optional, default = 'w']
+
+        - 3 **bIndex** (*int*)           Write a table of contents with
+                                         offsets of the arrays at the end of
+                                         the report?
+                                         1 - yes, 0 - no
+                                         [optional, default = 0]
+
+        - 4 **strCompression** (*string*)  Compression of the file,
+                                           the same as for dumpA
+                                           [optional, default = 'auto']
+
+        """
+
+        self.strFile = strFile
+        self.strMode = strMode
+        self.bIndex = bIndex
+        self.strCompression = strCompression
+        self.lIndex = []
+        self.lFileOffsets = []
+
+        # A report appended to a file starts at the end of the file
+        self.nBytes = 0
+        bName = isinstance(strFile, (str, bytes, os.PathLike))
+        self._bCompressed = (_getCompression(strFile, strCompression) != '')
+        if bName and ('a' in strMode) and (not self._bCompressed) and \
+                os.path.exists(strFile):
+            self.nBytes = os.path.getsize(strFile)
+
+        # Arrays added to a compressed file start new compressed members
+        self._bMembers = int(bName and self._bCompressed)
+        self._strEncoding = locale.getpreferredencoding(False)
+        self._hFile = _openFile(strFile, strMode, strCompression,
+                                self._bMembers)
+        self._bClosed = 0
+
+    def add(self, arrA, strCaption='', **dParams):
+        """
+        Method prints an array with its caption to the report
+
+        Input:
+
+        - 1 **arrA** (*NumPy array*)     Array to be printed
+
+        - 2 **strCaption** (*string*)    Caption printed before the array
+                                         [optional, default = '']
+
+        - 3 **dParams**                  The printing parameters, the same
+                                         as for printA (given by keywords,
+                                         e.g. strFormat='%.2f')
+
+        """
+
+        if self._bClosed:
+            raise ValueError('The report is closed!')
+        if len(strCaption) > 0:
+            self.write(strCaption + '\n\n')
+        iOffset = self.nBytes    # Offset of the printed array (after caption)
+
+        # A new compressed member is started at the array
+        if self._bMembers == 1:
+            self._hFile.addSeekPoint(iOffset)
+
+        # Stream the printed array to the file
+        hStats = dParams.get('hStats')
+        for strChunk in iterA(arrA, iChunkSize=_nChrBuf, **dParams):
+            _timeIO(self._hFile.write, hStats, strChunk)
+            self.nBytes = self.nBytes + _countBytes(strChunk,
+                                                    self._strEncoding)
+        self.lIndex.append((strCaption, iOffset, self.nBytes - iOffset))
+
+        # Take the offset of the compressed member in the file, when
+        # the member is started
+        if self._bMembers == 1:
+            self._hFile.join()
+            self.lFileOffsets.append(self._hFile.lSeeks[-1][1])
+        elif self._bCompressed:
+            self.lFileOffsets.append(None)
+        else:
+            self.lFileOffsets.append(iOffset)
+
+    def write(self, strText):
+        """
+        Method writes text to the report
+
+        Input:
+
+        - 1 **strText** (*string*)       Text to be written
+
+        """
+
+        if self._bClosed:
+            raise ValueError('The report is closed!')
+        self._hFile.write(strText)
+        self.nBytes = self.nBytes + _countBytes(strText, self._strEncoding)
+
+    def close(self):
+        """
+        Method writes the table of contents (if requested), and closes
+        the file
+
+        """
+
+        if self._bClosed:
+            return
+        try:
+            if self.bIndex == 1:
+                self.write(self._printIndex())
+        finally:
+            self._bClosed = 1
+            self._hFile.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, hType, hValue, hTraceback):
+        self.close()
+
+    def _printIndex(self):
+        """
+        Method prints the table of contents of the report
+
+        Output:
+
+        - 1 **strIndex** (*string*)      The printed table of contents
+
+        """
+
+        # Offsets of compressed members in the file are printed after
+        # offsets of the arrays in the uncompressed text
+        if self._bMembers == 1:
+            lIndex = ['Index of arrays:\n\n',
+                      '%14s %14s %14s   %s\n' % ('offset [B]', 'size [B]',
+                                                 'member [B]', 'caption')]
+            for ((strCaption, iOffset, nBytes), iFileOffset) in \
+                    zip(self.lIndex, self.lFileOffsets):
+                lIndex.append('%14d %14d %14d   %s\n'
+                              % (iOffset, nBytes, iFileOffset, strCaption))
+        else:
+            lIndex = ['Index of arrays:\n\n',
+                      '%14s %14s   %s\n' % ('offset [B]', 'size [B]',
+                                            'caption')]
+            for (strCaption, iOffset, nBytes) in self.lIndex:
+                lIndex.append('%14d %14d   %s\n'
+                              % (iOffset, nBytes, strCaption))
+        lIndex.append('\n')
+        return ''.join(lIndex)
+
+
+# %%##########################################################################
+def _iterArray(arrA, strArrayName, strFormat, iRowBrake, strDelimiter,
+               iMaxCols, iMaxEntr, bVert1D, bPrintHeader, iLineSpaces,
+               iRowSpaces, iBlockSize, nWorkers, iEdgeItems, slcRows,
+               slcCols, bColWidths, hStats, hPlan):
+    """
+    Function picks the printing function suitable for the array
+
+    All the printing functions are generators which yield the printed
+    array part by part, the parts can be joined or written one by one.
+    If only some rows and columns are selected, the printing functions get
+    a view of the selected window of the array, and ranges with indices of
+    the selected rows and columns in the whole array.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)     Array to be printed
+
+    - 2 ... 17                       The printing parameters, the same as
+                                     for printA
+
+    - 18 **hStats** (*PrintStats*)   Statistics of printing
+                                     (None - statistics are not collected)
+
+    - 19 **hPlan** (*PrintPlan*)     Layout of printing the array made by
+                                     planA (None - the layout is computed)
+
+    Output:
+
+    - 1 **iterArray** (*generator*)  Generator which yields strings with
+                                     consecutive parts of the printed array
+    """
+
+    if iEdgeItems < 0:
+        raise ValueError('The number of edge items can not be negative!')
+    iEdgeItems = int(iEdgeItems)
+
+    # Take the selected window of the array
+    (arrA, rRows, rCols) = _getWindow(arrA, slcRows, slcCols)
+
+    # Count the printed arrays and entries
+    if hStats is not None:
+        hStats.nArrays = hStats.nArrays + 1
+        hStats.nEntries = hStats.nEntries + \
+            int(np.prod([_getEdgeSize(nEnt, iEdgeItems)
+                         for nEnt in arrA.shape]))
+
+    # Check if the input array has 1 or 2 dimensions
+    if (arrA.ndim == 1):
+
+        # For 1 dimensinal array, the array may be printed horizontally
+        # or vertically
+        if bVert1D == 1:
+            iterArray = _1DarrayVert(arrA, strArrayName, strFormat, iRowBrake,
+                                     bPrintHeader, iBlockSize, iEdgeItems,
+                                     rRows, hStats, hPlan)
+        else:
+            iterArray = _1DarrayHori(arrA, strArrayName, strFormat, iRowBrake,
+                                     strDelimiter, iMaxCols, iMaxEntr,
+                                     bPrintHeader, iLineSpaces, iBlockSize,
+                                     iEdgeItems, rRows, hStats, hPlan)
+
+    elif (arrA.ndim == 2):
+        iterArray = _2Darray(arrA, strArrayName, strFormat, iRowBrake,
+                             strDelimiter, iMaxCols, iMaxEntr, bPrintHeader,
+                             iLineSpaces, iRowSpaces, iBlockSize, nWorkers,
+                             iEdgeItems, rRows, rCols, bColWidths, hStats,
+                             hPlan)
+
+    # Array with more dimensions is printed as 2D slices
+    elif (arrA.ndim > 2):
+        iterArray = _NDarray(arrA, strArrayName, strFormat, iRowBrake,
+                             strDelimiter, iMaxCols, iMaxEntr, bPrintHeader,
+                             iLineSpaces, iRowSpaces, iBlockSize, nWorkers,
+                             iEdgeItems, rRows, rCols, bColWidths, hStats,
+                             hPlan)
+
+    # If the array has no dimensions, it is an error
+    else:
+        strErr = 'NumPy array which is to be printed to a file must '
+        strErr += 'have at least 1 dimension!'
+        raise ValueError(strErr)
+
+    return iterArray
+
+
+# %%##########################################################################
+def _getWindow(arrA, slcRows, slcCols):
+    """
+    Function takes the selected window of an array
+
+    The window is a view of the array, nothing is copied. Indices of
+    the selected rows and columns in the whole array are given as ranges.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array to be printed
+
+    - 2 **slcRows** (*slice*)         Selected rows (entries of 1D array,
+                                      rows of slices of N-D array),
+                                      None - all the rows
+
+    - 3 **slcCols** (*slice*)         Selected columns of 2D (N-D) array,
+                                      None - all the columns
+
+    Output:
+
+    - 1 **arrW** (*NumPy array*)      The window of the array
+
+    - 2 **rRows** (*range*)           Indices of the selected rows in
+                                      the whole array
+
+    - 3 **rCols** (*range*)           Indices of the selected columns in
+                                      the whole array (None for 1D array)
+
+    """
+
+    # Arrays without dimensions are not printed
+    if arrA.ndim == 0:
+        return (arrA, None, None)
+
+    if slcRows is None:
+        slcRows = slice(None)
+    if slcCols is None:
+        slcCols = slice(None)
+    if not (isinstance(slcRows, slice) and isinstance(slcCols, slice)):
+        strErr = 'Rows and columns of an array must be selected with slices!'
+        raise ValueError(strErr)
+
+    # Entries of 1D array
+    if arrA.ndim == 1:
+        if slcCols != slice(None):
+            strErr = 'Columns can not be selected from 1D array!'
+            raise ValueError(strErr)
+        rRows = range(*slcRows.indices(arrA.shape[0]))
+        rCols = None
+        arrW = arrA[slcRows]
+
+    # Rows and columns (of every 2D slice of N-D array)
+    else:
+        rRows = range(*slcRows.indices(arrA.shape[-2]))
+        rCols = range(*slcCols.indices(arrA.shape[-1]))
+        arrW = arrA[..., slcRows, slcCols]
+
+    return (arrW, rRows, rCols)
+
+
+# %%##########################################################################
+def _bufferChunks(iterArray, nChrChunk):
+    """
+    Function collects parts of a printed array into larger chunks
+
+
+    Input:
+
+    - 1 **iterArray** (*generator*)  Generator which yields strings with
+                                     consecutive parts of the printed array
+
+    - 2 **nChrChunk** (*int*)        The minimum number of characters in
+                                     a chunk (the last chunk may be shorter)
+
+    Output:
+
+    - 1 **iterChunks** (*generator*)  Generator which yields strings with
+                                      consecutive chunks of the printed array
+    """
+
+    lChunk = []    # Parts of the current chunk
+    nChr = 0       # The number of characters in the current chunk
+    for strPart in iterArray:
+        lChunk.append(strPart)
+        nChr = nChr + len(strPart)
+
+        # The chunk is full, release it
+        if nChr >= nChrChunk:
+            yield ''.join(lChunk)
+            lChunk = []
+            nChr = 0
+
+    # Release the last chunk
+    if nChr > 0:
+        yield ''.join(lChunk)
+
+
+# %%##########################################################################
+def _splitLines(iterArray):
+    """
+    Function splits parts of a printed array into lines
+
+
+    Input:
+
+    - 1 **iterArray** (*generator*)  Generator which yields strings with
+                                     consecutive parts of the printed array
+
+    Output:
+
+    - 1 **iterLines** (*generator*)  Generator which yields consecutive
+                                     lines of the printed array
+    """
+
+    strRest = ''   # Beginning of a line which is not finished yet
+    for strPart in iterArray:
+        lLines = (strRest + strPart).split('\n')
+        strRest = lLines.pop()
+
+        # Release all the finished lines
+        for strLine in lLines:
+            yield strLine + '\n'
+
+    # Release the last line, if it is not finished with a new line
+    if len(strRest) > 0:
+        yield strRest
+
+
+# %%##########################################################################
+def _splitChunks(iterArray, nChrChunk):
+    """
+    Function splits parts of a printed array into chunks of a fixed size
+
+
+    Input:
+
+    - 1 **iterArray** (*generator*)  Generator which yields strings with
+                                     consecutive parts of the printed array
+
+    - 2 **nChrChunk** (*int*)        The number of characters in a chunk
+                                     (the last chunk may be shorter)
+
+    Output:
+
+    - 1 **iterChunks** (*generator*)  Generator which yields strings with
+                                      consecutive chunks of the printed array
+    """
+
+    lBuf = []   # Parts collected for the next chunks
+    nChr = 0    # The number of collected characters
+    for strPart in iterArray:
+        lBuf.append(strPart)
+        nChr = nChr + len(strPart)
+        if nChr < nChrChunk:
+            continue
+
+        # Release all the full chunks, keep the rest for the next chunk
+        strBuf = ''.join(lBuf)
+        nFull = nChr - nChr % nChrChunk
+        for iStart in range(0, nFull, nChrChunk):
+            yield strBuf[iStart:iStart + nChrChunk]
+        lBuf = [strBuf[nFull:]]
+        nChr = nChr - nFull
+
+    # Release the last chunk
+    if nChr > 0:
+        yield ''.join(lBuf)
+
+
+# %%##########################################################################
+def _timeParts(iterArray, hStats):
+    """
+    Function measures time of printing an array
+
+    Time of taking every part of the printed array from the generator is
+    measured, so time spent by the caller between the parts is not counted.
+    The number of printed characters is counted, and peak allocation is
+    measured, if it is requested. Statistics are collected even if
+    the generator is closed before the whole array is printed.
+
+
+    Input:
+
+    - 1 **iterArray** (*generator*)  Generator which yields strings with
+                                     consecutive parts of the printed array
+
+    - 2 **hStats** (*PrintStats*)    Statistics of printing
+                                     (None - statistics are not collected)
+
+    Output:
+
+    - 1 **iterArray** (*generator*)  Generator which yields the same strings
+    """
+
+    if hStats is None:
+        for strPart in iterArray:
+            yield strPart
+        return
+
+    tStart = hStats._startArray()
+    tRender = 0.0     # Time of printing the array
+    nChr = 0          # The number of printed characters
+    try:
+        while True:
+            tStartPart = time.perf_counter()
+            try:
+                strPart = next(iterArray)
+            except StopIteration:
+                break
+            finally:
+                tRender = tRender + time.perf_counter() - tStartPart
+            nChr = nChr + len(strPart)
+            yield strPart
+    finally:
+        hStats._stopArray(tStart, tRender, nChr)
+
+
+# %%##########################################################################
+def _addTime(hStats, strPhase, tStart):
+    """
+    Function adds time which passed since the start of a phase of printing
+    to statistics of printing
+
+
+    Input:
+
+    - 1 **hStats** (*PrintStats*)    Statistics of printing
+                                     (None - statistics are not collected)
+
+    - 2 **strPhase** (*string*)      Name of the phase
+
+    - 3 **tStart** (*float*)         Time of the start of the phase
+                                     (from time.perf_counter)
+
+    Output: none
+
+    """
+
+    if hStats is not None:
+        hStats.addTime(strPhase, time.perf_counter() - tStart)
+
+
+# %%##########################################################################
+async def _aiterPieces(iterArray, hExecutor, nChrBatch):
+    """
+    Function takes parts of a printed array in an executor
+
+    Parts of the printed array are taken from the generator in batches, one
+    batch in one call in the executor. The next batch is printed while
+    the current one is consumed, and no more batches are printed before
+    they are consumed, so memory used by printing stays bounded. The
+    generator is closed, when the parts are consumed or when this
+    asynchronous generator is closed.
+
+
+    Input:
+
+    - 1 **iterArray** (*generator*)  Generator which yields strings with
+                                     consecutive parts of the printed array
+
+    - 2 **hExecutor** (*Executor*)   Executor which prints the array
+                                     (None - the default executor of
+                                     the event loop)
+
+    - 3 **nChrBatch** (*int*)        The minimum number of characters in
+                                     a batch (the last batch may be shorter)
+
+    Output:
+
+    - 1 **iterArray** (*async generator*)  Asynchronous generator which
+                                           yields the same strings
+    """
+
+    hLoop = asyncio.get_running_loop()
+
+    # The generator is used by one thread at a time
+    hLock = threading.Lock()
+    hBatch = None
+    try:
+        hBatch = hLoop.run_in_executor(hExecutor, _takePieces, iterArray,
+                                       nChrBatch, hLock)
+        while True:
+            lPieces = await hBatch
+            if len(lPieces) == 0:
+                break
+
+            # Print the next batch, while this batch is consumed
+            hBatch = hLoop.run_in_executor(hExecutor, _takePieces, iterArray,
+                                           nChrBatch, hLock)
+            for strPiece in lPieces:
+                yield strPiece
+    finally:
+        # A batch which is still pending is cancelled (a batch which is
+        # already printed is waited for by _closePieces), and an error of
+        # a finished batch is taken, so that it is not reported as never
+        # retrieved
+        if (hBatch is not None) and not hBatch.done():
+            hBatch.cancel()
+        await hLoop.run_in_executor(hExecutor, _closePieces, iterArray, hLock)
+        if (hBatch is not None) and not hBatch.cancelled():
+            hBatch.exception()
+
+
+# %%##########################################################################
+def _takePieces(iterArray, nChrBatch, hLock):
+    """
+    Function takes a batch of parts of a printed array
+
+
+    Input:
+
+    - 1 **iterArray** (*generator*)  Generator which yields strings with
+                                     consecutive parts of the printed array
+
+    - 2 **nChrBatch** (*int*)        The minimum number of characters in
+                                     a batch
+
+    - 3 **hLock** (*Lock*)           Lock of the generator
+
+    Output:
+
+    - 1 **lPieces** (*list*)         List with parts of the printed array
+                                     (empty, if there are no more parts)
+
+    """
+
+    lPieces = []
+    nChr = 0
+    with hLock:
+        for strPiece in iterArray:
+            lPieces.append(strPiece)
+            nChr = nChr + len(strPiece)
+            if nChr >= nChrBatch:
+                break
+    return lPieces
+
+
+# %%##########################################################################
+def _closePieces(iterArray, hLock):
+    """
+    Function closes a generator with parts of a printed array, when it is
+    not used by another thread
+
+
+    Input:
+
+    - 1 **iterArray** (*generator*)  Generator which yields strings with
+                                     consecutive parts of the printed array
+
+    - 2 **hLock** (*Lock*)           Lock of the generator
+
+    Output: none
+
+    """
+
+    with hLock:
+        iterArray.close()
+
+
+# %%##########################################################################
+def _timeIO(fIO, hStats, *tArgs):
+    """
+    Function runs a file operation and adds its time to statistics of
+    printing
+
+
+    Input:
+
+    - 1 **fIO** (*function*)         File operation (open, write, close)
+
+    - 2 **hStats** (*PrintStats*)    Statistics of printing
+                                     (None - statistics are not collected)
+
+    - 3 ... **tArgs**                Arguments of the file operation
+
+    Output:
+
+    - 1 **xResult**                  Result of the file operation
+
+    """
+
+    tStart = time.perf_counter()
+    xResult = fIO(*tArgs)
+    _addTime(hStats, 'io', tStart)
+    return xResult
+
+
+# %%##########################################################################
+def _countBytes(strText, strEncoding):
+    """
+    Function counts bytes of encoded text
+
+
+    Input:
+
+    - 1 **strText** (*string*)        Text
+
+    - 2 **strEncoding** (*string*)    Encoding of the text
+
+    Output:
+
+    - 1 **nBytes** (*int*)            The number of bytes of encoded text
+
+    """
+
+    # Printed arrays are almost always ASCII, which is not encoded again
+    if strText.isascii():
+        return len(strText)
+    return len(strText.encode(strEncoding))
+
+
+# %%##########################################################################
+def _openFile(strFile, strMode, strCompression, bSeekPoints=0):
+    """
+    Function opens a text file, to which a printed array is written
+
+    The file may be given by its name, or it may be an already open text
+    or binary file (e.g. sys.stdout or a pipe), or a file descriptor.
+    An open file (or a file descriptor) is not closed, it is only flushed
+    when the array is written, and strMode is not used. Text written to
+    a binary file is encoded in the same way as in files opened in the text
+    mode.
+
+    A compressed file is opened in the binary mode, and it is wrapped in
+    _CompressedWriter, which compresses and writes the printed array in
+    a background thread. A compressed file opened in the 'a' (append) mode
+    gets a new compressed member (stream) at its end. Compressed arrays
+    may be written only to binary open files. A compressed file given by
+    its name may get seek points (new compressed members, see
+    _CompressedWriter).
+
+
+    Input:
+
+    - 1 **strFile** (*string, file or int*)  Name of the file, an open file
+                                             or a file descriptor
+
+    - 2 **strMode** (*string*)        File opening mode
+
+    - 3 **strCompression** (*string*) Compression of the file (see
+                                      _getCompression)
+
+    - 4 **bSeekPoints** (*int*)       May a compressed file get seek points?
+                                      [optional, default = 0]
+
+    Output:
+
+    - 1 **hFile** (*file*)            The opened file, with methods write,
+                                      flush and close
+
+    """
+
+    strCompression = _getCompression(strFile, strCompression)
+    strEncoding = locale.getpreferredencoding(False)
+
+    # A file given by its name is opened
+    if isinstance(strFile, (str, bytes, os.PathLike)):
+        if strCompression == '':
+            return open(strFile, strMode)
+        strMode = strMode.replace('t', '').replace('b', '') + 'b'
+        if bSeekPoints == 1:
+            return _CompressedWriter(None, strEncoding, open(strFile, strMode),
+                                     _dCompressions[strCompression])
+        hFile = _dCompressions[strCompression](strFile, strMode)
+        return _CompressedWriter(hFile, strEncoding)
+
+    # A file descriptor is wrapped in a binary file which does not close it
+    if isinstance(strFile, int):
+        strFile = open(strFile, 'wb', closefd=False)
+    if not hasattr(strFile, 'write'):
+        raise TypeError('An array can be written only to a file given by '
+                        'its name, an open file or a file descriptor!')
+    bBinary = isinstance(strFile, (io.RawIOBase, io.BufferedIOBase)) or \
+        ('b' in str(getattr(strFile, 'mode', '')))
+
+    if strCompression == '':
+        return _BorrowedFile(strFile, strEncoding if bBinary else None)
+    if not bBinary:
+        raise ValueError('A compressed array can be written only to a file '
+                         'opened in the binary mode!')
+    hFile = _dCompressions[strCompression](strFile, 'wb')
+    return _CompressedWriter(hFile, strEncoding, strFile)
+
+
+# %%##########################################################################
+def _getCompression(strFile, strCompression):
+    """
+    Function gets compression of a file
+
+
+    Input:
+
+    - 1 **strFile** (*string, file or int*)  Name of the file, an open file
+                                             or a file descriptor
+
+    - 2 **strCompression** (*string*) Compression of the file: 'gzip',
+                                      'bz2', 'xz', '' (no compression) or
+                                      'auto' (taken from the extension of
+                                      the name of the file: '.gz', '.bz2'
+                                      or '.xz')
+
+    Output:
+
+    - 1 **strCompression** (*string*) Compression of the file: 'gzip',
+                                      'bz2', 'xz' or '' (no compression)
+
+    """
+
+    if strCompression == 'auto':
+        # The name of an open file is taken, if it has one
+        if not isinstance(strFile, (str, os.PathLike)):
+            strFile = getattr(strFile, 'name', '')
+            if not isinstance(strFile, (str, os.PathLike)):
+                return ''
+        strExtension = os.path.splitext(strFile)[1].lower()
+        return _dExtensions.get(strExtension, '')
+    if (strCompression != '') and (strCompression not in _dCompressions):
+        strErr = 'Unknown compression: \'%s\'! ' % (strCompression)
+        strErr += 'Acceptable are \'gzip\', \'bz2\', \'xz\', \'\' or \'auto\''
+        raise ValueError(strErr)
+    return strCompression
+
+
+# %%##########################################################################
+class _BorrowedFile(object):
+    """
+    Class which writes text to an open file, which is not closed when
+    the text is written
+
+    Text written to a binary file is encoded.
+    """
+
+    def __init__(self, hFile, strEncoding=None):
+        """
+        Input:
+
+        - 1 **hFile** (*file*)           The open file
+
+        - 2 **strEncoding** (*string*)   Encoding of text written to a binary
+                                         file
+                                         [optional, default = None <--
+                                          the file is a text file]
+
+        """
+
+        self._hFile = hFile
+        self._strEncoding = strEncoding
+
+    def write(self, strText):
+        """
+        Method writes text to the file
+
+        Input:
+
+        - 1 **strText** (*string*)       Text to be written
+
+        """
+
+        if self._strEncoding is not None:
+            strText = strText.encode(self._strEncoding)
+        self._hFile.write(strText)
+
+    def flush(self):
+        """
+        Method flushes the file
+
+        """
+
+        if hasattr(self._hFile, 'flush'):
+            self._hFile.flush()
+
+    def close(self):
+        """
+        Method flushes the file, the file is left open
+
+        """
+
+        self.flush()
+
+
+# %%##########################################################################
+class _CompressedWriter(object):
+    """
+    Class which compresses and writes text to a file in a background thread
+
+    Written text is encoded and put into a queue of a few chunks, and it is
+    compressed and written to the file by a background thread, so that
+    printing of the next chunks and compression of the previous chunks
+    overlap. The compressing libraries release the GIL. Errors of writing
+    are raised by the next call to write or close.
+
+    If the writer opens compressed members itself (fOpen is given), it may
+    add seek points: the current member is closed and a new one is started,
+    so the file may be decompressed from there. A new member is started
+    only when text comes after the seek point, and only if text was written
+    since the previous seek point, so there are no empty members (also at
+    the end of the file). Offsets of the seek points in the text and in
+    the file are kept in lSeeks.
+    """
+
+    def __init__(self, hFile, strEncoding, hTarget=None, fOpen=None):
+        """
+        Input:
+
+        - 1 **hFile** (*file*)           Compressed file opened in the binary
+                                         mode (None, if fOpen is given)
+
+        - 2 **strEncoding** (*string*)   Encoding of the text
+
+        - 3 **hTarget** (*file*)         Open file to which the compressed
+                                         file is written, it is flushed
+                                         (not closed) when the compressed
+                                         file is closed
+                                         [optional, default = None]
+
+        - 4 **fOpen** (*function*)       Function which opens a compressed
+                                         member in hTarget, hTarget is then
+                                         closed with the writer
+                                         [optional, default = None]
+
+        """
+
+        self._fOpen = fOpen
+        self.lSeeks = []
+        if fOpen is not None:
+            try:
+                self.lSeeks.append((0, hTarget.tell()))
+                hFile = fOpen(hTarget, 'wb')
+            except BaseException:
+                hTarget.close()
+                raise
+        self._hFile = hFile
+        self._strEncoding = strEncoding
+        self._hTarget = hTarget
+        self._iSeek = None       # Offset of a seek point before the next text
+        self._hQueue = queue.Queue(_nChunksQueue)
+        self._hError = None      # The first error of the background thread
+        self._bClosed = 0
+        self._hThread = threading.Thread(target=self._run)
+        self._hThread.daemon = True
+        self._hThread.start()
+
+    def write(self, strText):
+        """
+        Method puts text into the queue of written chunks (it waits, if
+        the queue is full)
+
+        Input:
+
+        - 1 **strText** (*string*)       Text to be written
+
+        """
+
+        if self._hError is not None:
+            raise self._hError
+        self._hQueue.put(strText.encode(self._strEncoding))
+
+    def addSeekPoint(self, iText):
+        """
+        Method starts a new compressed member, after all the chunks in
+        the queue are written (when the next text is written)
+
+        Input:
+
+        - 1 **iText** (*int*)            Offset of the seek point in the text
+                                         [bytes]
+
+        """
+
+        if self._hError is not None:
+            raise self._hError
+        self._hQueue.put(iText)
+
+    def join(self):
+        """
+        Method waits until all the chunks and seek points in the queue are
+        written (the file is not flushed)
+
+        """
+
+        self._hQueue.join()
+        if self._hError is not None:
+            raise self._hError
+
+    def flush(self):
+        """
+        Method waits until all the chunks in the queue are written, and
+        flushes the file
+
+        """
+
+        self.join()
+        self._hFile.flush()
+
+    def close(self):
+        """
+        Method writes all the chunks in the queue and closes the file
+
+        """
+
+        if not self._bClosed:
+            self._bClosed = 1
+            try:
+                self._hQueue.put(None)
+                self._hThread.join()
+                self._hFile.close()
+            finally:
+                # The target which belongs to the writer is always closed
+                if self._fOpen is not None:
+                    self._hTarget.close()
+                elif self._hTarget is not None:
+                    self._hTarget.flush()
+        if self._hError is not None:
+            raise self._hError
+
+    def _run(self):
+        """
+        Method which is run by the background thread: it compresses and
+        writes chunks taken from the queue (chunks taken after an error are
+        dropped), and starts new compressed members at seek points, before
+        the text which comes after them
+
+        """
+
+        while True:
+            bytChunk = self._hQueue.get()
+            try:
+                if bytChunk is None:
+                    return
+                if self._hError is not None:
+                    pass
+                elif isinstance(bytChunk, int):
+                    if bytChunk > self.lSeeks[-1][0]:
+                        self._iSeek = bytChunk
+                elif len(bytChunk) > 0:
+                    if self._iSeek is not None:
+                        self._hFile.close()
+                        self.lSeeks.append((self._iSeek,
+                                            self._hTarget.tell()))
+                        self._hFile = self._fOpen(self._hTarget, 'wb')
+                        self._iSeek = None
+                    self._hFile.write(bytChunk)
+            except Exception as hError:
+                self._hError = hError
+            finally:
+                self._hQueue.task_done()
+
+
+# %%##########################################################################
+def _dumpMap(arrA, strFile, strMode, strArrayName, strFormat, iRowBrake,
+             strDelimiter, iMaxCols, iMaxEntr, bPrintHeader, iLineSpaces,
+             iRowSpaces, iBlockSize, nWorkers, slcRows, slcCols,
+             bColWidths, hStats, hPlan):
+    """
+    Function writes 2D numpy array straight into a memory-mapped file
+
+    Every printed row of a 2D array has the same, known in advance, number
+    of characters. The size of the printed array is computed before the
+    array is printed, the file is enlarged to its final size and
+    memory-mapped, and every printed row is put at its own offset in
+    the file.
+
+    If the array can not be written in this way (it is not a 2D array,
+    the file mode is not 'w' or 'a', or printed entries turn out to have
+    different widths), the file is left as it was and 0 is returned.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array to be printed
+
+    - 2 **strFile** (*string*)        Name of the file to save the array
+
+    - 3 **strMode** (*string*)        File opening mode
+
+    - 4 **strArrayName** (*string*)   Name of the array
+
+    - 5 **strFormat** (*string*)      Format of printing entires of the array
+
+    - 6 **iRowBrake** (*int*)         The number of rows before the column
+                                      indices are printed again
+
+    - 7 **strDelimiter** (*string*)   Delimiter printed between the entries
+                                      of the array
+
+    - 8 **iMaxCols** (*int*)          The maximum number of text columns used
+                                      to print a single row
+
+    - 9 **iMaxEntr** (*int*)          The maximum number of entries printed
+                                      in a single line
+
+    - 10 **bPrintHeader** (*int*)     Add header with array name, dimension
+                                      and size?
+
+    - 11 **iLineSpaces** (*int*)      The number of spaces between printed
+                                      lines
+
+    - 12 **iRowSpaces** (*int*)       The number of spaces between printed
+                                      rows
+
+    - 13 **iBlockSize** (*int*)       The number of entries of the array
+                                      which are scanned and printed in one
+                                      block
+
+    - 14 **nWorkers** (*int*)         The number of processes which print
+                                      blocks of rows
+
+    - 15 **slcRows** (*slice*)        Selected rows (None - all the rows)
+
+    - 16 **slcCols** (*slice*)        Selected columns (None - all
+                                      the columns)
+
+    - 17 **bColWidths** (*int*)       Print every column with its own width?
+
+    - 18 **hStats** (*PrintStats*)    Statistics of printing
+                                      (None - statistics are not collected)
+
+    - 19 **hPlan** (*PrintPlan*)      Layout of printing the array made by
+                                      planA (None - the layout is computed)
+
+    Output:
+
+    - 1 **bWritten** (*int*)          1 - the array was written to the file,
+                                      0 - the array could not be written
+
+    """
+
+    # Only 2D arrays written to a new file or appended to a file, with
+    # new lines which are not translated, can be written straight to a file
+    if (arrA.ndim != 2) or (strMode not in ('w', 'a')) or \
+            (os.linesep != '\n'):
+        return 0
+
+    # Statistics of printing are collected from here, time of writing to
+    # the file is not a part of time of printing
+    tStart = time.perf_counter()
+    if hStats is not None:
+        tStartStats = hStats._startArray()
+        tStartIO = hStats.dTimes['io']
+    bWritten = 0
+    nBytes = 0
+    try:
+        # The same encoding as in files opened in the text mode is used
+        strEncoding = locale.getpreferredencoding(False)
+
+        # Take the selected window of the array
+        (arrA, rRows, rCols) = _getWindow(arrA, slcRows, slcCols)
+
+        # Get the layout of the printed array and the sizes of printed rows
+        hPlan = _getPlan(arrA, strFormat, iRowBrake, strDelimiter, iMaxCols,
+                         iMaxEntr, 0, iBlockSize, 0, rRows, rCols, bColWidths,
+                         hStats, hPlan)
+        nRows = hPlan.nRows
+        iRowBrake = hPlan.iRowBrake
+        (nChrRow, nChrCols) = \
+            _2DgetRowSizes(hPlan, len(strDelimiter.encode(strEncoding)),
+                           iLineSpaces, iRowSpaces)
+        bytHeader = _printHeader(arrA, strArrayName,
+                                 bPrintHeader).encode(strEncoding)
+
+        # The size of the printed array: the header, the rows, indices of
+        # columns printed before every iRowBrake rows, a new line forced
+        # after the last row and a new line at the end of the array
+        nBytes = len(bytHeader) + nRows * nChrRow + \
+            (-(-nRows // iRowBrake)) * nChrCols + (iRowSpaces == 0) + 1
+
+        tStartPhase = time.perf_counter()
+        hFile = open(strFile, strMode + '+b')
+        _addTime(hStats, 'io', tStartPhase)
+        try:
+            bWritten = _dumpMapRows(hFile, arrA, hPlan, bytHeader, nBytes,
+                                    nChrRow, nChrCols, strEncoding,
+                                    iLineSpaces, iRowSpaces, iBlockSize,
+                                    nWorkers, hStats)
+        finally:
+            tStartPhase = time.perf_counter()
+            hFile.close()
+            _addTime(hStats, 'io', tStartPhase)
+    finally:
+        if hStats is not None:
+            tIO = hStats.dTimes['io'] - tStartIO
+            hStats._stopArray(tStartStats,
+                              time.perf_counter() - tStart - tIO,
+                              nBytes if bWritten else 0)
+            if bWritten:
+                hStats.nArrays = hStats.nArrays + 1
+                hStats.nEntries = hStats.nEntries + arrA.size
+    return bWritten
+
+
+# %%##########################################################################
+def _dumpMapRows(hFile, arrA, hPlan, bytHeader, nBytes, nChrRow, nChrCols,
+                 strEncoding, iLineSpaces, iRowSpaces, iBlockSize, nWorkers,
+                 hStats):
+    """
+    Function puts printed rows of 2D numpy array into a memory-mapped file
+
+    The file is enlarged by the size of the printed array, the added part
+    is memory-mapped, and every printed block of rows is put at its own
+    offset. If printed entries turn out to have different widths, the file
+    is brought back to its size and 0 is returned.
+
+
+    Input:
+
+    - 1 **hFile** (*file*)            The file opened in the binary mode
+
+    - 2 **arrA** (*NumPy array*)      Array to be printed
+
+    - 3 **hPlan** (*PrintPlan*)       The layout of the printed array
+
+    - 4 **bytHeader** (*bytes*)       The printed header of the array
+
+    - 5 **nBytes** (*int*)            The size of the printed array
+
+    - 6 **nChrRow** (*int*)           The number of bytes in a printed row
+
+    - 7 **nChrCols** (*int*)          The number of bytes in printed indices
+                                      of columns
+
+    - 8 **strEncoding** (*string*)    Encoding of the file
+
+    - 9 ... 12                        The printing parameters, the same as
+                                      for _dumpMap (iLineSpaces, iRowSpaces,
+                                      iBlockSize, nWorkers)
+
+    - 13 **hStats** (*PrintStats*)    Statistics of printing
+                                      (None - statistics are not collected)
+
+    Output:
+
+    - 1 **bWritten** (*int*)          1 - the array was written to the file,
+                                      0 - the array could not be written
+
+    """
+
+    nRows = hPlan.nRows
+    iRowBrake = hPlan.iRowBrake
+
+    # Enlarge the file and map the part of it where the array goes
+    tStart = time.perf_counter()
+    hFile.seek(0, os.SEEK_END)
+    iFileStart = hFile.tell()
+    hFile.truncate(iFileStart + nBytes)
+    iMapStart = iFileStart - (iFileStart % mmap.ALLOCATIONGRANULARITY)
+    hMap = mmap.mmap(hFile.fileno(), iFileStart + nBytes - iMapStart,
+                     offset=iMapStart)
+    try:
+        iStart = iFileStart - iMapStart
+        hMap[iStart:iStart + len(bytHeader)] = bytHeader
+        iStart = iStart + len(bytHeader)
+        _addTime(hStats, 'io', tStart)
+
+        # Put every printed block of rows at its offset
+        iterBlocks = _2DprintBlocks(arrA, hPlan, iLineSpaces, iRowSpaces,
+                                    iBlockSize, nWorkers, hStats)
+        for (iStartRow, iStopRow, strRows) in iterBlocks:
+            bytRows = strRows.encode(strEncoding)
+            iRowStart = iStart + iStartRow * nChrRow + \
+                (-(-iStartRow // iRowBrake)) * nChrCols
+            iRowStop = iStart + iStopRow * nChrRow + \
+                (-(-iStopRow // iRowBrake)) * nChrCols + \
+                ((iRowSpaces == 0) and (iStopRow == nRows))
+            if len(bytRows) != iRowStop - iRowStart:
+                # Printed entries have different widths, give up
+                iterBlocks.close()
+                break
+            tStart = time.perf_counter()
+            hMap[iRowStart:iRowStop] = bytRows
+            _addTime(hStats, 'io', tStart)
+        else:
+            tStart = time.perf_counter()
+            hMap[-1:] = b'\n'   # Add a new line at the end of the array
+            hMap.flush()
+            _addTime(hStats, 'io', tStart)
+            return 1
+    finally:
+        hMap.close()
+
+    # The array could not be written, bring the file back to its size
+    hFile.truncate(iFileStart)
+    return 0
+
+
+# %%##########################################################################
+class _RowIndex(object):
+    """
+    Class which collects offsets of printed rows of an array, while
+    the array is written to a file, and saves them to a sidecar file
+
+    Printed text is scanned chunk by chunk with NumPy: a line with entries
+    starts with an index of a row followed by a colon and an entry (lines
+    with indices of columns have only indices and colons). Every such line
+    is a segment of a row (rows are wrapped into many lines), and the first
+    segment of every row is the one whose index differs from the index of
+    the previous segment. Offsets are counted in the printed text of the
+    array (in bytes).
+
+    The sidecar file (strFile + '.midx') is a NumPy .npz file with offsets
+    of all the segments ('lines', the end of the last segment is appended),
+    indices of the first segments of the rows ('rows', the number of
+    segments is appended), seek points ('seeks', pairs of offsets in the
+    text and in the file, where reading of the file may start: the start
+    of the array, or the start of a compressed member), shape and type of
+    the printed array, the delimiter, compression and the size of the file.
+    """
+
+    def __init__(self, arrA, strFile, strMode, strCompression, bVert1D,
+                 iEdgeItems, slcRows, slcCols, strDelimiter):
+        """
+        Input:
+
+        - 1 **arrA** (*NumPy array*)     Array which is written
+
+        - 2 **strFile** ... **strDelimiter**  The same as the arguments of
+                                              dumpA
+
+        """
+
+        if not isinstance(strFile, (str, os.PathLike)):
+            raise ValueError('Index of rows can be written only to a file '
+                             'given by its name!')
+        if (arrA.ndim not in (1, 2)) or ((arrA.ndim == 1) and (bVert1D == 0)):
+            raise ValueError('Index of rows can be written only for 2D arrays '
+                             'and 1D arrays printed vertically!')
+        if iEdgeItems != 0:
+            raise ValueError('Index of rows can not be written for arrays '
+                             'printed only partly!')
+
+        self.strFile = strFile
+        self.strCompression = _getCompression(strFile, strCompression)
+        self.strDelimiter = strDelimiter
+        self.tShape = _getWindow(arrA, slcRows, slcCols)[0].shape
+        self.strType = str(arrA.dtype)
+        self.nBytes = 0                   # Size of the scanned text [bytes]
+        self._strEncoding = locale.getpreferredencoding(False)
+        self._bytRest = b''               # Unfinished line
+        self._bytLabel = None             # Index of the last segment
+        self._iSeek = 0                   # Offset of the last seek point
+        self._lLines = []                 # Offsets of segments
+        self._lFirst = []                 # Is a segment the first in a row?
+        self._iEnd = 0                    # End of the last segment
+
+        # The array appended to a file starts at the end of the file
+        self._iBase = 0
+        if ('a' in strMode) and (self.strCompression == '') and \
+                os.path.exists(strFile):
+            self._iBase = os.path.getsize(strFile)
+
+    def scan(self, strChunk, hFile):
+        """
+        Method scans a chunk of the printed array, which was written to
+        the file, and adds a seek point to a compressed file every
+        _nChrSeek bytes
+
+        Input:
+
+        - 1 **strChunk** (*string*)      The written chunk
+
+        - 2 **hFile** (*file*)           The file opened by _openFile
+
+        """
+
+        bytChunk = strChunk.encode(self._strEncoding)
+        iOffset = self.nBytes - len(self._bytRest)    # Offset of bytText
+        self.nBytes = self.nBytes + len(bytChunk)
+        bytText = self._bytRest + bytChunk
+        arrByt = np.frombuffer(bytText, dtype=np.uint8)
+        arrEnds = np.flatnonzero(arrByt == 10)      # Ends of whole lines
+        if arrEnds.size > 0:
+            self._bytRest = bytText[arrEnds[-1] + 1:]
+            self._scanLines(arrByt, arrEnds, iOffset)
+        else:
+            self._bytRest = bytText
+
+        if isinstance(hFile, _CompressedWriter) and \
+                (self.nBytes - self._iSeek >= _nChrSeek):
+            hFile.addSeekPoint(self.nBytes)
+            self._iSeek = self.nBytes
+
+    def _scanLines(self, arrByt, arrEnds, iOffset):
+        """
+        Method finds segments of rows in whole lines of text
+
+        Input:
+
+        - 1 **arrByt** (*NumPy array*)   Bytes of the text
+
+        - 2 **arrEnds** (*NumPy array*)  Ends of whole lines in the text
+
+        - 3 **iOffset** (*int*)          Offset of the text
+
+        """
+
+        # The first and the second colon in every line, and the first
+        # character after the first colon, which is not a space
+        nByt = arrByt.size
+        arrStarts = np.concatenate(([0], arrEnds[:-1] + 1))
+        arrColons = np.concatenate((np.flatnonzero(arrByt == 58),
+                                    [nByt, nByt]))
+        iColon = np.searchsorted(arrColons, arrStarts)
+        arrColon1 = arrColons[iColon]
+        arrColon2 = arrColons[iColon + 1]
+        arrChars = np.concatenate((np.flatnonzero(arrByt > 32), [nByt + 1]))
+        arrNext = arrChars[np.searchsorted(arrChars, arrColon1 + 1)]
+        arrSeg = (arrColon1 < arrEnds) & (arrColon2 > arrEnds) & \
+            (arrNext < arrEnds)
+        if not arrSeg.any():
+            return
+        self._iEnd = int(arrEnds[arrSeg][-1]) + 1 + iOffset
+        arrStarts = arrStarts[arrSeg]
+        arrColon1 = arrColon1[arrSeg]
+
+        # Indices of rows are aligned, so they are compared as matrices of
+        # characters
+        nWidth = int((arrColon1 - arrStarts).max())
+        arrInd = arrStarts[:, None] + np.arange(nWidth)
+        arrLabels = np.where(arrInd < arrColon1[:, None],
+                             arrByt[np.minimum(arrInd, nByt - 1)], 32)
+        arrFirst = np.ones(arrStarts.size, dtype=bool)
+        arrFirst[1:] = (arrLabels[1:] != arrLabels[:-1]).any(axis=1)
+        bytLabel = arrLabels[0].tobytes()
+        arrFirst[0] = (self._bytLabel is None) or (bytLabel != self._bytLabel)
+        self._bytLabel = arrLabels[-1].tobytes()
+
+        self._lLines.append(arrStarts + iOffset)
+        self._lFirst.append(arrFirst)
+
+    def save(self, hFile):
+        """
+        Method saves the index of rows to the sidecar file
+
+        Input:
+
+        - 1 **hFile** (*file*)           The closed file opened by _openFile
+
+        """
+
+        if len(self._lLines) > 0:
+            arrLines = np.concatenate(self._lLines)
+            arrFirst = np.concatenate(self._lFirst)
+        else:
+            arrLines = np.zeros(0, dtype=np.int64)
+            arrFirst = np.zeros(0, dtype=bool)
+        arrLines = np.append(arrLines, self._iEnd).astype(np.uint64)
+        arrRows = np.append(np.flatnonzero(arrFirst),
+                            arrFirst.size).astype(np.uint64)
+
+        if isinstance(hFile, _CompressedWriter):
+            arrSeeks = np.array(hFile.lSeeks, dtype=np.uint64)
+        else:
+            arrSeeks = np.array([(0, self._iBase)], dtype=np.uint64)
+
+        with open(_getIndexName(self.strFile), 'wb') as hIndex:
+            np.savez_compressed(hIndex, lines=arrLines, rows=arrRows,
+                                seeks=arrSeeks,
+                                shape=np.array(self.tShape, dtype=np.int64),
+                                type=np.array(self.strType),
+                                delimiter=np.array(self.strDelimiter),
+                                compression=np.array(self.strCompression),
+                                size=np.array(os.path.getsize(self.strFile)))
+
+
+# %%##########################################################################
+def _getIndexName(strFile):
+    """
+    Function gives the name of the sidecar file with the index of rows
+
+    Input:
+
+    - 1 **strFile** (*string*)        Name of the file with the array
+
+    Output:
+
+    - 1 **strIndex** (*string*)       Name of the file with the index
+
+    """
+
+    return os.fspath(strFile) + '.midx'
+
+
+# %%##########################################################################
+def _iterLineBlocks(strFile, iOffset, nBytes, strCompression):
+    """
+    Function reads a text file in large blocks of whole lines
+
+    A file which is not compressed is mapped to memory, a compressed file
+    is decompressed on the fly.
+
+
+    Input:
+
+    - 1 **strFile** (*string*)        Name of the file
+
+    - 2 **iOffset** (*int*)           Offset of the first read byte
+
+    - 3 **nBytes** (*int*)            The number of read bytes (0 - to
+                                      the end of the file)
+
+    - 4 **strCompression** (*string*) Compression of the file (see
+                                      _getCompression)
+
+    Output:
+
+    - 1 **iterBlocks** (*generator*)  Generator which yields lists of
+                                      consecutive lines (bytes, without
+                                      new lines)
+
+    """
+
+    strCompression = _getCompression(strFile, strCompression)
+    with open(strFile, 'rb') as hFile:
+        if strCompression != '':
+            hData = _dCompressions[strCompression](hFile, 'rb')
+        elif os.fstat(hFile.fileno()).st_size > 0:
+            hData = mmap.mmap(hFile.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            return    # Empty file, there is nothing to be mapped
+        try:
+            hData.seek(iOffset)
+            nLeft = np.inf if nBytes == 0 else nBytes
+            bytRest = b''      # Unfinished line from the previous block
+            while nLeft > 0:
+                bytBlock = hData.read(int(min(_nChrBlock, nLeft)))
+                if len(bytBlock) == 0:
+                    break
+                nLeft = nLeft - len(bytBlock)
+                lLines = (bytRest + bytBlock).split(b'\n')
+                bytRest = lLines.pop()
+                yield lLines
+            if len(bytRest) > 0:
+                yield [bytRest]
+        finally:
+            hData.close()
+
+
+# %%##########################################################################
+class _ArrayParser(object):
+    """
+    Class which parses lines of a printed numpy array
+
+    Lines are classified by their look: a header, a label of a 2D slice of
+    N-D array, a line with indices of columns (or entries of horizontally
+    printed 1D array), a line with entries which starts with an index of
+    a row (or an entry of vertically printed 1D array), and a line with
+    entries only (horizontally printed 1D array). Entries of all the lines
+    of a block are converted to numbers in one call. Entries are printed in
+    the order of entries in the array, so they are placed in the array
+    by their order only.
+    """
+
+    def __init__(self, strDelimiter):
+        """
+        Input:
+
+        - 1 **strDelimiter** (*string*)  Delimiter printed between entries
+
+        """
+
+        bytDelimiter = strDelimiter.strip().encode()
+        self.bytDelimiter = bytDelimiter if len(bytDelimiter) > 0 else None
+        self._reset()
+
+    def _reset(self):
+        """
+        Method forgets everything which was parsed
+
+        """
+
+        self.tHeader = None        # Shape and type from the header
+        self.lEntries = []         # Arrays with converted entries
+        self.nRows = 0             # The number of printed rows (entries)
+        self.bytLabel = None       # Index of the current row
+        self.nSlices = 0           # The number of 2D slices
+        self.bytSlice = None       # Label of the current 2D slice
+        self.bIndices = 0          # Were there lines with indices?
+        self.bUnlabelled = 0       # Were there entries without an index?
+        self.bEntries = 0          # Were there any entries?
+
+    def parseLines(self, lLines):
+        """
+        Method parses a block of lines
+
+        Input:
+
+        - 1 **lLines** (*list*)          Lines (bytes, without new lines)
+
+        Output:
+
+        - 1 **bDone** (*int*)            1 - the array ended (the next array
+                                         starts), 0 - it did not
+
+        """
+
+        lBlock = []       # Entries of the block
+        bDone = 0
+        for bytLine in lLines:
+            bytLine = bytLine.strip()
+            if len(bytLine) == 0:
+                continue
+
+            # A header starts the array, lines before it are skipped,
+            # the next header ends the array
+            if bytLine.endswith(b'):') and (b'-array (' in bytLine):
+                if self.tHeader is not None:
+                    bDone = 1
+                    break
+                self._reset()
+                lBlock = []
+                self.tHeader = _parseHeader(bytLine)
+                continue
+
+            if bytLine.startswith(b'...'):
+                _loadErr('Arrays printed only partly can not be read!')
+
+            # A label of a 2D slice of N-D array
+            if bytLine.endswith(b':, :]'):
+                self.nSlices = self.nSlices + 1
+                self.bytSlice = bytLine
+                self.bytLabel = None
+                continue
+
+            # Entries of horizontally printed 1D array
+            iColon = bytLine.find(b':')
+            if iColon < 0:
+                lBlock.append(bytLine)
+                self.bUnlabelled = 1
+                continue
+
+            # Indices of columns (or entries of horizontally printed array)
+            if (iColon == len(bytLine) - 1) or \
+                    (bytLine.find(b':', iColon + 1) >= 0):
+                self.bIndices = 1
+                continue
+
+            # Entries which start with an index of a row (or an entry)
+            bytLabel = bytLine[:iColon]
+            if bytLabel != self.bytLabel:
+                self.nRows = self.nRows + 1
+                self.bytLabel = bytLabel
+            lBlock.append(bytLine[iColon + 1:])
+
+        if len(lBlock) > 0:
+            if bDone:
+                self.lEntries.append(self._convertLast(lBlock))
+            else:
+                self.lEntries.append(self._convert(b' '.join(lBlock)))
+            self.bEntries = 1
+        return bDone
+
+    def _convertLast(self, lBlock):
+        """
+        Method converts entries of the last block of an array, which is
+        followed by the next array
+
+        Lines between the two arrays (e.g. a caption of the next array) are
+        not entries, so only as many entries as given by the header are
+        taken.
+
+        Input:
+
+        - 1 **lBlock** (*list*)          Lines with printed entries
+
+        Output:
+
+        - 1 **arrEntries** (*NumPy array*)  The entries
+
+        """
+
+        nLeft = int(np.prod(self.tHeader[0])) - \
+            sum([arrEntries.size for arrEntries in self.lEntries])
+        try:
+            arrEntries = self._convert(b' '.join(lBlock))
+            if arrEntries.size >= nLeft:
+                return arrEntries[:nLeft]
+        except ValueError:
+            pass
+
+        # Lines are converted one by one, until the array is complete
+        lParts = [np.zeros(0)]
+        for bytLine in lBlock:
+            if nLeft <= 0:
+                break
+            lParts.append(self._convert(bytLine))
+            nLeft = nLeft - lParts[-1].size
+        return np.concatenate(lParts)
+
+    def _convert(self, bytEntries):
+        """
+        Method converts printed entries to numbers
+
+        Input:
+
+        - 1 **bytEntries** (*bytes*)     Printed entries
+
+        Output:
+
+        - 1 **arrEntries** (*NumPy array*)  The entries
+
+        """
+
+        if self.bytDelimiter is not None:
+            if (self.bytDelimiter != b'...') and (b'...' in bytEntries):
+                _loadErr('Arrays printed only partly can not be read!')
+            bytEntries = bytEntries.replace(self.bytDelimiter, b' ')
+
+        # Integers are read exactly, never through float64
+        if (self.tHeader is not None) and \
+                (self.tHeader[1].kind in ('i', 'u')):
+            return _fromIntString(bytEntries, self.tHeader[1])
+        return _fromString(bytEntries, np.float64)
+
+    def getArray(self):
+        """
+        Method gives the parsed array
+
+        Output:
+
+        - 1 **arrA** (*NumPy array*)     The array
+
+        """
+
+        if (self.tHeader is None) and (self.bEntries == 0):
+            _loadErr('There is no array in the file!')
+        if len(self.lEntries) > 0:
+            arrA = np.concatenate(self.lEntries)
+        else:
+            arrA = np.zeros(0)
+
+        # Shape of the array is taken from the header, or from the indices
+        if self.tHeader is not None:
+            (tShape, dType) = self.tHeader
+        else:
+            dType = np.dtype(np.float64)
+            if self.bUnlabelled or not self.bIndices:
+                tShape = (arrA.size,)           # 1D array
+            else:
+                nSlices = max(self.nSlices, 1)
+                nRows = self.nRows // nSlices
+                if (nRows * nSlices != self.nRows) or \
+                        (arrA.size % max(self.nRows, 1) != 0):
+                    _loadErr('Slices of the array have different shapes!')
+                tShape = (nRows, arrA.size // max(self.nRows, 1))
+                if self.nSlices > 0:
+                    tShape = _getSlicesShape(self.bytSlice, nSlices) + tShape
+
+        if int(np.prod(tShape)) != arrA.size:
+            _loadErr('The number of read entries (%d) does not match '
+                     'the shape of the array %s!' % (arrA.size, tShape))
+        return arrA.reshape(tShape).astype(dType, copy=False)
+
+
+# %%##########################################################################
+def _parseHeader(bytLine):
+    """
+    Function parses a header of a printed array (see _printHeader)
+
+    Input:
+
+    - 1 **bytLine** (*bytes*)         The printed header
+
+    Output:
+
+    - 1 **tShape** (*tuple*)          Shape of the array
+
+    - 2 **dType** (*NumPy dtype*)     Type of entries of the array
+
+    """
+
+    strLine = bytLine.decode(locale.getpreferredencoding(False), 'replace')
+    (strShape, strType) = \
+        strLine[strLine.rindex('-array (') + 8:-2].rsplit(', type - ', 1)
+    tShape = tuple([int(strEnt) for strEnt in
+                    strShape.replace('size - ', '').replace('shape - ', '')
+                    .replace(' rows', '').replace(' cols', '').split(' x ')])
+    try:
+        dType = np.dtype(strType)
+    except TypeError:
+        _loadErr('Unknown type of entries: \'%s\'!' % (strType))
+    return (tShape, dType)
+
+
+# %%##########################################################################
+def _getSlicesShape(bytSlice, nSlices):
+    """
+    Function computes the leading dimensions of N-D array from the label
+    of its last printed 2D slice (e.g. 'A[1, 2, :, :]' -> (2, 3))
+
+    Input:
+
+    - 1 **bytSlice** (*bytes*)        Label of the last 2D slice
+
+    - 2 **nSlices** (*int*)           The number of 2D slices
+
+    Output:
+
+    - 1 **tShape** (*tuple*)          The leading dimensions of the array
+
+    """
+
+    bytIndices = bytSlice[bytSlice.rfind(b'[') + 1:-len(b', :, :]')]
+    try:
+        tShape = tuple([int(bytInd) + 1 for bytInd in bytIndices.split(b',')])
+    except ValueError:
+        return (nSlices,)
+    if int(np.prod(tShape)) != nSlices:
+        return (nSlices,)
+    return tShape
+
+
+# %%##########################################################################
+def _fromString(bytEntries, dType):
+    """
+    Function converts printed entries to numbers in one call
+
+    Input:
+
+    - 1 **bytEntries** (*bytes*)      Printed entries separated by white
+                                      spaces
+
+    - 2 **dType** (*NumPy dtype*)     Type of the numbers
+
+    Output:
+
+    - 1 **arrEntries** (*NumPy array*)  The entries
+
+    Errors: ValueError, if any of the entries is not a number
+
+    """
+
+    # Older versions of NumPy only warn about entries which are not numbers
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            arrEntries = np.fromstring(bytEntries, dtype=dType, sep=' ')
+        except DeprecationWarning:
+            raise ValueError('Entries are not numbers!')
+    return arrEntries
+
+
+# %%##########################################################################
+def _fromIntString(bytEntries, dType):
+    """
+    Function converts printed integer entries to integers of the given type
+
+    Entries are read as 64 bit integers (signed or unsigned, as the type)
+    and they are checked against the range of the type. NumPy saturates
+    entries which do not fit in 64 bits, so if any read entry is equal to
+    the highest or the lowest 64 bit integer, the entries are checked again
+    one by one. Entries printed with a fraction of zeros (e.g. with '%.2f')
+    are read without the fraction, other fractions are an error.
+
+
+    Input:
+
+    - 1 **bytEntries** (*bytes*)      Printed entries separated by white
+                                      spaces
+
+    - 2 **dType** (*NumPy dtype*)     Integer type of the numbers
+
+    Output:
+
+    - 1 **arrEntries** (*NumPy array*)  The entries
+
+    Errors: ValueError, if any of the entries is not an integer, or it does
+            not fit in the type
+
+    """
+
+    dInt = np.dtype(np.uint64 if dType.kind == 'u' else np.int64)
+    try:
+        arrEntries = _fromString(bytEntries, dInt)
+    except ValueError:
+        bytEntries = re.sub(rb'\.0*(?=\s|$)', b'', bytEntries)
+        try:
+            arrEntries = _fromString(bytEntries, dInt)
+        except ValueError:
+            _loadErr('Entries are not integers of type %s!' % (dType))
+
+    # Entries saturated by NumPy
+    hInfo = np.iinfo(dInt)
+    arrSaturated = (arrEntries == hInfo.max)
+    if dInt.kind == 'i':
+        arrSaturated |= (arrEntries == hInfo.min)
+    if arrSaturated.any():
+        for bytEnt in bytEntries.split():
+            if not (hInfo.min <= int(bytEnt) <= hInfo.max):
+                _loadErr('Entry %s does not fit in type %s!'
+                         % (bytEnt.decode(), dType))
+
+    # Entries out of the range of a narrower type
+    hInfo = np.iinfo(dType)
+    if (arrEntries.size > 0) and \
+            ((arrEntries.min() < hInfo.min) or (arrEntries.max() > hInfo.max)):
+        _loadErr('Entries do not fit in type %s!' % (dType))
+    return arrEntries.astype(dType)
+
+
+# %%##########################################################################
+def _loadErr(strErr):
+    """
+    Function raises an error of reading an array
+
+    Input:
+
+    - 1 **strErr** (*string*)         The error message
+
+    Output: none
+
+    """
+
+    raise ValueError(strErr)
+
+
+# %%##########################################################################
+def _printHeader(arrA, strArrayName, bPrintHeader):
+    """
+    Function prints a header before a NumPy array is printed
+
+
+    Input:
+
+    - 1. **arrA** (*NumPy array*)    Array to be printed
+
+    - 2 **strArrayName** (*string*)  Name of the array
+
+    - 3 **bPrintHeader** (*int*)     Flag  which switched on header printing
+                                     1 - switch on, 0 - switch off
+
+    Output:
+
+    - 1 **strArray** (*string*)    String with the header, of an empty string
+                                   if the header is switched off
+
+    """
+
+    # If header printing is switched off, return an empty string
+    if bPrintHeader == 0:
+        return ''
+
+    # Print name of the array, if requested
+    if (strArrayName == ''):
+        strArray = ''
+    else:
+        strArray = ' \'%s\'  ' % (strArrayName)
+
+    # Print dimension, size and type of the array
+    strType = arrA.dtype.name  # Get the name of the array
+    if arrA.ndim == 2:
+        (nRows, nCols) = arrA.shape  # Get shape of the array
+        strArray += '2D-array (shape - %d rows x %d cols, type - %s):\n' \
+            % (nRows, nCols, strType)
+    elif arrA.ndim > 2:
+        strShape = ' x '.join(['%d' % nEnt for nEnt in arrA.shape])
+        strArray += '%dD-array (shape - %s, type - %s):\n' \
+            % (arrA.ndim, strShape, strType)
+    else:
+        iSize = arrA.size          # Get the size of the array
+        strArray += '1D-array (size - %d, type - %s):\n'\
+            % (iSize, strType)
+
+    return strArray
+
+
+# %%##########################################################################
+def _decodeString(strFormat):
+    """
+    Function decodes the string with printing format
+
+
+    Input:
+
+    - 1 **strFormat** (*string*)     Format of printing entires of the array
+                                     Acceptable formats are %d, %f, %.1f,
+                                     %.2f, %.3f, %.4f, ..., %e, %.1e, %.2e,
+                                     ..., %g, %.1g, %.2g, ...
+
+    Output:
+
+    - 1 **bIntegerOnly** (*number*)      If 1 - only integers are printed
+                                         (no mantissa)
+
+    - 2 **iNDigitsAfterDot** (*int*)     The number of digits printed after
+                                         dot (for %g format - the number of
+                                         significant digits)
+
+    - 3 **strKind** (*string*)           Kind of the format: 'd', 'f', 'e'
+                                         or 'g'
+
+    """
+
+    if len(strFormat) == 0:    # String cannot be empty
+        _decodeStringErr(strFormat)
+
+    # Check if the first character is '%', otherwise - error
+    if not (strFormat[0] == '%'):
+        _decodeStringErr(strFormat)
+
+    # -----------------------------------------------------------------------
+    # Check if the second character is 'd', 'f', 'e', 'g' or '.':
+
+    # -----------------------------------------------------------------------
+    # It is 'd':
+    if (strFormat[1] == 'd'):
+        # It must be the last element in the format string
+        if len(strFormat) > 2:
+            _decodeStringErr(strFormat)
+        bIntegerOnly = 1
+        iNDigitsAfterDot = 0
+        strKind = 'd'
+
+    # -----------------------------------------------------------------------
+    # It is 'f', 'e' or 'g':
+    elif (strFormat[1] in ('f', 'e', 'g')):
+        # It must be the last element in the format string
+        if len(strFormat) > 2:
+            _decodeStringErr(strFormat)
+        bIntegerOnly = 0
+        iNDigitsAfterDot = 6
+        strKind = strFormat[1]
+
+    # -----------------------------------------------------------------------
+    # It is '.' (dot):
+    elif (strFormat[1] == '.'):  # It is dot
+
+        if len(strFormat) == 2:    # Dot can not be the last digit
+            _decodeStringErr(strFormat)
+
+        # There must be a number after the dot
+        if not ('0' <= strFormat[2] <= '9'):
+            _decodeStringErr(strFormat)
+
+        # Now read all the numbers after dot
+        iNDigitsAfterDot = 0   # Number after dot
+        for inxChr in np.arange(2, len(strFormat) - 1):  # Loop over all
+            cChr = strFormat[inxChr]
+            if not ('0' <= cChr <= '9'):
+                _decodeStringErr(strFormat)
+
+            # Translate from character to the number
+            iChrNum = ord(cChr) - 48
+
+            # Update the number after dot
+            iNDigitsAfterDot = iNDigitsAfterDot * 10 + iChrNum
+            bIntegerOnly = 0
+
+        # The last letter after the number must be 'f', 'e' or 'g'
+        strKind = strFormat[len(strFormat) - 1]
+        if not (strKind in ('f', 'e', 'g')):
+            _decodeStringErr(strFormat)
+
+    # -----------------------------------------------------------------------
+    # The second character is neither 'd', 'f', 'e', 'g' nor '.', which is
+    # incorrect
+    else:
+        _decodeStringErr(strFormat)
+
+    return (bIntegerOnly, iNDigitsAfterDot, strKind)
+
+
+# Print error message, if the given format is incorrect
+def _decodeStringErr(strFormat):
+    """
+    Input:
+
+    - 1 **strFormat** (*string*)     Format of printing entires of the array
+
+    Output: none
+
+    """
+    strErr = ('Wrong string with printing format!')
+    strErr += ('String > %s < is an incorrect string!') % (strFormat)
+    strErr += (' Correct strings are: %d, %f, %.1f, %.2f, %.3f, %.4f, ...')
+    strErr += (', %e, %.1e, %.2e, ..., %g, %.1g, %.2g, ...')
+    raise ValueError(strErr)
+
+
+# %%##########################################################################
+def _createEntryFormat(strFormat, nMaxChrEnt, strAddSpaceEnt, strDelimiter):
+    """
+    Function creates the format which prints one aligned entry of an array
+
+    The created format prints an additional space, the entry right-aligned
+    to 'nMaxChrEnt' characters and a delimiter, e.g. '%.4f' becomes
+    '%12.4f   ' for 'nMaxChrEnt' = 12 and a delimiter of 3 spaces.
+
+
+    Input:
+
+    - 1 **strFormat** (*string*)       Format of printing entires of the array
+                                       Acceptable formats are %d, %f, %.1f,
+                                       %.2f, %.3f, %.4f, ..., %e, %.1e, %.2e,
+                                       ..., %g, %.1g, %.2g, ...
+
+    - 2 **nMaxChrEnt** (*int*)         The maximum number of characters in
+                                       entries of the array
+
+    - 3 **strAddSpaceEnt** (*string*)  A string with an additional space
+                                       added to entries
+
+    - 4 **strDelimiter** (*string*)    Delimiter printed between the entries
+                                       of the array
+
+    Output:
+
+    - 1 **strEntryFormat** (*string*)  Format which prints one aligned entry
+
+    """
+
+    # The field width is put just after '%', a delimiter may contain '%'
+    strEntryFormat = '%s%%%d%s%s' % (strAddSpaceEnt, nMaxChrEnt, strFormat[1:],
+                                     strDelimiter.replace('%', '%%'))
+    return strEntryFormat
+
+
+# %%##########################################################################
+def _formatEntries(lEntries, strFormat, strEntryFormat, nMaxChrEnt,
+                   strAddSpaceEnt, lSpacesEnt, strDelimiter):
+    """
+    Function prints a run of entries of an array in one batched call
+
+    All the entries are printed with a single string formatting operation.
+    If any of the printed entries is longer than 'nMaxChrEnt' (e.g. 9.999
+    printed with '%.2f' gives '10.00'), the entries are printed one by one
+    with the equalization spaces from 'lSpacesEnt', exactly as it has
+    always been done. Entries of an array printed with a layout made by
+    planA for another array may be shorter than the shortest entry the
+    layout was made for, they get as many spaces as they need, and entries
+    longer than 'nMaxChrEnt' get no spaces.
+
+
+    Input:
+
+    - 1 **lEntries** (*list*)          List with entries to be printed
+
+    - 2 **strFormat** (*string*)       Format of printing entires of the array
+                                       Acceptable formats are %d, %f, %.1f,
+                                       %.2f, %.3f, %.4f, ..., %e, %.1e, %.2e,
+                                       ..., %g, %.1g, %.2g, ...
+
+    - 3 **strEntryFormat** (*string*)  Format which prints one aligned entry
+                                       (created by _createEntryFormat)
+
+    - 4 **nMaxChrEnt** (*int*)         The maximum number of characters in
+                                       entries of the array
+
+    - 5 **strAddSpaceEnt** (*string*)  A string with an additional space
+                                       added to entries
+
+    - 6 **lSpacesEnt** (*list*)        A list with spaces which should be
+                                       added to entries
+
+    - 7 **strDelimiter** (*string*)    Delimiter printed between the entries
+                                       of the array
+
+    Output:
+
+    - 1 **strArray** (*string*)   String with the printed entries
+
+    """
+
+    # Print all the entries at once
+    nEntries = len(lEntries)
+    strArray = (strEntryFormat * nEntries) % tuple(lEntries)
+
+    # Every aligned entry must take exactly the same number of characters
+    nChr1Entry = len(strAddSpaceEnt) + nMaxChrEnt + len(strDelimiter)
+    if len(strArray) == nEntries * nChr1Entry:
+        return strArray
+
+    # Some entries are too long, print the entries one by one
+    lArray = []
+    for entry in lEntries:
+        strEntry = strFormat % entry              # Create the current entry
+        nSpace = nMaxChrEnt - len(strEntry)       # The lenght of a space
+        if 0 <= nSpace < len(lSpacesEnt):
+            strSpace = lSpacesEnt[nSpace]
+        else:
+            strSpace = max(nSpace, 0) * ' '
+        lArray.append('%s%s%s%s'
+                      % (strAddSpaceEnt, strSpace, strEntry, strDelimiter))
+    return ''.join(lArray)
+
+
+# %%##########################################################################
+def _isBulkFormat(arrA, strFormat, strDelimiter):
+    """
+    Function checks if entries of an array can be printed in bulk
+
+    Integer entries printed with '%d' and floating point entries (up to
+    64 bits) printed with '%f', '%.Nf', '%g', '%.Ng' (N up to 15), '%e' or
+    '%.Ne' (N up to 14) can be printed in bulk, if the delimiter has only
+    ASCII characters.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array to be printed
+
+    - 2 **strFormat** (*string*)      Format of printing entires of the array
+
+    - 3 **strDelimiter** (*string*)   Delimiter printed between the entries
+                                      of the array
+
+    Output:
+
+    - 1 **bBulk** (*int*)             1 - the entries can be printed in bulk,
+                                      0 - they can not
+
+    """
+
+    if not all(ord(cChr) < 128 for cChr in strDelimiter):
+        return 0
+    if np.issubdtype(arrA.dtype, np.integer):
+        return int(strFormat == '%d')
+    if np.issubdtype(arrA.dtype, np.floating) and (arrA.dtype.itemsize <= 8) \
+            and (strFormat != '%d'):
+        (_, nM, strKind) = _decodeString(strFormat)
+        if strKind == 'e':
+            return int(nM <= 14)
+        return int(nM <= 15)
+    return 0
+
+
+# %%##########################################################################
+def _formatBulkEntries(arrA, strFormat, nMaxChrEnt, strAddSpaceEnt,
+                       strDelimiter):
+    """
+    Function prints entries of an array in bulk
+
+    All the entries are printed at once into a matrix of characters, one
+    row of the matrix is one aligned entry. The printed entries are
+    exactly the same as if they were printed with the format created by
+    _createEntryFormat. Use _isBulkFormat to check if the entries can be
+    printed in bulk.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)          Array with entries to be printed
+
+    - 2 **strFormat** (*string*)          Format of printing entires
+
+    - 3 **nMaxChrEnt** (*int*)            The maximum number of characters
+                                          in entries of the array
+
+    - 4 **strAddSpaceEnt** (*string*)     A string with an additional space
+                                          added to entries
+
+    - 5 **strDelimiter** (*string*)       Delimiter printed between the
+                                          entries of the array
+
+    Output:
+
+    - 1 **strArray** (*string*)   The string with all the printed entries,
+                                  or None if an entry does not fit in
+                                  nMaxChrEnt characters
+
+    """
+
+    arrA = np.ravel(arrA)
+    if np.issubdtype(arrA.dtype, np.integer):
+        strArray = _formatIntEntries(arrA, nMaxChrEnt, strAddSpaceEnt,
+                                     strDelimiter)
+    elif strFormat[-1] == 'f':
+        strArray = _formatFloatEntries(arrA, strFormat, nMaxChrEnt,
+                                       strAddSpaceEnt, strDelimiter)
+    else:
+        strArray = _formatExpEntries(arrA, strFormat, nMaxChrEnt,
+                                     strAddSpaceEnt, strDelimiter)
+    return strArray
+
+
+# %%##########################################################################
+def _formatIntEntries(arrA, nMaxChrEnt, strAddSpaceEnt, strDelimiter):
+    """
+    Function prints integer entries of an array with '%d' format in bulk
+
+    The number of digits in entries is found with comparisons of the entries
+    with powers of 10, and the digits are found with integer divisions, so
+    the entries are printed exactly, whatever their integer type is.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)          1D array with integer entries
+
+    - 2 **nMaxChrEnt** (*int*)            The maximum number of characters
+                                          in entries of the array
+
+    - 3 **strAddSpaceEnt** (*string*)     A string with an additional space
+                                          added to entries
+
+    - 4 **strDelimiter** (*string*)       Delimiter printed between the
+                                          entries of the array
+
+    Output:
+
+    - 1 **strArray** (*string*)   The string with all the printed entries,
+                                  or None if an entry does not fit in
+                                  nMaxChrEnt characters
+
+    """
+
+    # Magnitudes of the entries, as unsigned integers (so that magnitude of
+    # the lowest negative entry is correct)
+    arrAbs = np.abs(arrA).view('u%d' % arrA.dtype.itemsize)
+    bNeg = arrA < 0
+
+    # Check if all the entries (with minus) fit in the given number of
+    # characters
+    arrDig = _countDigits(arrAbs)
+    if np.max(arrDig + bNeg) > nMaxChrEnt:
+        return None
+
+    # Print the digits, and minus before the first digit of negative entries
+    (arrChr, iCol) = _createCharMatrix(arrA.size, nMaxChrEnt, strAddSpaceEnt,
+                                       strDelimiter)
+    _printDigits(arrChr, arrAbs, arrDig, iCol)
+    inxNeg = np.flatnonzero(bNeg)
+    arrChr[inxNeg, iCol - arrDig[inxNeg]] = ord('-')
+
+    strArray = arrChr.tobytes().decode('ascii')
+    return strArray
+
+
+# %%##########################################################################
+def _formatFloatEntries(arrA, strFormat, nMaxChrEnt, strAddSpaceEnt,
+                        strDelimiter):
+    """
+    Function prints floating point entries of an array with '%.Nf' format
+    in bulk
+
+    Entries are multiplied by 10^N and rounded to integers, which are then
+    printed as integer and fractional parts. An entry is rounded exactly as
+    by '%.Nf' format, unless it is too close to a half after multiplication
+    (or it is too large), such entries are printed one by one. nan, inf and
+    -inf are printed one by one too. Minus is printed before all entries
+    with sign bit, also before -0.0 and negative entries rounded to 0, just
+    like '%.Nf' format does.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)          1D array with floating point
+                                          entries (up to 64 bits)
+
+    - 2 **strFormat** (*string*)          Format of printing entires
+                                          ('%f' or '%.Nf', N <= 15)
+
+    - 3 **nMaxChrEnt** (*int*)            The maximum number of characters
+                                          in entries of the array
+
+    - 4 **strAddSpaceEnt** (*string*)     A string with an additional space
+                                          added to entries
+
+    - 5 **strDelimiter** (*string*)       Delimiter printed between the
+                                          entries of the array
+
+    Output:
+
+    - 1 **strArray** (*string*)   The string with all the printed entries,
+                                  or None if an entry does not fit in
+                                  nMaxChrEnt characters
+
+    """
+
+    (_, nM, _) = _decodeString(strFormat)   # The number of digits after dot
+    iPow = 10 ** nM
+    arrA = arrA.astype(np.float64)
+
+    # Multiply the entries by 10^N and round them to integers
+    arrFin = np.isfinite(arrA)
+    arrY = np.minimum(np.abs(np.where(arrFin, arrA, 0.0)),
+                      2.0 ** 53 / iPow) * iPow
+    arrV = np.rint(arrY)
+
+    # Entries which can not be rounded safely are printed one by one
+    arrOne = ~arrFin | (arrY >= 2.0 ** 52) | \
+        ((0.5 - np.abs(arrY - arrV)) <= 2 * np.spacing(arrY))
+    arrV[arrOne] = 0
+    arrV = arrV.astype(np.uint64)
+
+    # Integer and fractional parts of the entries
+    arrInt = arrV // np.uint64(iPow)
+    arrFrac = arrV % np.uint64(iPow)
+    bNeg = np.signbit(arrA) & ~arrOne
+
+    # Check if all the entries (with dot and minus) fit in the given number
+    # of characters
+    arrDig = _countDigits(arrInt)
+    nFrac = nM + (nM > 0)     # The number of characters after integer part
+    if np.max(np.where(arrOne, 0, arrDig + bNeg + nFrac)) > nMaxChrEnt:
+        return None
+
+    # Print the fractional parts, the dots and the integer parts (if
+    # there is no place for them, all the entries are printed one by one)
+    (arrChr, iCol) = _createCharMatrix(arrA.size, nMaxChrEnt, strAddSpaceEnt,
+                                       strDelimiter)
+    if nFrac < nMaxChrEnt:
+        for inxDig in range(nM):
+            arrChr[:, iCol - inxDig] = arrFrac % 10 + ord('0')
+            arrFrac //= 10
+        if nM > 0:
+            arrChr[:, iCol - nM] = ord('.')
+        _printDigits(arrChr, arrInt, arrDig, iCol - nFrac)
+
+        # Print minus before the first digit of negative entries
+        inxNeg = np.flatnonzero(bNeg)
+        arrChr[inxNeg, iCol - nFrac - arrDig[inxNeg]] = ord('-')
+
+    # Print the remaining entries one by one
+    arrChr[arrOne, :iCol + 1] = ord(' ')
+    for inxEnt in np.flatnonzero(arrOne):
+        strEntry = strFormat % arrA[inxEnt]
+        if len(strEntry) > nMaxChrEnt:
+            return None
+        arrChr[inxEnt, iCol + 1 - len(strEntry):iCol + 1] = \
+            np.frombuffer(strEntry.encode('ascii'), dtype=np.uint8)
+
+    strArray = arrChr.tobytes().decode('ascii')
+    return strArray
+
+
+# %%##########################################################################
+def _formatExpEntries(arrA, strFormat, nMaxChrEnt, strAddSpaceEnt,
+                      strDelimiter):
+    """
+    Function prints floating point entries of an array with '%e' or '%g'
+    formats in bulk
+
+    Entries are split into parts by _splitExpEntries, and the parts are
+    printed into a matrix of characters from the right: the exponent,
+    the fractional part, the dot, the integer part and minus.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)          1D array with floating point
+                                          entries (up to 64 bits)
+
+    - 2 **strFormat** (*string*)          Format of printing entires
+                                          ('%e', '%.Ne', '%g' or '%.Ng')
+
+    - 3 **nMaxChrEnt** (*int*)            The maximum number of characters
+                                          in entries of the array
+
+    - 4 **strAddSpaceEnt** (*string*)     A string with an additional space
+                                          added to entries
+
+    - 5 **strDelimiter** (*string*)       Delimiter printed between the
+                                          entries of the array
+
+    Output:
+
+    - 1 **strArray** (*string*)   The string with all the printed entries,
+                                  or None if an entry does not fit in
+                                  nMaxChrEnt characters
+
+    """
+
+    (arrNeg, arrInt, arrFrac, arrNFrac, arrExp, arrNExp, arrOne, arrLen) = \
+        _splitExpEntries(arrA, strFormat)
+    if np.max(arrLen) > nMaxChrEnt:
+        return None
+
+    (arrChr, iCol) = _createCharMatrix(arrA.size, nMaxChrEnt, strAddSpaceEnt,
+                                       strDelimiter)
+    arrPos = np.full(arrA.size, iCol, dtype=np.intp)  # Current columns
+    inxRows = np.arange(arrA.size)
+
+    # Print the exponents, with their signs and 'e'
+    _printDigitsAt(arrChr, np.abs(arrExp).astype(np.uint64), arrNExp, arrPos)
+    arrSel = arrNExp > 0
+    arrChr[inxRows[arrSel], arrPos[arrSel]] = \
+        np.where(arrExp[arrSel] < 0, ord('-'), ord('+'))
+    arrChr[inxRows[arrSel], arrPos[arrSel] - 1] = ord('e')
+    arrPos[arrSel] -= 2
+
+    # Print the fractional parts and the dots
+    _printDigitsAt(arrChr, arrFrac, arrNFrac, arrPos)
+    arrSel = arrNFrac > 0
+    arrChr[inxRows[arrSel], arrPos[arrSel]] = ord('.')
+    arrPos[arrSel] -= 1
+
+    # Print the integer parts and minus before negative entries
+    _printDigitsAt(arrChr, arrInt, np.where(arrOne, 0, _countDigits(arrInt)),
+                   arrPos)
+    arrChr[inxRows[arrNeg], arrPos[arrNeg]] = ord('-')
+
+    # Print the remaining entries one by one
+    for inxEnt in np.flatnonzero(arrOne):
+        strEntry = strFormat % arrA[inxEnt]
+        arrChr[inxEnt, iCol + 1 - len(strEntry):iCol + 1] = \
+            np.frombuffer(strEntry.encode('ascii'), dtype=np.uint8)
+
+    strArray = arrChr.tobytes().decode('ascii')
+    return strArray
+
+
+# %%##########################################################################
+def _splitExpEntries(arrA, strFormat):
+    """
+    Function splits floating point entries of an array into parts printed
+    with '%e' or '%g' formats
+
+    Entries are rounded to the requested number of significant digits:
+    magnitudes of entries are multiplied (or divided) by an exact power of
+    10 and rounded to integers. An entry is rounded exactly as by the format,
+    unless it is too close to a half after multiplication (or the power of
+    10 is not exact), such entries (and nan, inf, -inf) are marked to be
+    printed one by one.
+
+    With '%e' format an entry is printed as: [-]i.ffffe[+-]xx. With '%g'
+    format an entry is printed as [-]i.ffffe[+-]xx if its exponent is lower
+    than -4 or not lower than the number of significant digits, otherwise it
+    is printed as [-]iii.fff, and trailing zeros of the fractional part
+    are removed (the dot too, if there is no fractional part left).
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)          Array with entries
+
+    - 2 **strFormat** (*string*)          Format of printing entires
+                                          ('%e', '%.Ne', '%g' or '%.Ng')
+
+    Output:
+
+    - 1 **arrNeg** (*NumPy array*)    Entries printed with minus
+
+    - 2 **arrInt** (*NumPy array*)    Integer parts (uint64)
+
+    - 3 **arrFrac** (*NumPy array*)   Fractional parts (uint64)
+
+    - 4 **arrNFrac** (*NumPy array*)  The number of digits in fractional
+                                      parts
+
+    - 5 **arrExp** (*NumPy array*)    Exponents
+
+    - 6 **arrNExp** (*NumPy array*)   The number of digits in exponents
+                                      (0 if there is no exponent)
+
+    - 7 **arrOne** (*NumPy array*)    Entries printed one by one (all their
+                                      parts are 0)
+
+    - 8 **arrLen** (*NumPy array*)    The number of characters in printed
+                                      entries
+
+    """
+
+    (_, nM, strKind) = _decodeString(strFormat)
+    arrA = np.ravel(arrA).astype(np.float64)
+
+    # The number of significant digits
+    if strKind == 'e':
+        nSig = nM + 1
+    else:
+        nSig = max(nM, 1)
+
+    # Exponents of finite non-zero entries (0 for the other entries)
+    arrFin = np.isfinite(arrA)
+    arrAbs = np.abs(np.where(arrFin, arrA, 0.0))
+    arrNz = arrAbs > 0
+    arrExp = np.zeros(arrA.size, dtype=np.intp)
+    arrExp[arrNz] = np.floor(np.log10(arrAbs[arrNz]))
+
+    # Multiply (or divide) the magnitudes by exact powers of 10, so that
+    # they have nSig digits before the dot, and round them
+    arrK = nSig - 1 - arrExp
+    arrOne = ~arrFin | (np.abs(arrK) > 22)
+    arrPow = (10.0 ** np.arange(23))[np.minimum(np.abs(arrK), 22)]
+    with np.errstate(over='ignore'):
+        arrY = np.where(arrK >= 0, arrAbs * arrPow, arrAbs / arrPow)
+    arrM = np.rint(arrY)
+
+    # Entries which can not be rounded safely are printed one by one, also
+    # if the exponent turns out to be wrong
+    arrOne |= (0.5 - np.abs(arrY - arrM)) <= 2 * np.spacing(arrY)
+    arrOne |= arrNz & ((arrY < 10.0 ** (nSig - 1)) | (arrY >= 10.0 ** nSig))
+
+    # Entries rounded up to the next power of 10
+    arrUp = arrM == 10.0 ** nSig
+    arrM[arrUp] = 10.0 ** (nSig - 1)
+    arrExp[arrUp] += 1
+    arrM[arrOne] = 0
+    arrExp[arrOne] = 0
+    arrM = arrM.astype(np.uint64)
+
+    # Entries printed with exponents, and the number of digits after the dot
+    if strKind == 'e':
+        arrBExp = ~arrOne
+    else:
+        arrBExp = ~arrOne & ((arrExp < -4) | (arrExp >= nSig))
+    arrNFrac = np.where(arrBExp, nSig - 1, nSig - 1 - arrExp)
+    arrNFrac[arrOne] = 0
+
+    # Integer and fractional parts
+    arrPowFrac = (np.uint64(10) ** np.arange(20, dtype=np.uint64))[arrNFrac]
+    arrInt = arrM // arrPowFrac
+    arrFrac = arrM % arrPowFrac
+
+    # Trailing zeros of fractional parts are removed with '%g' format
+    if strKind == 'g':
+        arrStrip = arrNFrac > 0
+        while arrStrip.any():
+            arrStrip &= (arrFrac % 10 == 0) & (arrNFrac > 0)
+            arrFrac[arrStrip] //= 10
+            arrNFrac[arrStrip] -= 1
+
+    # The number of digits in exponents, at least 2
+    arrNExp = np.where(arrBExp, np.maximum(_countDigits(
+        np.abs(arrExp).astype(np.uint64)), 2), 0)
+
+    # The number of characters in printed entries
+    arrNeg = np.signbit(arrA) & ~arrOne
+    arrLen = arrNeg + _countDigits(arrInt) + arrNFrac + (arrNFrac > 0) + \
+        (arrNExp > 0) * (arrNExp + 2)
+    for inxEnt in np.flatnonzero(arrOne):
+        arrLen[inxEnt] = len(strFormat % arrA[inxEnt])
+
+    return (arrNeg, arrInt, arrFrac, arrNFrac, arrExp, arrNExp, arrOne,
+            arrLen)
+
+
+# %%##########################################################################
+def _createCharMatrix(nEntries, nMaxChrEnt, strAddSpaceEnt, strDelimiter):
+    """
+    Function creates a matrix of characters for entries printed in bulk
+
+    Every row of the matrix is filled with spaces followed by the delimiter.
+
+
+    Input:
+
+    - 1 **nEntries** (*int*)              The number of entries
+
+    - 2 **nMaxChrEnt** (*int*)            The maximum number of characters
+                                          in entries of the array
+
+    - 3 **strAddSpaceEnt** (*string*)     A string with an additional space
+                                          added to entries
+
+    - 4 **strDelimiter** (*string*)       Delimiter printed between the
+                                          entries of the array
+
+    Output:
+
+    - 1 **arrChr** (*NumPy array*)    The matrix of characters (uint8)
+
+    - 2 **iCol** (*int*)              Index of the column with the last
+                                      character of entries
+
+    """
+
+    iCol = len(strAddSpaceEnt) + nMaxChrEnt - 1
+    arrChr = np.empty((nEntries, iCol + 1 + len(strDelimiter)),
+                      dtype=np.uint8)
+    arrChr[:, :iCol + 1] = ord(' ')
+    arrChr[:, iCol + 1:] = \
+        np.frombuffer(strDelimiter.encode('ascii'), dtype=np.uint8)
+    return (arrChr, iCol)
+
+
+# %%##########################################################################
+def _countDigits(arrNum):
+    """
+    Function counts decimal digits in unsigned integer entries of an array
+
+    Digits are counted with comparisons of the entries with powers of 10.
+
+
+    Input:
+
+    - 1 **arrNum** (*NumPy array*)    Array with unsigned integers
+
+    Output:
+
+    - 1 **arrDig** (*NumPy array*)    The number of digits in the entries
+
+    """
+
+    arrDig = np.ones(arrNum.size, dtype=np.intp)
+    iMaxNum = int(np.max(arrNum)) if arrNum.size > 0 else 0
+    iPow = 10
+    while iPow <= iMaxNum:
+        arrDig += (arrNum >= iPow)
+        iPow = iPow * 10
+    return arrDig
+
+
+# %%##########################################################################
+def _printDigits(arrChr, arrNum, arrDig, iCol):
+    """
+    Function prints unsigned integers into a matrix of characters
+
+    The integers are aligned to the right, their last digits are put in
+    the given column.
+
+
+    Input:
+
+    - 1 **arrChr** (*NumPy array*)    The matrix of characters (uint8)
+
+    - 2 **arrNum** (*NumPy array*)    Array with unsigned integers
+
+    - 3 **arrDig** (*NumPy array*)    The number of digits in the integers
+
+    - 4 **iCol** (*int*)              Index of the column with the last
+                                      digit
+
+    Output: none
+
+    """
+
+    arrRest = arrNum.copy()
+    arrChr[:, iCol] = arrRest % 10 + ord('0')
+    for inxDig in range(1, int(np.max(arrDig))):
+        arrRest //= 10
+        arrChr[:, iCol - inxDig] = \
+            np.where(arrDig > inxDig, arrRest % 10 + ord('0'), ord(' '))
+
+
+# %%##########################################################################
+def _printDigitsAt(arrChr, arrNum, arrNDig, arrPos):
+    """
+    Function prints unsigned integers into a matrix of characters, every
+    integer with its own number of digits and in its own column
+
+    Integers are padded with leading zeros to the given number of digits.
+    The columns are moved to the left, before the printed digits.
+
+
+    Input:
+
+    - 1 **arrChr** (*NumPy array*)    The matrix of characters (uint8)
+
+    - 2 **arrNum** (*NumPy array*)    Array with unsigned integers
+
+    - 3 **arrNDig** (*NumPy array*)   The number of printed digits
+                                      (0 - an integer is not printed)
+
+    - 4 **arrPos** (*NumPy array*)    Indices of columns with the last
+                                      digits (changed by the function)
+
+    Output: none
+
+    """
+
+    inxRows = np.arange(arrNum.size)
+    arrRest = arrNum.copy()
+    for inxDig in range(int(np.max(arrNDig))):
+        arrSel = arrNDig > inxDig
+        arrChr[inxRows[arrSel], arrPos[arrSel] - inxDig] = \
+            arrRest[arrSel] % 10 + ord('0')
+        arrRest //= 10
+    arrPos -= arrNDig
+
+
+# %%##########################################################################
+def _iterBlocks(arrA, nRowsBlk):
+    """
+    Function takes blocks of rows from an array
+
+    If the array is a memory-mapped file opened for reading, the file is
+    read sequentially, and memory pages of a block are given back to
+    the operating system as soon as the next block is taken. Memory used by
+    the process stays bounded, no matter how large the file is.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array from which blocks are taken
+
+    - 2 **nRowsBlk** (*int*)          The number of rows in one block
+
+    Output:
+
+    - 1 **iterBlocks** (*generator*)  Generator which yields index of the
+                                      first row of a block and the block
+    """
+
+    # Get the memory map of the array, if its pages may be released
+    (hMap, iMapStart) = _getMemoryMap(arrA)
+    if hMap is not None:
+        hMap.madvise(mmap.MADV_SEQUENTIAL)
+
+    # Loop over all blocks of rows
+    for iStartRow in range(0, arrA.shape[0], nRowsBlk):
+        arrBlk = arrA[iStartRow:iStartRow + nRowsBlk]
+        try:
+            yield (iStartRow, arrBlk)
+        finally:
+            # The block is not needed anymore, release its memory pages
+            if (hMap is not None) and arrBlk.flags.c_contiguous:
+                iStart = arrBlk.ctypes.data - iMapStart
+                iStop = iStart + arrBlk.nbytes
+                iStart = -(-iStart // mmap.PAGESIZE) * mmap.PAGESIZE
+                iStop = (iStop // mmap.PAGESIZE) * mmap.PAGESIZE
+                if iStop > iStart:
+                    hMap.madvise(mmap.MADV_DONTNEED, iStart, iStop - iStart)
+
+
+# %%##########################################################################
+def _getMemoryMap(arrA):
+    """
+    Function gets the memory map of a memory-mapped array
+
+    Memory map is returned only for arrays mapped from a file opened for
+    reading ('r' or 'r+' mode), and only if the operating system allows to
+    release memory pages of the map.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array to be checked
+
+    Output:
+
+    - 1 **hMap** (*mmap*)        Memory map of the array, or None
+
+    - 2 **iMapStart** (*int*)    Address of the beginning of the memory map
+
+    """
+
+    if not (isinstance(arrA, np.memmap) and (arrA.mode in ('r', 'r+'))):
+        return (None, 0)
+    hMap = getattr(arrA, '_mmap', None)
+    if not (hasattr(hMap, 'madvise') and hasattr(mmap, 'MADV_DONTNEED')):
+        return (None, 0)
+
+    # Find the array which was mapped directly from the file (other arrays
+    # are views of it)
+    arrRoot = arrA
+    while isinstance(arrRoot.base, np.ndarray):
+        arrRoot = arrRoot.base
+    if arrRoot.base is not hMap:
+        return (None, 0)
+
+    # The map starts at the offset rounded down to the allocation granularity
+    iMapStart = arrRoot.ctypes.data \
+        - arrRoot.offset % mmap.ALLOCATIONGRANULARITY
+    return (hMap, iMapStart)
+
+
+# %%##########################################################################
+def _scanArray(arrA, iBlockSize):
+    """
+    Function scans entries of an array in one pass
+
+    The array is scanned block by block, only temporary arrays of the size
+    of a block are created. The array itself is never changed, so read-only
+    arrays (and arrays used by other threads) can be scanned safely.
+    The highest and the lowest magnitude are computed as if nan, +inf and
+    -inf entries were 0.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array to be scanned
+
+    - 2 **iBlockSize** (*int*)        The number of entries of the array
+                                      which are scanned in one block
+
+    Output:
+
+    - 1 **iMaxAbs** (*number*)   The highest magnitude of entries of the array
+
+    - 2 **iMinAbs** (*number*)   The lowest magnitude of entries of the array
+
+    - 3 **bNeg** (*int*)         1 - there are negative finite entries
+                                 in the array, 0 - there are not
+
+    - 4 **bAllNeg** (*int*)      1 - all the entries of the array are finite
+                                 and negative, 0 - they are not
+
+    - 5 **nNan** (*int*)         The number of nan values in the array
+
+    - 6 **nPInf** (*int*)        The number of +inf values in the array
+
+    - 7 **nNInf** (*int*)        The number of -inf values in the array
+
+    """
+
+    if arrA.size == 0:
+        strErr = 'NumPy array which is to be printed can not be empty!'
+        raise ValueError(strErr)
+
+    # Only arrays with floating point entries may contain nan and inf
+    bInexact = np.issubdtype(arrA.dtype, np.inexact)
+
+    iMaxAbs = None    # The highest magnitude of entries
+    iMinAbs = None    # The lowest magnitude of entries
+    bNeg = 0          # Negative entries found?
+    bAllNeg = 1       # Only negative entries found?
+    nNan = 0          # The number of nan values
+    nPInf = 0         # The number of +inf values
+    nNInf = 0         # The number of -inf values
+
+    # Loop over all blocks of rows of the array
+    nRowsBlk = max(1, iBlockSize * arrA.shape[0] // arrA.size)
+    for (_, arrBlk) in _iterBlocks(arrA, nRowsBlk):
+
+        # Count nan, +inf and -inf values in the block, take only
+        # the finite entries
+        if bInexact:
+            arrFin = np.isfinite(arrBlk)
+            if not arrFin.all():
+                nNan = nNan + np.count_nonzero(np.isnan(arrBlk))
+                nPInf = nPInf + np.count_nonzero(arrBlk == np.inf)
+                nNInf = nNInf + np.count_nonzero(arrBlk == -np.inf)
+                arrBlk = arrBlk[arrFin]
+                if arrBlk.size == 0:
+                    continue
+
+        # Magnitudes and signs of the finite entries (magnitudes of signed
+        # integers are unsigned, so that the lowest negative entry does not
+        # overflow)
+        arrAbs = np.abs(arrBlk)
+        if np.issubdtype(arrA.dtype, np.signedinteger):
+            arrAbs = arrAbs.view('u%d' % arrA.dtype.itemsize)
+        iMaxAbsBlk = np.max(arrAbs)
+        iMinAbsBlk = np.min(arrAbs)
+        if (iMaxAbs is None) or (iMaxAbsBlk > iMaxAbs):
+            iMaxAbs = iMaxAbsBlk
+        if (iMinAbs is None) or (iMinAbsBlk < iMinAbs):
+            iMinAbs = iMinAbsBlk
+        if np.min(arrBlk) < 0:
+            bNeg = 1
+        if not (np.max(arrBlk) < 0):
+            bAllNeg = 0
+
+    # nan, +inf and -inf are counted as 0
+    iZero = np.zeros(1, arrA.dtype)[0]
+    if (nNan + nPInf + nNInf) > 0:
+        bAllNeg = 0
+        iMinAbs = iZero
+        if iMaxAbs is None:
+            iMaxAbs = iZero
+
+    return (iMaxAbs, iMinAbs, bNeg, bAllNeg, nNan, nPInf, nNInf)
+
+
+# %%##########################################################################
+def _getEntryWidths(arrA, strFormat, iBlockSize):
+    """
+    Function computes the highest and the lowest number of characters in
+    printed entries of an array
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array to be printed
+
+    - 2 **strFormat** (*string*)      Format of printing entires of the array
+
+    - 3 **iBlockSize** (*int*)        The number of entries of the array
+                                      which are scanned in one block
+
+    Output:
+
+    - 1 **nMaxChrEnt** (*int*)   The maximum number of characters in entries
+                                 of the array
+
+    - 2 **nMinChrEnt** (*int*)   The minimum number of characters in entries
+                                 of the array
+
+    """
+
+    # Decode the string with printing format
+    (bInt, nM, strKind) = _decodeString(strFormat)
+
+    # Widths of entries printed with '%e' or '%g' formats are measured
+    if strKind in ('e', 'g'):
+        return _getExpWidths(arrA, strFormat, iBlockSize)
+
+    # Scan the array: magnitudes, signs and the number of nan/inf entries
+    (iMaxAbs, iMinAbs, bNeg, bAllNeg, nNan, nPInf, nNInf) \
+        = _scanArray(arrA, iBlockSize)
+
+    # --------------------------------------------------------------------
+    # Get the higest number of characters in...
+
+    # ... integer part of elements of the array...
+    # (digits of integer entries are counted exactly)
+    if np.issubdtype(arrA.dtype, np.integer):
+        nX = len(str(int(iMaxAbs)))
+    else:
+        iMaxAbsInt = np.floor(iMaxAbs)
+        nX = np.ceil(np.log10(iMaxAbsInt + 1)).astype(int)
+    if (nX == 0):
+        nX = 1
+    nMaxChrEnt = nX + nM                # ... entries of the array
+    if bInt == 0:                       # Add 1 due of . in float numbers
+        nMaxChrEnt = nMaxChrEnt + 1     # ^
+    if bNeg == 1:                       # Add 1 due to '-' in negative numbers
+        nMaxChrEnt = nMaxChrEnt + 1     # ^
+
+    # If there is nan in the array, the minumum value of
+    # the max number of characters in entries is 3
+    if (nNan > 0) and (nMaxChrEnt < 3):
+        nMaxChrEnt = 3
+
+    # If there is inf in the array, the minumum value of
+    # the max number of characters in entries is 3
+    if (nPInf > 0) and (nMaxChrEnt < 3):
+        nMaxChrEnt = 3
+
+    # If there is -inf in the array, the minumum value of
+    # the max number of characters in entries is 4
+    if (nNInf > 0) and (nMaxChrEnt < 4):
+        nMaxChrEnt = 4
+
+    # --------------------------------------------------------------------
+    # Get the lowest number of characters in...
+
+    # ...integer part of elements of the array
+    if np.issubdtype(arrA.dtype, np.integer):
+        nXl = len(str(int(iMinAbs)))
+    else:
+        iMinAbsInt = np.floor(iMinAbs)
+        nXl = np.ceil(np.log10(iMinAbsInt + 1)).astype(int)
+    if nXl == 0:
+        nXl = 1
+
+    # ... entries of the array
+    nMinChrEnt = nXl + nM
+
+    # Add 1 due to . in float numbers
+    if bInt == 0:
+        nMinChrEnt = nMinChrEnt + 1
+
+    # Add 1 due to '-' in all negative numbers
+    if bAllNeg == 1:
+        nMinChrEnt = nMinChrEnt + 1
+
+    # If there is nan in the array, the maximum value of the
+    # min number of characters in entries is 3
+    if (nNan > 0) and (nMinChrEnt > 3):
+        nMinChrEnt = 3
+
+    # If there is inf in the array, the maximum value of the
+    # min number of characters in entries is 3
+    if (nPInf > 0) and (nMinChrEnt > 3):
+        nMinChrEnt = 3
+
+    # If there is -inf in the array, the maximum value of the
+    # min number of characters in entries is 4
+    if (nNInf > 0) and (nMinChrEnt > 4):
+        nMinChrEnt = 4
+
+    return (nMaxChrEnt, nMinChrEnt)
+
+
+# %%##########################################################################
+def _getExpWidths(arrA, strFormat, iBlockSize):
+    """
+    Function computes the highest and the lowest number of characters in
+    entries of an array printed with '%e' or '%g' formats
+
+    The number of characters in every entry is computed (block by block)
+    by _splitExpEntries, so the widths are exact.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array to be printed
+
+    - 2 **strFormat** (*string*)      Format of printing entires of the array
+
+    - 3 **iBlockSize** (*int*)        The number of entries of the array
+                                      which are scanned in one block
+
+    Output:
+
+    - 1 **nMaxChrEnt** (*int*)   The maximum number of characters in entries
+                                 of the array
+
+    - 2 **nMinChrEnt** (*int*)   The minimum number of characters in entries
+                                 of the array
+
+    """
+
+    if arrA.size == 0:
+        strErr = 'NumPy array which is to be printed can not be empty!'
+        raise ValueError(strErr)
+
+    nMaxChrEnt = 0
+    nMinChrEnt = None
+
+    # Loop over all blocks of rows of the array
+    nRowsBlk = max(1, iBlockSize * arrA.shape[0] // arrA.size)
+    for (_, arrBlk) in _iterBlocks(arrA, nRowsBlk):
+        arrLen = _splitExpEntries(arrBlk, strFormat)[-1]
+        nMaxChrEnt = max(nMaxChrEnt, int(np.max(arrLen)))
+        if (nMinChrEnt is None) or (np.min(arrLen) < nMinChrEnt):
+            nMinChrEnt = int(np.min(arrLen))
+
+    return (nMaxChrEnt, nMinChrEnt)
+
+
+# %%##########################################################################
+def _getColumnWidths(arrA, strFormat, iBlockSize):
+    """
+    Function computes the highest number of characters in printed entries
+    of every column of 2D array
+
+    The array is scanned block by block of rows. The number of characters
+    in every entry of a block is computed (the same way as the highest
+    number of characters is computed by _getEntryWidths), and it is reduced
+    along the rows of the block, so a column is as wide as its widest entry.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      2D (or N-D) array to be printed
+
+    - 2 **strFormat** (*string*)      Format of printing entires of the array
+
+    - 3 **iBlockSize** (*int*)        The number of entries of the array
+                                      which are scanned in one block
+
+    Output:
+
+    - 1 **arrWidths** (*NumPy array*)  The maximum number of characters in
+                                       entries of every column (the last
+                                       dimension)
+
+    """
+
+    if arrA.size == 0:
+        strErr = 'NumPy array which is to be printed can not be empty!'
+        raise ValueError(strErr)
+
+    # Decode the string with printing format
+    (bInt, nM, strKind) = _decodeString(strFormat)
+
+    # Only arrays with floating point entries may contain nan and inf
+    bInexact = np.issubdtype(arrA.dtype, np.inexact)
+
+    arrWidths = np.zeros(arrA.shape[-1], dtype=np.intp)
+    tAxes = tuple(range(arrA.ndim - 1))   # Entries are reduced along these
+
+    # Loop over all blocks of rows of the array
+    nRowsBlk = max(1, iBlockSize * arrA.shape[0] // arrA.size)
+    for (_, arrBlk) in _iterBlocks(arrA, nRowsBlk):
+
+        # Widths of entries printed with '%e' or '%g' formats are measured
+        if strKind in ('e', 'g'):
+            arrLen = _splitExpEntries(arrBlk, strFormat)[-1]
+            arrWidths = np.maximum(arrWidths,
+                                   np.max(arrLen.reshape(arrBlk.shape),
+                                          axis=tAxes))
+            continue
+
+        # Magnitudes of entries (magnitudes of signed integers are unsigned,
+        # so that the lowest negative entry does not overflow), nan, +inf and
+        # -inf are counted as 0
+        arrAbs = np.abs(arrBlk)
+        if np.issubdtype(arrA.dtype, np.signedinteger):
+            arrAbs = arrAbs.view('u%d' % arrA.dtype.itemsize)
+        if bInexact:
+            arrFin = np.isfinite(arrBlk)
+            arrAbs = np.where(arrFin, arrAbs, 0)
+
+        # The number of characters in integer parts of entries
+        if np.issubdtype(arrA.dtype, np.integer):
+            arrX = _countDigits(np.ravel(arrAbs)).reshape(arrBlk.shape)
+        else:
+            # Entries are rounded first, as they are printed, so that
+            # an entry rounded up to the next power of 10 (9.999 printed
+            # with '%.2f' is 10.00) gets one more digit (entries too large
+            # to be rounded are integers anyway, and an error of rounding
+            # never takes away a digit)
+            arrAbs = arrAbs.astype(np.promote_types(arrAbs.dtype, np.float64))
+            with np.errstate(over='ignore', invalid='ignore'):
+                arrRnd = np.round(arrAbs, nM)
+            arrAbs = np.where(np.isfinite(arrRnd),
+                              np.maximum(arrAbs, arrRnd), arrAbs)
+            arrX = np.floor(np.log10(np.maximum(np.floor(arrAbs), 1))) + 1
+            arrX = arrX.astype(np.intp)
+
+        # Add fractional parts, 1 due to . in float numbers, 1 due to '-'
+        # in negative numbers
+        arrLen = arrX + nM + (bInt == 0) + (arrBlk < 0)
+
+        # nan and +inf take 3 characters, -inf takes 4 characters
+        if bInexact:
+            arrLen[~arrFin] = 3
+            arrLen[arrBlk == -np.inf] = 4
+        arrWidths = np.maximum(arrWidths, np.max(arrLen, axis=tAxes))
+
+    return arrWidths
+
+
+# %%##########################################################################
+def _getPlan(arrA, strFormat, iRowBrake, strDelimiter, iMaxCols, iMaxEntr,
+             bVert1D, iBlockSize, iEdgeItems, rRows, rCols, bColWidths,
+             hStats, hPlan=None):
+    """
+    Function gets the layout of printing an array
+
+    Entries of the array are scanned to get the highest and the lowest
+    number of characters in printed entries, everything else is taken from
+    the cache of layouts. If only the first and the last iEdgeItems entries
+    are printed, only these entries are scanned. All the 2D slices of N-D
+    array are scanned together, and they get one layout.
+
+    If a layout made by planA is given, nothing is scanned: the layout is
+    only checked against the shape of the array and the printing
+    parameters.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array to be printed
+
+    - 2 **strFormat** (*string*)      Format of printing entires of the array
+
+    - 3 **iRowBrake** (*int*)         The number of rows before the column
+                                      indices are printed again
+
+    - 4 **strDelimiter** (*string*)   Delimiter printed between the entries
+                                      of the array
+
+    - 5 **iMaxCols** (*int*)          The maximum number of text columns used
+                                      to print a single row
+
+    - 6 **iMaxEntr** (*int*)          The maximum number of entries printed
+                                      in a single line
+
+    - 7 **bVert1D** (*int*)           Is 1D array printed vertically?
+
+    - 8 **iBlockSize** (*int*)        The number of entries of the array
+                                      which are scanned in one block
+
+    - 9 **iEdgeItems** (*int*)        The number of the first and the last
+                                      entries printed in every dimension
+                                      (0 - all the entries are printed)
+
+    - 10 **rRows** (*range*)          Printed indices of rows (entries)
+
+    - 11 **rCols** (*range*)          Printed indices of columns
+                                      (None for 1D array)
+
+    - 12 **bColWidths** (*int*)       Print every column of 2D array with
+                                      its own width?
+
+    - 13 **hStats** (*PrintStats*)    Statistics of printing, time of
+                                      decoding of the format, scanning of
+                                      entries and computing of the layout
+                                      is added to it
+                                      (None - statistics are not collected)
+
+    - 14 **hPlan** (*PrintPlan*)      Layout of printing the array made by
+                                      planA
+                                      [optional, default = None <-- the
+                                       layout is computed]
+
+    Output:
+
+    - 1 **hPlan** (*PrintPlan*)       The layout of the printed array
+
+    """
+
+    # A layout made by planA is used if it was made for the same shape and
+    # the same printing parameters
+    if hPlan is not None:
+        tParams = (arrA.shape[-2:], strFormat, iRowBrake, strDelimiter,
+                   iMaxCols, iMaxEntr, bVert1D, iEdgeItems, rRows, rCols,
+                   (bColWidths == 1) and (arrA.ndim >= 2))
+        if (not isinstance(hPlan, PrintPlan)) or (hPlan.tParams != tParams):
+            raise ValueError('The layout was made for another shape or '
+                             'other printing parameters!')
+        return hPlan
+
+    # Decode the format of entries (an incorrect format is reported before
+    # the array is scanned)
+    tStart = time.perf_counter()
+    _decodeString(strFormat)
+    _addTime(hStats, 'decode', tStart)
+
+    tStart = time.perf_counter()
+    lParts = _getEdgeParts(arrA, iEdgeItems)
+
+    # Get the highest number of characters in printed entries of every
+    # printed column, if every column of 2D (N-D) array has its own width
+    tColWidths = None
+    if (bColWidths == 1) and (arrA.ndim >= 2):
+        arrColWidths = np.max([_getColumnWidths(arrPart, strFormat, iBlockSize)
+                               for (_, arrPart) in lParts], axis=0)
+        tColWidths = tuple(arrColWidths.tolist())
+        nMaxChrEnt = max(tColWidths)
+        nMinChrEnt = min(tColWidths)
+
+    # Get the higest and the lowest number of characters in printed entries
+    # of the array
+    else:
+        lWidths = [_getEntryWidths(arrPart, strFormat, iBlockSize)
+                   for (_, arrPart) in lParts]
+        nMaxChrEnt = max([nMaxChr for (nMaxChr, _) in lWidths])
+        nMinChrEnt = min([nMinChr for (_, nMinChr) in lWidths])
+    _addTime(hStats, 'widths', tStart)
+
+    # N-D array is printed as 2D slices which share one layout
+    tStart = time.perf_counter()
+    hPlan = _getCachedPlan(arrA.shape[-2:], int(nMaxChrEnt), int(nMinChrEnt),
+                           strFormat, iRowBrake, strDelimiter, iMaxCols,
+                           iMaxEntr, bVert1D, iEdgeItems, rRows, rCols,
+                           tColWidths)
+    _addTime(hStats, 'layout', tStart)
+    return hPlan
+
+
+# %%##########################################################################
+@functools.lru_cache(maxsize=_nPlans)
+def _getCachedPlan(tShape, nMaxChrEnt, nMinChrEnt, strFormat, iRowBrake,
+                   strDelimiter, iMaxCols, iMaxEntr, bVert1D, iEdgeItems,
+                   rRows, rCols, tColWidths):
+    """
+    Function gets the layout of printing an array from the cache
+
+    The most recently used layouts are kept in the cache, a layout is
+    computed only if it is not in the cache.
+
+
+    Input:
+
+    - 1 ... 13                        Parameters of the layout, the same as
+                                      for PrintPlan
+
+    Output:
+
+    - 1 **hPlan** (*PrintPlan*)       The layout of the printed array
+
+    """
+
+    hPlan = PrintPlan(tShape, nMaxChrEnt, nMinChrEnt, strFormat, iRowBrake,
+                      strDelimiter, iMaxCols, iMaxEntr, bVert1D, iEdgeItems,
+                      rRows, rCols, tColWidths)
+    return hPlan
+
+
+# %%##########################################################################
+def _getIndexSize(rInd):
+    """
+    Function computes the highest printed index + 1
+
+    Widths of printed indices are computed as if the indices were
+    the indices of an array of this size.
+
+
+    Input:
+
+    - 1 **rInd** (*range*)            Printed indices
+
+    Output:
+
+    - 1 **nInd** (*int*)              The highest printed index + 1
+                                      (1 if there are no indices)
+
+    """
+
+    if len(rInd) == 0:
+        return 1
+    nInd = max(rInd[0], rInd[-1]) + 1
+    return nInd
+
+
+# %%##########################################################################
+def _getEdgeSize(nEnt, iEdgeItems):
+    """
+    Function computes the number of printed entries in a dimension of
+    an array
+
+    If there are more than 2 * iEdgeItems entries in the dimension, only
+    the first and the last iEdgeItems entries are printed.
+
+
+    Input:
+
+    - 1 **nEnt** (*int*)              The number of entries in the dimension
+
+    - 2 **iEdgeItems** (*int*)        The number of the first and the last
+                                      printed entries
+                                      (0 - all the entries are printed)
+
+    Output:
+
+    - 1 **nEntV** (*int*)             The number of printed entries
+
+    """
+
+    if (iEdgeItems > 0) and (nEnt > 2 * iEdgeItems):
+        return 2 * iEdgeItems
+    return nEnt
+
+
+# %%##########################################################################
+def _getEdgeParts(arrA, iEdgeItems):
+    """
+    Function takes the printed parts of an array
+
+    If only the first and the last iEdgeItems entries (rows) of the array
+    are printed, there are two parts: the first and the last entries (rows).
+    Otherwise the whole array is the only part. If only the first and
+    the last iEdgeItems columns of a 2D array are printed, only these
+    columns are taken (copied) to the parts. The middle dimensions of N-D
+    array are split into the first and the last entries as well. The rest
+    of the array is never touched.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array to be printed
+
+    - 2 **iEdgeItems** (*int*)        The number of the first and the last
+                                      entries printed in every dimension
+                                      (0 - all the entries are printed)
+
+    Output:
+
+    - 1 **lParts** (*list*)           List with tuples: index of the first
+                                      entry (row) of a part in the whole
+                                      array and the part of the array
+
+    """
+
+    # The first and the last entries (rows)
+    nEnt = arrA.shape[0]
+    if _getEdgeSize(nEnt, iEdgeItems) < nEnt:
+        lParts = [(0, arrA[:iEdgeItems]),
+                  (nEnt - iEdgeItems, arrA[nEnt - iEdgeItems:])]
+    else:
+        lParts = [(0, arrA)]
+
+    # The first and the last entries in the middle dimensions of N-D array
+    for iAxis in range(1, arrA.ndim - 1):
+        nEnt = arrA.shape[iAxis]
+        if _getEdgeSize(nEnt, iEdgeItems) < nEnt:
+            tInd = iAxis * (slice(None),)
+            lParts = [(iStart, arrPart[tInd + (slcPart,)])
+                      for (iStart, arrPart) in lParts
+                      for slcPart in (slice(0, iEdgeItems),
+                                      slice(nEnt - iEdgeItems, nEnt))]
+
+    # The first and the last columns
+    nCols = arrA.shape[-1]
+    if (arrA.ndim >= 2) and (_getEdgeSize(nCols, iEdgeItems) < nCols):
+        inxCols = np.r_[0:iEdgeItems, nCols - iEdgeItems:nCols]
+        lParts = [(iStart, arrPart[..., inxCols])
+                  for (iStart, arrPart) in lParts]
+
+    return lParts
+
+
+# %%##########################################################################
+def _getLines(nLines, nEntrypLine, nEntrypLastLine):
+    """
+    Function computes places for entries printed in every line, if every
+    line (except the last one) has the same number of places
+
+
+    Input:
+
+    - 1 **nLines** (*int*)            The number of printed lines
+
+    - 2 **nEntrypLine** (*int*)       The number of places for entries
+                                      in one line
+
+    - 3 **nEntrypLastLine** (*int*)   The number of places for entries
+                                      in the last line
+
+    Output:
+
+    - 1 **lLines** (*list*)           List with a tuple for every printed
+                                      line: index of the first place in
+                                      the line and index of the place after
+                                      the line
+
+    """
+
+    lLines = [(inxLine * nEntrypLine, (inxLine + 1) * nEntrypLine)
+              for inxLine in range(nLines - 1)]
+    iStart = (nLines - 1) * nEntrypLine
+    lLines.append((iStart, iStart + nEntrypLastLine))
+    return lLines
+
+
+# %%##########################################################################
+def _getSegments(lLines, nEnt, nEntV):
+    """
+    Function splits printed lines into segments of consecutive entries
+
+    A segment is a tuple: index of the first entry of the segment among
+    the printed entries, index of the first entry of the segment in
+    the whole array (or a row) and the number of entries in the segment.
+    If only the first and the last entries are printed (nEntV < nEnt),
+    the gap between them takes the place of one entry and it is
+    a segment marked by None. Otherwise every line is one segment.
+
+
+    Input:
+
+    - 1 **lLines** (*list*)           Places for entries in every printed
+                                      line (see _getLines)
+
+    - 2 **nEnt** (*int*)              The number of entries in the array
+                                      (in a row)
+
+    - 3 **nEntV** (*int*)             The number of printed entries
+
+    Output:
+
+    - 1 **lSegments** (*list*)        List with a list of segments for every
+                                      printed line
+
+    """
+
+    iEdgeItems = nEntV // 2   # The number of entries before the gap
+
+    lSegments = []
+    for (iStart, iStop) in lLines:
+
+        # All the entries are printed
+        if nEntV == nEnt:
+            lSegments.append([(iStart, iStart, iStop - iStart)])
+            continue
+
+        # The first entries, the gap and the last entries
+        lLine = []
+        if iStart < iEdgeItems:
+            lLine.append((iStart, iStart, min(iStop, iEdgeItems) - iStart))
+        if iStart <= iEdgeItems < iStop:
+            lLine.append(None)
+        iStartLast = max(iStart, iEdgeItems + 1)
+        if iStartLast < iStop:
+            lLine.append((iStartLast - 1, iStartLast - 1 + nEnt - nEntV,
+                          iStop - iStartLast))
+        lSegments.append(lLine)
+
+    return lSegments
+
+
+# %%##########################################################################
+def _printGap(nChr):
     """
+    Function prints a gap between the first and the last printed entries
+
     Input:
 
-    - 1 **strFormat** (*string*)     Format of printing entires of the array
+    - 1 **nChr** (*int*)              The number of characters in the gap
 
-    Output: none
+    Output:
+
+    - 1 **strGap** (*string*)         The printed gap, '...' aligned to
+                                      the right (or cut, if there are less
+                                      than 3 characters)
 
     """
-    strErr = ('Wrong string with printing format!')
-    strErr += ('String > %s < is an incorrect string!') % (strFormat)
-    strErr += (' Correct strings are: %d, %f, %.1f, %.2f, %.3f, %.4f, ...')
-    raise ValueError(strErr)
+
+    strGap = '...'[:nChr].rjust(nChr)
+    return strGap
 
 
 # %%##########################################################################
-def _1DarrayVert(arrA, strArrayName, strFormat, iRowBrake, bPrintHeader):
+def _1DarrayVert(arrA, strArrayName, strFormat, iRowBrake, bPrintHeader,
+                 iBlockSize, iEdgeItems, rRows, hStats, hPlan):
     """
     Function prints 1D numpy array vertically
 
@@ -426,7 +5486,8 @@ def _1DarrayVert(arrA, strArrayName, strFormat, iRowBrake, bPrintHeader):
     - 3 **strFormat** (*string*)      Format of printing entires of
                                       the array [optional, default = '%f']
                                       Acceptable formats are %d, %f, %.1f,
-                                      %.2f, %.3f, %.4f, ...
+                                      %.2f, %.3f, %.4f, ..., %e, %.1e, %.2e,
+                                      ..., %g, %.1g, %.2g, ...
 
     - 4 **iRowBrake** (*int*)         The number of rows before the column
                                       indices are printed again
@@ -436,25 +5497,34 @@ def _1DarrayVert(arrA, strArrayName, strFormat, iRowBrake, bPrintHeader):
                                       1 - yes add, 0 - do not add
                                       [optional, default = 0]
 
+    - 6 **iBlockSize** (*int*)        The number of entries of the array
+                                      which are scanned and printed in one
+                                      block
+
+    - 7 **iEdgeItems** (*int*)        The number of the first and the last
+                                      printed entries
+                                      (0 - all the entries are printed)
+
+    - 8 **rRows** (*range*)           Printed indices of the entries
+
+    - 9 **hStats** (*PrintStats*)     Statistics of printing
+                                      (None - statistics are not collected)
+
+    - 10 **hPlan** (*PrintPlan*)      Layout of printing the array made by
+                                      planA (None - the layout is computed)
+
     Output:
 
-    - 1 **strArray** (*string*)   String with entries of the numpy array
-                                  printed vertically
+    - 1 **iterArray** (*generator*)   Generator which yields strings with
+                                      consecutive parts of the numpy array
+                                      printed vertically
 
     """
 
-    # Get technial parameters of 1D array printing
-    (nEnt, nD, nMaxChrInd, nMaxChrEnt, nMinChrEnt) \
-        = _1DgetTechnical(arrA, strFormat, '')
-    # nEnt - the number of entries in the array
-    # nD   - the number of characters in delimter
-    # nMaxChrInd - the maximum number of characters in indices of the array
-    # nMaxChrEnt - the maximum number of characters in entries of the array
-    # nMinChrEnt - the minimum number of characters in entries of the array
-
-    # Get the printing equalization spaces
-    (lSpacesInd, _, _, _) = \
-        _1DcreateEqSpaces(nMaxChrInd, nMaxChrEnt, nMinChrEnt)
+    # Get the layout of the printed array (lines are not wrapped)
+    hPlan = _getPlan(arrA, strFormat, iRowBrake, '', 0, 0, 1, iBlockSize,
+                     iEdgeItems, rRows, None, 0, hStats, hPlan)
+    lSpacesInd = hPlan.lSpacesInd
     # lSpacesInd - a list with spaces which should be added
     # to indices of an entry
 
@@ -462,49 +5532,105 @@ def _1DarrayVert(arrA, strArrayName, strFormat, iRowBrake, bPrintHeader):
     # Printing starts here:
 
     # Add a header, if requested
-    strArray = \
-        _printHeader(arrA, strArrayName, bPrintHeader)
-
-    # Loop over all entries in the array
-    nDig = 1   # The number of digits in the current index of an entry
-    iThr = 10  # The next threshold which changes the number of digits
-
-    # Create the command which prints a single entrys
-    strPrintEntry = '\'%s\' %% (arrA[inxEntr])' % (strFormat)
-    for inxEntr in np.arange(nEnt):
-
-        # If the threshold is reached, move forward the number
-        # of digits in index of an entry
-        if inxEntr == iThr:
-            nDig = nDig + 1
-            iThr = iThr * 10  # Move the threshold forward
-
-        # Print index of the current entry and its value:
-        strArray = strArray + ('%d:%s  ') % (inxEntr, lSpacesInd[nDig - 1])
-        strEntry = eval(strPrintEntry)                # Print the entry
-
-        # If the number is nan, 0 or positive, add a blank space before
-        # the number
-        if (arrA[inxEntr] >= 0) or np.isnan(arrA[inxEntr]):
-            strBlankMinus = ' '
-        else:
-            strBlankMinus = ''
+    yield _printHeader(arrA, strArrayName, bPrintHeader)
+
+    # Create the format which prints a single entry with its index:
+    # index, spaces after the index, blank space instead of minus, entry
+    strEntryFormat = '%%d:%%s  %%s%s\n' % (strFormat)
+
+    # Entries are printed in blocks, every block starts just after
+    # a row brake
+    iRowBrake = int(iRowBrake)
+    nBlk = iRowBrake * max(1, iBlockSize // iRowBrake)
+
+    # Loop over all blocks of entries in the printed parts of the array,
+    # there is a gap between the parts
+    for (inxPart, (iStartPart, arrPart)) in \
+            enumerate(_getEdgeParts(arrA, iEdgeItems)):
+        if inxPart > 0:
+            yield '...\n'
+        for (iStartBlk, arrBlk) in _iterBlocks(arrPart, nBlk):
+            iStartEntry = iStartPart + iStartBlk
+            rInd = hPlan.rRows[iStartEntry:iStartEntry + arrBlk.size]
+            tStart = time.perf_counter()
+            strBlk = _1DprintBlockVert(arrBlk, iStartEntry, rInd, lSpacesInd,
+                                       strEntryFormat, iRowBrake)
+            _addTime(hStats, 'format', tStart)
+            yield strBlk
+
+    yield '\n'
+
 
-        # Print the entry
-        strArray = strArray + strBlankMinus + strEntry + '\n'
+# %%##########################################################################
+def _1DprintBlockVert(arrBlk, iStartEntry, rInd, lSpacesInd, strEntryFormat,
+                      iRowBrake):
+    """
+    Function prints vertically a block of entries of 1D numpy array
 
-        # Add a row brake, if iRowBrake entries where printed without
-        # printing a row brake
-        if ((inxEntr + 1) % iRowBrake) == 0:
-            strArray = strArray + '\n'
 
-    strArray = strArray + '\n'
-    return strArray
+    Input:
+
+    - 1 **arrBlk** (*NumPy array*)    Block of entries to be printed
+
+    - 2 **iStartEntry** (*int*)       Index of the first entry of the block
+                                      in the printed array
+
+    - 3 **rInd** (*range*)            Printed indices of the entries
+
+    - 4 **lSpacesInd** (*list*)       A list with spaces which should be
+                                      added to indices of an entry
+
+    - 5 **strEntryFormat** (*string*) Format which prints a single entry with
+                                      its index
+
+    - 6 **iRowBrake** (*int*)         The number of rows before a row brake
+
+    Output:
+
+    - 1 **strArray** (*string*)       String with the printed entries
+
+    """
+
+    nEntries = arrBlk.size
+
+    # Spaces added after indices, the number of digits in indices
+    # changes at powers of 10 (indices may go up or down)
+    lSpaces = []
+    inxEntr = 0
+    while inxEntr < nEntries:
+        nDig = len(str(rInd[inxEntr]))
+        if rInd.step > 0:
+            iThr = min(rInd.stop, 10 ** nDig)
+        else:
+            iThr = max(rInd.stop, (10 ** (nDig - 1) if nDig > 1 else 0) - 1)
+        nSame = len(range(rInd[inxEntr], iThr, rInd.step))
+        lSpaces.extend([lSpacesInd[nDig - 1]] * nSame)
+        inxEntr = inxEntr + nSame
+
+    # If the number is nan, 0 or positive, add a blank space before
+    # the number
+    lBlankMinus = np.where(arrBlk < 0, '', ' ').tolist()
+
+    # Add a row brake after every iRowBrake entries, counted from
+    # the start of the array
+    nFirst = min((-iStartEntry) % iRowBrake, nEntries)
+    strBlkFormat = strEntryFormat * nFirst
+    if (nFirst > 0) and ((iStartEntry + nFirst) % iRowBrake == 0):
+        strBlkFormat += '\n'
+    (nFull, nRem) = divmod(nEntries - nFirst, iRowBrake)
+    strBlkFormat += (strEntryFormat * iRowBrake + '\n') * nFull \
+        + strEntryFormat * nRem
+
+    # Print indices of the entries and their values
+    tArgs = tuple(itertools.chain.from_iterable(
+        zip(rInd, lSpaces, lBlankMinus, arrBlk.tolist())))
+    return strBlkFormat % tArgs
 
 
 # %%##########################################################################
 def _1DarrayHori(arrA, strArrayName, strFormat, iRowBrake, strDelimiter,
-                 iMaxCols, iMaxEntr, bPrintHeader, iLineSpaces):
+                 iMaxCols, iMaxEntr, bPrintHeader, iLineSpaces, iBlockSize,
+                 iEdgeItems, rRows, hStats, hPlan):
     """
     Function prints 1D numpy array horizontally
 
@@ -517,7 +5643,8 @@ def _1DarrayHori(arrA, strArrayName, strFormat, iRowBrake, strDelimiter,
 
     - 3 **strFormat** (*string*)      Format of printing entires of the array
                                       Acceptable formats are %d, %f, %.1f,
-                                      %.2f, %.3f, %.4f, ...
+                                      %.2f, %.3f, %.4f, ..., %e, %.1e, %.2e,
+                                      ..., %g, %.1g, %.2g, ...
 
     - 4 **iRowBrake** (*int*)         The number of rows before the column
                                       indices are printed again
@@ -540,211 +5667,143 @@ def _1DarrayHori(arrA, strArrayName, strFormat, iRowBrake, strDelimiter,
                                       lines
                                       [optional, default = 1]
 
-    Output:
+    - 10 **iBlockSize** (*int*)       The number of entries of the array
+                                      which are scanned and printed in one
+                                      block
 
-    - 1 **strArray** (*string*)   String with entries of the numpy array
-    """
+    - 11 **iEdgeItems** (*int*)       The number of the first and the last
+                                      printed entries
+                                      (0 - all the entries are printed)
 
-    # Get technial parameters of 1D array printing
-    (nEnt, nD, nMaxChrInd, nMaxChrEnt, nMinChrEnt) \
-        = _1DgetTechnical(arrA, strFormat, strDelimiter)
-    # nEnt - the number of entries in the array
-    # nD   - the number of characters in delimter
-    # nMaxChrInd - the maximum number of characters in indices of the array
-    # nMaxChrEnt - the maximum number of characters in entries of the array
-    # nMinChrEnt - the minimum number of characters in entries of the array
+    - 12 **rRows** (*range*)          Printed indices of the entries
 
-    # Get the printing equalization spaces
-    (lSpacesInd, lSpacesEnt, strAddSpaceInd, strAddSpaceEnt) \
-        = _1DcreateEqSpaces(nMaxChrInd, nMaxChrEnt, nMinChrEnt)
-    # lSpacesInd - a list with spaces which should be added to indices of
-    #              an entry
-    #
-    # lSpacesEnt - a list with spaces which should be added to entries
-    #
-    # strAddSpaceInd - string with an additional space added to indices
-    #                  of entries
-    #
-    # strAddSpaceEnt - string with an additional space added to  entries
+    - 13 **hStats** (*PrintStats*)    Statistics of printing
+                                      (None - statistics are not collected)
 
-    # Get the line printing parameters: the number of lines and number of
-    # entries in one line
-    (nLines, nEntrypLine, nEntrypLastLine) \
-        = _1DgetLineParam(iMaxCols, iMaxEntr, nEnt, nD, nMaxChrEnt,
-                          strAddSpaceEnt)
-    # nLines - the number of lines used to print all the entries from
-    # the array
+    - 14 **hPlan** (*PrintPlan*)      Layout of printing the array made by
+                                      planA (None - the layout is computed)
 
-    # nEntrypLine - the number of entries in one line
-    # nEntrypLastLine - the number of entries in the last line
+    Output:
+
+    - 1 **iterArray** (*generator*)   Generator which yields strings with
+                                      consecutive parts of the numpy array
+                                      printed horizontally
+    """
+
+    # Get the layout of the printed array
+    hPlan = _getPlan(arrA, strFormat, iRowBrake, strDelimiter, iMaxCols,
+                     iMaxEntr, 0, iBlockSize, iEdgeItems, rRows, None, 0,
+                     hStats, hPlan)
+    nLines = hPlan.nLines                   # The number of printed lines
+    nEntrypLine = hPlan.nEntrypLine         # The number of entries in a line
+
+    # Entries are printed in bulk, if possible
+    bBulk = _isBulkFormat(arrA, strFormat, strDelimiter)
+    nChr1Entry = len(hPlan.strAddSpaceEnt) + hPlan.nMaxChrEnt + \
+        len(strDelimiter)
+    strBlk = None
 
     # --------------------------------------------------------------------
     # Printing starts here
 
     # Add a header, if requested
-    strArray = _printHeader(arrA, strArrayName, bPrintHeader)
+    yield _printHeader(arrA, strArrayName, bPrintHeader)
+
+    # Entries are taken from the array in blocks of whole lines. If only
+    # the first and the last entries are printed, they are taken in one
+    # block
+    nLinesBlk = int(max(1, iBlockSize // nEntrypLine))
+    if hPlan.nEntV < hPlan.nEnt:
+        arrA = np.concatenate([arrPart for (_, arrPart)
+                               in _getEdgeParts(arrA, iEdgeItems)])
+        nLinesBlk = nLines
+    iterBlocks = _iterBlocks(arrA, int(nLinesBlk * nEntrypLine))
 
     # Loop over all lines to be printed
-    iStartEntry = 0   # Starting index of the current entry
-    for inxLine in np.arange(nLines):
-        # If it is the last line, the number of entries is different
-        if inxLine == (nLines - 1):
-            nEntrypLine = nEntrypLastLine
-
-        strArray += 4 * ' '   # Print the margin
-
-        # Print indices of entries
-        strArray += _1DprintIndices(arrA, iStartEntry, nEntrypLine,
-                                    lSpacesInd, strAddSpaceInd, nD) + '\n'
-
-        # Print the margin
-        strArray += 4 * ' '
-        strArray += _1DprintEntries(arrA, iStartEntry, nEntrypLine,
-                                    strAddSpaceEnt, lSpacesEnt,
-                                    strDelimiter, strFormat,
-                                    nMaxChrEnt) + '\n'
-
-        strArray += iLineSpaces * '\n'  # Add spaces between lines
-
-        iStartEntry += nEntrypLine  # Move forward the start entry
+    for inxLine in range(nLines):
+        lSegments = hPlan.lSegments[inxLine]
+
+        # Take the next block of entries from the array
+        if (inxLine % nLinesBlk) == 0:
+            (iStartBlk, arrBlk) = next(iterBlocks)
+            if bBulk:
+                tStart = time.perf_counter()
+                strBlk = _formatBulkEntries(arrBlk, strFormat,
+                                            hPlan.nMaxChrEnt,
+                                            hPlan.strAddSpaceEnt,
+                                            strDelimiter)
+                _addTime(hStats, 'format', tStart)
+
+        # Print the margin and indices of entries in all segments of
+        # the line
+        yield 4 * ' '
+        for tSegment in lSegments:
+            if tSegment is None:
+                yield hPlan.strGapInd
+                continue
+            (_, iStartInd, nEntries) = tSegment
+            yield _1DprintIndices(hPlan.rRows[iStartInd:iStartInd + nEntries],
+                                  hPlan.lSpacesInd, hPlan.strAddSpaceInd,
+                                  hPlan.nD)
+        yield '\n'
+
+        # Print the margin and the entries
+        yield 4 * ' '
+        for tSegment in lSegments:
+            if tSegment is None:
+                yield hPlan.strGapEnt
+                continue
+            (iStartEntry, _, nEntries) = tSegment
+            if strBlk is None:
+                tStart = time.perf_counter()
+                strEntries = _1DprintEntries(arrBlk, iStartEntry - iStartBlk,
+                                             nEntries, hPlan.strAddSpaceEnt,
+                                             hPlan.lSpacesEnt, strDelimiter,
+                                             strFormat, hPlan.strEntryFormat,
+                                             hPlan.nMaxChrEnt)
+                _addTime(hStats, 'format', tStart)
+                yield strEntries
+            else:
+                iStart = (iStartEntry - iStartBlk) * nChr1Entry
+                yield strBlk[iStart:iStart + nEntries * nChr1Entry]
+        yield '\n'
+
+        yield iLineSpaces * '\n'  # Add spaces between lines
+    iterBlocks.close()
 
     # Add new line at the end of the output string
-    strArray += '\n\n'
-    return strArray
+    yield '\n\n'
 
 
 # %%#########################################################################
-def _1DgetTechnical(arrA, strFormat, strDelimiter):
+def _1DgetTechnical(nEnt, strDelimiter):
     """
     Function computes technical parametrers of 1D array printing
 
     Input:
 
-    - 1 **arrA** (*NumPy array*)      Array to be printed
-
-    - 2 **strFormat** (*string*)      Format of printing entires of the array
+    - 1 **nEnt** (*int*)              The number of entries in the array
 
-    - 3 **strDelimiter** (*string*)   Delimiter printed between
+    - 2 **strDelimiter** (*string*)   Delimiter printed between
                                       the entries of the array
 
     Output:
 
-    - 1 **nEnt** (*int*)         The number of entries in the array
-
-    - 2 **nD** (*int*)           The number of characters in the delimter
-
-    - 3 **nMaxChrInd** (*int*)   The maximum number of characters in indices
-                                 of the array
-
-    - 4 **nMaxChrEnt** (*int*)   The maximum number of characters in entries
-                                 of the array
+    - 1 **nD** (*int*)           The number of characters in the delimter
 
-    - 5 **nMinChrEnt** (*int*)   The minimum number of characters in entries
+    - 2 **nMaxChrInd** (*int*)   The maximum number of characters in indices
                                  of the array
 
     """
-    # --------------------------------------------------------------------
-    # Count how many +inf, -inf and nan are in the array.
-    # Change inf, -inf and nan into 0
-    arrA_nan = np.isnan(arrA)                  # Positions of nan values in A
-    arrA[arrA_nan] = 0                         # Change nans into 0
-    nNan = (arrA_nan[arrA_nan == True]).size   # The number of nan values in A
-
-    arrA_pinf = np.isinf(arrA) * (arrA >= 0)     # Positions of +inf vals in A
-    arrA[arrA_pinf] = 0                          # Change +infs into 0
-    nPInf = (arrA_pinf[arrA_pinf == True]).size  # The number of +inf vals in A
-
-    arrA_ninf = np.isinf(arrA) * (arrA < 0)      # Positions of -inf vals in A
-    arrA[arrA_ninf] = 0                          # Change -infs into 0
-    nNInf = (arrA_ninf[arrA_ninf == True]).size  # The number of -inf vals in A
-    # --------------------------------------------------------------------
-
-    # --------------------------------------------------------------------
-    # Get the higest number of characters in...
-
-    # Decode the string with printing format
-    (bInt, nM) = _decodeString(strFormat)
-
-    # Get the higest number of characters in integer part of entries
-    # of the array
-    iMaxAbsInt = np.floor(np.max(np.abs(arrA)))
-    nX = np.ceil(np.log10(iMaxAbsInt + 1)).astype(int)   #
-    if (nX == 0):                                        #
-        nX = 1                                           #
-
-    # Get the higest number of characters in entries of the array
-    nMaxChrEnt = nX + nM
-    if bInt == 0:                     # Add 1 because of . in float numbers
-        nMaxChrEnt = nMaxChrEnt + 1   # ^
-    if (arrA[arrA < 0].size) > 0:     # Add 1 because of '-' in negat. numbers
-        nMaxChrEnt = nMaxChrEnt + 1   # ^
-
-    # If there is nan in the array, the minumum value of
-    # the max number of characters in entries is 3
-    if (nNan > 0) and (nMaxChrEnt < 3):
-        nMaxChrEnt = 3
-
-    # If there is inf in the array, the minumum value of the max number
-    # of characters in entries is 3
-    if (nPInf > 0) and (nMaxChrEnt < 3):
-        nMaxChrEnt = 3
-
-    # If there is -inf in the array, the minumum value of the max number
-    # of characters in entries is 4
-    if (nNInf > 0) and (nMaxChrEnt < 4):
-        nMaxChrEnt = 4
-
-    # -------
-    nEnt = arrA.size    # Get the number of entries in 1D array
 
+    # Get the number of characters in...
     nC = np.ceil(np.log10(nEnt)).astype(int)       # ...size of the array
     if (nC == 0):
         nC = 1
     nMaxChrInd = nC + 1          # ... indices of the array (1 because of :)
-
     nD = len(strDelimiter)       # ...delimiter
 
-    # --------------------------------------------------------------------
-    # Get the lowest number of characters in...
-
-    # ...integer part of entries of the array
-    iMinAbsInt = np.floor(np.min(np.abs(arrA)))
-    nXl = np.ceil(np.log10(iMinAbsInt + 1)).astype(int)
-    if nXl == 0:
-        nXl = 1
-
-    nMinChrEnt = nXl + nM            # ... entries of the array
-    if bInt == 0:                    # Add 1 due to . in float numbers
-        nMinChrEnt = nMinChrEnt + 1  # ^
-    if (arrA[arrA >= 0].size) == 0:  # Add 1 due to '-' in all neg. numbers
-        nMinChrEnt = nMinChrEnt + 1  # ^
-
-    # If there is nan in the array, the maximum value of
-    # the min number of characters in entries is 3
-    if (nNan > 0) and (nMinChrEnt > 3):
-        nMinChrEnt = 3
-
-    # If there is inf in the array, the maximum value of
-    # the min number of characters in entries is 3
-    if (nPInf > 0) and (nMinChrEnt > 3):
-        nMinChrEnt = 3
-
-    # If there is -inf in the array, the maximum value of
-    # the min number of characters in entries is 4
-    if (nNInf > 0) and (nMinChrEnt > 4):
-        nMinChrEnt = 4
-
-    # --------------------------------------------------------------------
-    # Restore correct positions of +inf, -inf and nan in the array
-    if nNan > 0:
-        arrA[arrA_nan] = np.nan
-    if nPInf > 0:
-        arrA[arrA_pinf] = np.inf
-    if nNInf > 0:
-        arrA[arrA_ninf] = -np.inf
-    # --------------------------------------------------------------------
-
-    return (nEnt, nD, nMaxChrInd, nMaxChrEnt, nMinChrEnt)
+    return (nD, nMaxChrInd)
 
 
 # %%#########################################################################
@@ -878,59 +5937,40 @@ def _1DgetLineParam(iMaxCols, iMaxEntr, nEnt, nD, nMaxChrEnt, strAddSpaceEnt):
 
 
 # %%#########################################################################
-def _1DprintIndices(arrA, iStartEntry, nEntries, lSpacesInd,
-                    strAddSpaceInd, nD):
+def _1DprintIndices(rInd, lSpacesInd, strAddSpaceInd, nD):
     """
     Function prints in one line indices of selected entries from a 1D array
 
     Input:
 
-    - 1 **arrA** (*NumPy array*)       Array to be printed
+    - 1 **rInd** (*range*)             Indices of the entries to be printed
 
-    - 2 **iStartEntry** (*int*)        Index of the first entry to be printed
-
-    - 3 **nEntries** (*int*)           The number of entries to be printed
-
-    - 4 **lSpacesInd** (*list*)        A list with spaces which should be
+    - 2 **lSpacesInd** (*list*)        A list with spaces which should be
                                        added to indices of an entry
 
-    - 5 **strAddSpaceEnt** (*string*)  Blank spaces before every entry to
+    - 3 **strAddSpaceEnt** (*string*)  Blank spaces before every entry to
                                        equalize length of printed entries
                                        with printed indices of column
 
-    - 6 **nD** (*integer*)             The number of characters in delimiter
+    - 4 **nD** (*integer*)             The number of characters in delimiter
 
     Output:
 
     - 1 **strArray** (*string*)   String with indices of entries
     """
 
-    # Get the lowest number of digits in indices of entries
-    if (iStartEntry >= 2):
-        nIndDigL = np.ceil(np.log10(iStartEntry)).astype(int)
-    else:
-        nIndDigL = 1
-
-    strArray = ''
-    nDigs = nIndDigL     # The current number of digits
-    iThr = 10 ** nDigs   # Next threshold which changes the number of digits
-
-    # Loop over all entries
-    for inxEntry in np.arange(iStartEntry, iStartEntry + nEntries):
-        if inxEntry == iThr:     # Threshold is reached
-            nDigs = nDigs + 1    # The number of digits
-            iThr = iThr * 10     # Threshold
-
-        # Print the entry
-        strArray += ('%s%s%d:%s') \
-            % (strAddSpaceInd, lSpacesInd[nDigs - 1], inxEntry, nD * ' ')
+    # Create the format which prints one index, the index is aligned to
+    # the right, exactly as if spaces from lSpacesInd were added before it
+    strIndFormat = '%s%%%dd:%s' % (strAddSpaceInd, len(lSpacesInd), nD * ' ')
 
+    # Print all the indices in one go
+    strArray = (strIndFormat * len(rInd)) % tuple(rInd)
     return strArray
 
 
 # %%#########################################################################
 def _1DprintEntries(arrA, iStartEntry, nEntries, strAddSpaceEnt, lSpaces,
-                    strDelimiter, strFormat, nMaxChrEnt):
+                    strDelimiter, strFormat, strEntryFormat, nMaxChrEnt):
     """
     Function prints in one line selected entries from a 1D array
 
@@ -953,9 +5993,13 @@ def _1DprintEntries(arrA, iStartEntry, nEntries, strAddSpaceEnt, lSpaces,
 
     - 7 **strFormat** (*string*)        Format of printing entires of the array
                                         Acceptable formats are %d, %f, %.1f,
-                                        %.2f, %.3f, %.4f, ...
+                                        %.2f, %.3f, %.4f, ..., %e, %.1e, %.2e,
+                                        ..., %g, %.1g, %.2g, ...
 
-    - 8 **nMaxChrEnt** (*integer*)      The maximum possible number of
+    - 8 **strEntryFormat** (*string*)   Format which prints one aligned entry
+                                        (created by _createEntryFormat)
+
+    - 9 **nMaxChrEnt** (*integer*)      The maximum possible number of
                                         characters used to print one entry
                                          from the array
 
@@ -964,253 +6008,607 @@ def _1DprintEntries(arrA, iStartEntry, nEntries, strAddSpaceEnt, lSpaces,
     - 1. **strArray** (*string*)   String with selected entries of
                                    the numpy array
     """
-    # Create a command which prints a single entry
-    strPrintEntry = '\'%s\' %% (arrA[inxEntr])' % (strFormat)
+    # Get the selected entries
+    iStartEntry = int(iStartEntry)
+    lEntries = arrA[iStartEntry:iStartEntry + int(nEntries)].tolist()
+
+    # Print all the entries in one go
+    strArray = _formatEntries(lEntries, strFormat, strEntryFormat, nMaxChrEnt,
+                              strAddSpaceEnt, lSpaces, strDelimiter)
+    return strArray
+
+
+# %%#########################################################################
+def _2Darray(arrA, strArrayName, strFormat, iRowBrake, strDelimiter, iMaxCols,
+             iMaxEntr, bPrintHeader, iLineSpaces, iRowSpaces, iBlockSize,
+             nWorkers, iEdgeItems, rRows, rCols, bColWidths, hStats,
+             hPlan):
+    """
+     Function prints 2D numpy array
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array to be printed
+
+    - 2 **strArrayName** (*string*)   Name of the array
+
+    - 3 **strFormat** (*string*)      Format of printing entires of the array
+                                      [optional, default = '%f']
+                                      Acceptable formats are %d, %f, %.1f,
+                                      %.2f, %.3f, %.4f, ..., %e, %.1e, %.2e,
+                                      ..., %g, %.1g, %.2g, ...
+
+    - 4 **iRowBrake** (*int*)         The number of rows before the column
+                                      indices are printed again
+
+    - 5 **strDelimiter** (*string*)   Delimiter printed between the entries
+                                      of the array
+
+    - 6 **iMaxCols** (*int*)          The maximum number of text columns used
+                                      to print a single row
+
+    - 8 **iMaxEntr** (*int*)          The maximum number of entries printed
+                                      in a single line
+
+    - 9 **bPrintHeader** (*int*)      Add header with array name, dimension
+                                      and size?
+                                      1 - yes add, 0 - do not add
+                                      [optional, default = 0]
+
+    - 10 **iLineSpaces** (*int*)      The number of spaces between printed
+                                      lines
+                                      [optional, default = 1]
+
+    - 11 **iRowSpaces** (*int*)       The number of spaces between printed
+                                      rows (only for 2D arrays)
+                                      [optional, default = 1]
+
+    - 12 **iBlockSize** (*int*)       The number of entries of the array
+                                      which are scanned and printed in one
+                                      block
+
+    - 13 **nWorkers** (*int*)         The number of processes which print
+                                      blocks of rows
+
+    - 14 **iEdgeItems** (*int*)       The number of the first and the last
+                                      printed rows and columns
+                                      (0 - all the entries are printed)
+
+    - 15 **rRows** (*range*)          Printed indices of rows
+
+    - 16 **rCols** (*range*)          Printed indices of columns
+
+    - 17 **bColWidths** (*int*)       Print every column with its own width?
+
+    - 18 **hStats** (*PrintStats*)    Statistics of printing
+                                      (None - statistics are not collected)
+
+    - 19 **hPlan** (*PrintPlan*)      Layout of printing the array made by
+                                      planA (None - the layout is computed)
+
+    Output:
+
+    - 1 **iterArray** (*generator*)   Generator which yields strings with
+                                      consecutive rows of the printed numpy
+                                      array
+
+    """
+
+    # Get the layout of the printed array
+    hPlan = _getPlan(arrA, strFormat, iRowBrake, strDelimiter, iMaxCols,
+                     iMaxEntr, 0, iBlockSize, iEdgeItems, rRows, rCols,
+                     bColWidths, hStats, hPlan)
+
+    # Add a header, if requested
+    yield _printHeader(arrA, strArrayName, bPrintHeader)
+
+    # If only the first and the last rows or columns are printed, print
+    # the parts of the array, there is a gap between the parts
+    lParts = _getEdgeParts(arrA, iEdgeItems)
+    if (len(lParts) > 1) or (hPlan.nColsV < hPlan.nCols):
+        for (inxPart, (iStartRow, arrPart)) in enumerate(lParts):
+            if inxPart > 0:
+                yield '...'.rjust(hPlan.nMaxChrIndR) + '\n' + \
+                    iRowSpaces * '\n'
+            for strRow in _2DprintRows(arrPart, iStartRow, hPlan,
+                                       iLineSpaces, iRowSpaces, iBlockSize,
+                                       hStats):
+                yield strRow
+        yield '\n'
+        return
+
+    # Print all the rows of the array, block by block
+    for (_, _, strRows) in _2DprintBlocks(arrA, hPlan, iLineSpaces,
+                                          iRowSpaces, iBlockSize, nWorkers,
+                                          hStats):
+        yield strRows
+
+    yield '\n'   # Add a new line at the end of the array
+
+
+# %%#########################################################################
+def _2DprintRows(arrA, iStartRow, hPlan, iLineSpaces, iRowSpaces,
+                 iBlockSize, hStats):
+    """
+    Function prints consecutive rows of 2D numpy array
+
+    Rows may be taken from any place in the array, the printed rows are
+    exactly the same as the rows of the whole printed array.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Rows of the array to be printed
+
+    - 2 **iStartRow** (*int*)         Index of the first row in the whole
+                                      array
+
+    - 3 **hPlan** (*PrintPlan*)       The layout of the printed array
+
+    - 4 **iLineSpaces** (*int*)       The number of spaces between printed
+                                      lines
+
+    - 5 **iRowSpaces** (*int*)        The number of spaces between printed
+                                      rows
+
+    - 6 **iBlockSize** (*int*)        The number of entries of the array
+                                      which are printed in one block
+
+    - 7 **hStats** (*PrintStats*)     Statistics of printing, time of
+                                      formatting of entries is added to it
+                                      (None - statistics are not collected)
+
+    Output:
+
+    - 1 **iterRows** (*generator*)    Generator which yields strings with
+                                      consecutive printed rows
+
+    """
+
+    nLines = hPlan.nLines              # The number of lines in a row
+
+    # Entries are printed in bulk, if possible
+    bBulk = _isBulkFormat(arrA, hPlan.strFormat, hPlan.strDelimiter)
+    lFieldStart = hPlan.arrFieldStart.tolist()
+    nChrRow = lFieldStart[-1]      # The number of characters in a row
+
+    # Rows are taken from the array in blocks
+    nRowsBlk = max(1, iBlockSize // max(hPlan.nColsV, 1))
+    iterBlocks = _iterBlocks(arrA, nRowsBlk)
+    strBlk = None
+
+    # Loop over the rows
+    for inxBlkRow in range(arrA.shape[0]):
+        inxRow = iStartRow + inxBlkRow
+
+        # Take the next block of rows from the array
+        if (inxBlkRow % nRowsBlk) == 0:
+            arrBlk = next(iterBlocks)[1]
+            tStart = time.perf_counter()
+            if bBulk:
+                strBlk = _formatBulkEntries(arrBlk, hPlan.strFormat,
+                                            hPlan.nMaxChrEnt,
+                                            hPlan.strAddSpaceEnt,
+                                            hPlan.strDelimiter)
+                if (strBlk is not None) and (hPlan.tColWidths is not None):
+                    strBlk = _2DcutFields(strBlk, hPlan.arrFieldMask)
+            if strBlk is None:
+                lRowsBlk = arrBlk.tolist()
+            _addTime(hStats, 'format', tStart)
+
+        # Parts of the current row are collected in a list
+        lArray = []
+
+        # Loop over all lines printed for the current row
+        for inxLine in range(nLines):
+
+            # Add indices of columns, if needed
+            if ((inxRow % hPlan.iRowBrake) == 0):
+                lArray.append(hPlan.lColumns[inxLine])
+
+            # Print index of the current line
+            lArray.append(_2DprintInxRow(hPlan.rRows[inxRow],
+                                         hPlan.lSpacesIndR))
+
+            # Print entries from all segments of the current line (or take
+            # them from the entries printed in bulk)
+            for (inxSeg, tSegment) in enumerate(hPlan.lSegments[inxLine]):
+                if tSegment is None:
+                    lArray.append(hPlan.strGapEnt)
+                    continue
+
+                # Column index of the first entry to be printed in this
+                # segment and the number of entries in the segment
+                (inxStartCol, _, nEntries) = tSegment
+                if strBlk is not None:
+                    iStart = (inxBlkRow % nRowsBlk) * nChrRow
+                    lArray.append(
+                        strBlk[iStart + lFieldStart[inxStartCol]:
+                               iStart + lFieldStart[inxStartCol + nEntries]])
+                elif hPlan.tColWidths is None:
+                    tStart = time.perf_counter()
+                    lArray.append(_2DprintRow(lRowsBlk[inxBlkRow % nRowsBlk],
+                                              inxStartCol, nEntries,
+                                              hPlan.nMaxChrEnt,
+                                              hPlan.strFormat,
+                                              hPlan.strEntryFormat,
+                                              hPlan.strAddSpaceEnt,
+                                              hPlan.lSpacesEnt,
+                                              hPlan.strDelimiter))
+                    _addTime(hStats, 'format', tStart)
+                else:
+                    tStart = time.perf_counter()
+                    lRow = lRowsBlk[inxBlkRow % nRowsBlk]
+                    lArray.append(hPlan.lFormats[inxLine][inxSeg]
+                                  % tuple(lRow[inxStartCol:
+                                               inxStartCol + nEntries]))
+                    _addTime(hStats, 'format', tStart)
+            lArray.append('\n')
+
+            # Add spaces between lines (only if there are multiple
+            # lines and it is not the last line)
+            if (nLines > 1) and (inxLine < nLines - 1):
+                lArray.append(iLineSpaces * '\n')
+
+        lArray.append(iRowSpaces * '\n')  # Add new lines at the end of the row
+
+        # Force a new line after the last row
+        if (iRowSpaces == 0) and (inxRow == hPlan.nRows - 1):
+            lArray.append('\n')
+
+        # The row is ready
+        yield ''.join(lArray)
+    iterBlocks.close()
+
+
+# %%#########################################################################
+def _2DprintBlocks(arrA, hPlan, iLineSpaces, iRowSpaces, iBlockSize,
+                   nWorkers, hStats):
+    """
+    Function prints 2D numpy array block of rows by block of rows
+
+    If there is more than one worker, blocks of rows are printed in
+    a pool of processes (see _2DrunTasks).
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array to be printed
+
+    - 2 **hPlan** (*PrintPlan*)       The layout of the printed array
+
+    - 3 **iLineSpaces** (*int*)       The number of spaces between printed
+                                      lines
+
+    - 4 **iRowSpaces** (*int*)        The number of spaces between printed
+                                      rows
+
+    - 5 **iBlockSize** (*int*)        The number of entries of the array
+                                      which are printed in one block
+
+    - 6 **nWorkers** (*int*)          The number of processes which print
+                                      blocks of rows
+
+    - 7 **hStats** (*PrintStats*)     Statistics of printing
+                                      (None - statistics are not collected)
+
+    Output:
+
+    - 1 **iterBlocks** (*generator*)  Generator which yields index of
+                                      the first row of a block, index of
+                                      the row after the block and a string
+                                      with printed rows of the block
+    """
+
+    # Rows are taken from the array in blocks
+    nRowsBlk = max(1, iBlockSize // max(hPlan.nCols, 1))
+    bStats = int(hStats is not None)
+    iterTasks = (((iStartRow, iStartRow + arrBlk.shape[0]),
+                  (arrBlk, iStartRow, hPlan, iLineSpaces, iRowSpaces,
+                   iBlockSize, bStats))
+                 for (iStartRow, arrBlk) in _iterBlocks(arrA, nRowsBlk))
+
+    for ((iStartRow, iStopRow), strRows) in _2DrunTasks(iterTasks, nWorkers,
+                                                        hStats):
+        yield (iStartRow, iStopRow, strRows)
+
+
+# %%#########################################################################
+def _2DrunTasks(iterTasks, nWorkers, hStats):
+    """
+    Function prints blocks of rows given as tasks, in order
+
+    A task is a tuple: a key of the task and a tuple with parameters of
+    _2DprintBlock (None, if there is nothing to be printed). If there is
+    more than one worker, the blocks are printed in a pool of processes
+    (see _2DgetPool), which is started once and used again by the next
+    printed arrays. Printed blocks are always given back in order, and only
+    a few blocks per process wait to be printed or taken, so memory used by
+    printing stays bounded. Statistics of printing every block are sent back
+    with the printed block, and they are added to hStats.
+
+
+    Input:
+
+    - 1 **iterTasks** (*iterable*)    Tasks with blocks of rows to be printed
+
+    - 2 **nWorkers** (*int*)          The number of processes which print
+                                      blocks of rows
+
+    - 3 **hStats** (*PrintStats*)     Statistics of printing
+                                      (None - statistics are not collected)
+
+    Output:
+
+    - 1 **iterBlocks** (*generator*)  Generator which yields the key of
+                                      a task and a string with printed rows
+                                      of the block
+    """
+
+    # One process prints the blocks one by one
+    if nWorkers <= 1:
+        for (tKey, tBlock) in iterTasks:
+            if tBlock is None:
+                yield (tKey, '')
+            else:
+                yield (tKey, _2DtakeBlock(_2DprintBlock(tBlock), hStats))
+        return
+
+    # Many processes print the blocks, the printed blocks are taken in order
+    hPool = _2DgetPool(int(nWorkers))
+    dqTasks = collections.deque()
+    try:
+        for (tKey, tBlock) in iterTasks:
+            if tBlock is None:
+                hTask = None
+            else:
+                hTask = hPool.apply_async(_2DprintBlock, (tBlock,))
+            dqTasks.append((tKey, hTask))
+
+            # Take the oldest block, if there are enough blocks waiting
+            if len(dqTasks) >= 2 * nWorkers:
+                (tKey, hTask) = dqTasks.popleft()
+                yield (tKey, '' if hTask is None
+                       else _2DtakeBlock(hTask.get(), hStats))
+
+        # Take the remaining blocks
+        while dqTasks:
+            (tKey, hTask) = dqTasks.popleft()
+            yield (tKey, '' if hTask is None
+                   else _2DtakeBlock(hTask.get(), hStats))
+    finally:
+        # Wait for the blocks which are still printed, if the generator is
+        # closed early (the pool may hang, if it is terminated while the
+        # processes send printed blocks)
+        for (_, hTask) in dqTasks:
+            if hTask is not None:
+                hTask.wait()
+
+
+# %%##########################################################################
+def _2DgetPool(nWorkers):
+    """
+    Function gets a pool of processes which print blocks of rows
+
+    The pool is started when it is needed for the first time, and it is
+    kept for the next printed arrays, so that processes are not started
+    again for every printed array. Processes are started by a fork server
+    (or spawned, if there is no fork server on the platform): a process
+    forked from a process with many threads (e.g. from DumpQueue or adumpA)
+    may hang on a lock held by another thread. The pool may be used by many
+    threads at once.
+
+
+    Input:
+
+    - 1 **nWorkers** (*int*)          The number of processes in the pool
+
+    Output:
+
+    - 1 **hPool** (*Pool*)            The pool of processes
+
+    """
 
-    strArray = ''
-    # Loop over all entries
-    for inxEntr in np.arange(iStartEntry, iStartEntry + nEntries):
-        strEntry = eval(strPrintEntry)    # Create the current entry
+    with _hPoolsLock:
+        hPool = _dPools.get(nWorkers)
+        if hPool is None:
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                hContext = multiprocessing.get_context('forkserver')
+            else:
+                hContext = multiprocessing.get_context('spawn')
+            hPool = hContext.Pool(nWorkers)
+            if not _dPools:
+                atexit.register(_2DclosePools)
+            _dPools[nWorkers] = hPool
+    return hPool
 
-        # The number of characters in the current entryv
-        nChrEntry = len(strEntry)
 
-        # The lenght of a space which must be added
-        nSpace = nMaxChrEnt - nChrEntry
+# %%##########################################################################
+def _2DclosePools():
+    """
+    Function closes the pools of processes which print blocks of rows
+
+    It is called when the interpreter exits. The processes finish printed
+    blocks, and they are joined.
 
-        # Print the entry
-        strArray += ('%s%s%s%s') \
-            % (strAddSpaceEnt, lSpaces[nSpace], strEntry, strDelimiter)
 
-    return strArray
+    Input:  none
 
+    Output:  none
 
-# %%#########################################################################
-def _2Darray(arrA, strArrayName, strFormat, iRowBrake, strDelimiter, iMaxCols,
-             iMaxEntr, bPrintHeader, iLineSpaces, iRowSpaces):
     """
-     Function prints 2D numpy array
 
-    Input:
+    with _hPoolsLock:
+        for hPool in _dPools.values():
+            hPool.close()
+            hPool.join()
+        _dPools.clear()
 
-    - 1 **arrA** (*NumPy array*)      Array to be printed
 
-    - 2 **strArrayName** (*string*)   Name of the array
+# %%#########################################################################
+def _2DprintBlock(tBlock):
+    """
+    Function prints one block of rows of 2D numpy array
 
-    - 3 **strFormat** (*string*)      Format of printing entires of the array
-                                      [optional, default = '%f']
-                                      Acceptable formats are %d, %f, %.1f,
-                                      %.2f, %.3f, %.4f, ...
+    This is the function which is run by processes which print blocks of
+    rows, so it takes all of its parameters in one tuple.
 
-    - 4 **iRowBrake** (*int*)         The number of rows before the column
-                                      indices are printed again
 
-    - 5 **strDelimiter** (*string*)   Delimiter printed between the entries
-                                      of the array
+    Input:
 
-    - 6 **iMaxCols** (*int*)          The maximum number of text columns used
-                                      to print a single row
+    - 1 **tBlock** (*tuple*)          The block of rows, index of its first
+                                      row in the whole array, the printing
+                                      parameters of _2DprintRows and a flag:
+                                      collect statistics of printing?
+                                      (arrBlk, iStartRow, hPlan, iLineSpaces,
+                                      iRowSpaces, iBlockSize, bStats)
 
-    - 8 **iMaxEntr** (*int*)          The maximum number of entries printed
-                                      in a single line
+    Output:
 
-    - 9 **bPrintHeader** (*int*)      Add header with array name, dimension
-                                      and size?
-                                      1 - yes add, 0 - do not add
-                                      [optional, default = 0]
+    - 1 **strRows** (*string*)        String with the printed rows
 
-    - 10 **iLineSpaces** (*int*)      The number of spaces between printed
-                                      lines
-                                      [optional, default = 1]
+    - 2 **hStats** (*PrintStats*)     Statistics of printing the block
+                                      (None, if they are not collected)
 
-    - 11 **iRowSpaces** (*int*)       The number of spaces between printed
-                                      rows (only for 2D arrays)
-                                      [optional, default = 1]
+    """
 
-    Output:
+    hStats = PrintStats() if tBlock[-1] else None
+    strRows = ''.join(_2DprintRows(*(tBlock[:-1] + (hStats,))))
+    return (strRows, hStats)
 
-    - 1 **strArray** (*string*)   String with entries of the numpy array
-                                  printed vertically
 
+# %%#########################################################################
+def _2DtakeBlock(tPrinted, hStats):
     """
+    Function takes a printed block of rows and adds statistics of printing
+    the block to statistics of printing the array
 
-    # Get technical parameters of 2D array printing
-    (nRows, nCols, nD, nMaxChrEnt, nMaxChrIndR, nMaxChrIndC, nMinChrEnt) \
-        = _2DgetTechnical(arrA, strFormat, strDelimiter)
-    # nRows - the number of rows in the array
-    # nCols - the number of columns in the array
-    # nD - the number of characters in the delimter
-    # nMaxChrEnt  - the max number of characters in entries of the array
-    # nMaxChrIndR - the max number of characters in indices of rows of
-    #               the array
-    # nMaxChrIndC - the max number of characters in indices of columns of
-    #               the array
-    # nMinChrEnt - the min number of characters in entries of the array
 
-    # Get the printing equalization spaces
-    (lSpacesIndC, lSpacesIndR, lSpacesEnt, strAddSpaceIndC, strAddSpaceEnt) = \
-        _2DcreateEqSpaces(nMaxChrEnt, nMaxChrIndR, nMaxChrIndC, nMinChrEnt)
+    Input:
 
-    # --------------------------------------------------------------------
-    # Check if it is possible to print at least one entry?
+    - 1 **tPrinted** (*tuple*)        Output of _2DprintBlock
 
-    # Get the  the line printing parameters: the number of lines and number of
-    #  entries in one line
-    (nLines, nEntrypLine, nEntrypLastLine) = \
-        _2DgetLineParam(iMaxCols, iMaxEntr, nCols, nD, nMaxChrEnt,
-                        nMaxChrIndR, strAddSpaceEnt)
-    # nLines - the number of lines used to print all the entries from the array
-    # nEntrypLine - the number of entries in one line
-    # nEntrypLastLine - the number of entries in the last line
+    - 2 **hStats** (*PrintStats*)     Statistics of printing
+                                      (None - statistics are not collected)
 
-    # -------------------------------------------------------------------
-    # Printing starts here
+    Output:
 
-    # If rows must be broke into many lines, indices of
-    # columns must be printed after every row
-    if (nLines > 1):
-        iRowBrake = 1
+    - 1 **strRows** (*string*)        String with the printed rows
 
-    # Add a header, if requested
-    strArray = _printHeader(arrA, strArrayName, bPrintHeader)
+    """
 
-    # Loop over all rows of the array
-    for inxRow in np.arange(nRows):
+    (strRows, hStatsBlk) = tPrinted
+    if hStats is not None:
+        hStats.merge(hStatsBlk)
+    return strRows
 
-        # The current number of entries printed in a line
-        nEntries = nEntrypLine
 
-        # Loop over all lines printed for the current row
-        for inxLine in np.arange(0, nLines):
+# %%#########################################################################
+def _2DcutFields(strBlk, arrFieldMask):
+    """
+    Function cuts fields of columns out of rows of 2D array printed in bulk
 
-            # Column index of the first entry to be printed in this line
-            inxStartCol = (inxLine * nEntrypLine)
+    Entries printed in bulk have the same width in every column, so
+    the spaces before entries which do not fit in fields of narrower columns
+    are removed.
 
-            # The number of entries in the last line is different
-            if (inxLine == (nLines - 1)):
-                nEntries = nEntrypLastLine
 
-            # Print indices of columns, if needed
-            if ((inxRow % iRowBrake) == 0):
-                strArray += _2DprintColumns(inxStartCol, nEntries,
-                                            strAddSpaceIndC, lSpacesIndC,
-                                            nMaxChrIndR, nD)
+    Input:
 
-            # Print index of the current line
-            strArray = strArray + _2DprintInxRow(inxRow, lSpacesIndR)
+    - 1 **strBlk** (*string*)          String with uniformly printed entries
+                                       of rows
 
-            # Print entries from the current line
-            strArray = strArray + _2DprintRow(arrA, inxRow, inxStartCol,
-                                              nEntries, nMaxChrEnt, strFormat,
-                                              strAddSpaceEnt, lSpacesEnt,
-                                              strDelimiter)
-            strArray = strArray + '\n'
+    - 2 **arrFieldMask** (*NumPy array*)  Characters of uniformly printed
+                                          entries of a row which are kept
+                                          in fields of columns
 
-            # Add spaces between lines (only if there are multiple
-            # lines and it is not the last line)
-            if (nLines > 1) and (inxLine < nLines - 1):
-                strArray = strArray + iLineSpaces * '\n'
+    Output:
 
-        strArray += iRowSpaces * '\n'   # Add new lines at the end of the row
+    - 1 **strBlk** (*string*)   String with the printed rows cut to fields
+                                of columns, or None if an entry does not fit
+                                in the field of its column
 
-        # Force a new line after the last row
-        if (iRowSpaces == 0) and (inxRow == nRows - 1):
-            strArray = strArray + '\n'
+    """
 
-    strArray = strArray + '\n'   # Add a new line at the end of the array
-    return strArray
+    arrChr = np.frombuffer(strBlk.encode('ascii'), dtype=np.uint8)
+    arrChr = arrChr.reshape(-1, arrFieldMask.size)
+    if np.any(arrChr[:, ~arrFieldMask] != ord(' ')):
+        return None
+    strBlk = arrChr[:, arrFieldMask].tobytes().decode('ascii')
+    return strBlk
 
 
 # %%#########################################################################
-def _2DgetTechnical(arrA, strFormat, strDelimiter):
+def _2DgetRowSizes(hPlan, nChrDelim, iLineSpaces, iRowSpaces):
     """
-    Function computes technical parameters of 2D-array printing
+    Function computes the number of characters in a printed row of 2D array
+
+    Every printed entry of a column has the same width, so every printed
+    row has the same number of characters. Rows which start with indices of
+    columns are longer by the number of characters in the indices.
 
 
     Input:
 
-    - 1 **arrA** (*NumPy array*)      Array to be printed
+    - 1 **hPlan** (*PrintPlan*)       The layout of the printed array
 
-    - 2 **strFormat** (*string*)      Format of printing entires of the array
+    - 2 **nChrDelim** (*int*)         The number of characters (or bytes)
+                                      in the delimiter
 
-    - 3 **strDelimiter** (*string*)   Delimiter printed between the entries
-                                      of the array
+    - 3 **iLineSpaces** (*int*)       The number of spaces between printed
+                                      lines
+
+    - 4 **iRowSpaces** (*int*)        The number of spaces between printed
+                                      rows
 
     Output:
 
-    - 1 **nRows** (*int*)         The number of rows in the array
+    - 1 **nChrRow** (*int*)           The number of characters in a printed
+                                      row, with new lines after the row
 
-    - 2 **nCols** (*int*)         The number of columns in the array
+    - 2 **nChrCols** (*int*)          The number of characters in indices of
+                                      columns printed before a row
 
-    - 3 **nD** (*int*)            The number of characters in the delimter
+    """
 
-    - 4 **nMaxChrEnt** (*int*)    The maximum number of characters in entries
-                                  of the array
+    nLines = hPlan.nLines      # The number of lines in a row
 
-    - 5 **nMaxChrIndR** (*int*)   The maximum number of characters in indices
-                                  of rows of the array
+    # Every line starts with index of a row (or with spaces over the index)
+    # and 2 characters margin, and ends with a new line
+    nChrRow = nLines * (hPlan.nMaxChrIndR + 3) + \
+        (nLines - 1) * iLineSpaces + iRowSpaces + \
+        int(hPlan.arrFieldStart[-1]) + hPlan.nColsV * (nChrDelim - hPlan.nD)
+    nChrCols = sum([len(strColumns) for strColumns in hPlan.lColumns])
 
-    - 6 **nMaxChrIndC** (*int*)   The maximum number of characters in indices
-                                  of columns of the array
+    return (nChrRow, nChrCols)
 
-    - 7 **nMinChrEnt** (*int*)    The minimum number of characters in entries
-                                  of the array
 
+# %%#########################################################################
+def _2DgetTechnical(nRows, nCols, strDelimiter):
     """
+    Function computes technical parameters of 2D-array printing
 
-    # --------------------------------------------------------------------
-    # Count how many +inf, -inf and nan are in the array.
-    # Change inf, -inf and nan into 0
-    arrA_nan = np.isnan(arrA)                # Positions of nan values in A
-    arrA[arrA_nan] = 0                       # Change nans into 0
-    nNan = \
-        (arrA_nan[arrA_nan == True]).size    # The number of nan values in A
-
-    arrA_pinf = np.isinf(arrA) * (arrA >= 0)  # Positions of +inf values in A
-    arrA[arrA_pinf] = 0                       # Change +infs into 0
-    nPInf = \
-        (arrA_pinf[arrA_pinf == True]).size   # The number of +inf values in A
-
-    arrA_ninf = np.isinf(arrA) * (arrA < 0)   # Positions of -inf values in A
-    arrA[arrA_ninf] = 0                       # Change -infs into 0
-    nNInf = \
-        (arrA_ninf[arrA_ninf == True]).size   # The number of -inf values in A
-    # --------------------------------------------------------------------
 
-    # --------------------------------------------------------------------
-    # Get the higest number of characters in...
+    Input:
 
-    # Decode the string with printing format
-    (bInt, nM) = _decodeString(strFormat)
+    - 1 **nRows** (*int*)             The number of rows in the array
 
-    # ... integer part of elements of the array...
-    iMaxAbsInt = np.floor(np.max(np.abs(arrA)))
-    nX = np.ceil(np.log10(iMaxAbsInt + 1)).astype(int)
-    if (nX == 0):
-        nX = 1
-    nMaxChrEnt = nX + nM                # ... entries of the array
-    if bInt == 0:                       # Add 1 due of . in float numbers
-        nMaxChrEnt = nMaxChrEnt + 1     # ^
-    if (arrA[arrA < 0].size) > 0:       # Add 1 due to '-' in negative numbers
-        nMaxChrEnt = nMaxChrEnt + 1     # ^
+    - 2 **nCols** (*int*)             The number of columns in the array
 
-    # If there is nan in the array, the minumum value of
-    # the max number of characters in entries is 3
-    if (nNan > 0) and (nMaxChrEnt < 3):
-        nMaxChrEnt = 3
+    - 3 **strDelimiter** (*string*)   Delimiter printed between the entries
+                                      of the array
 
-    # If there is inf in the array, the minumum value of
-    # the max number of characters in entries is 3
-    if (nPInf > 0) and (nMaxChrEnt < 3):
-        nMaxChrEnt = 3
+    Output:
 
-    # If there is -inf in the array, the minumum value of
-    # the max number of characters in entries is 4
-    if (nNInf > 0) and (nMaxChrEnt < 4):
-        nMaxChrEnt = 4
+    - 1 **nD** (*int*)            The number of characters in the delimter
+
+    - 2 **nMaxChrIndR** (*int*)   The maximum number of characters in indices
+                                  of rows of the array
+
+    - 3 **nMaxChrIndC** (*int*)   The maximum number of characters in indices
+                                  of columns of the array
 
-    # ----
-    (nRows, nCols) = arrA.shape  # Get the dimensions of the array
+    """
 
     # ...the number of rows in the array
     nMaxChrIndR = np.ceil(np.log10(nRows)).astype(int)
@@ -1226,52 +6624,7 @@ def _2DgetTechnical(arrA, strFormat, strDelimiter):
 
     nD = len(strDelimiter)                             # ...delimiter
 
-    # --------------------------------------------------------------------
-    # Get the lowest number of characters in...
-
-    # ...integer part of elements of the array
-    iMinAbsInt = np.floor(np.min(np.abs(arrA)))
-    nXl = np.ceil(np.log10(iMinAbsInt + 1)).astype(int)
-    if nXl == 0:
-        nXl = 1
-
-    # ... entries of the array
-    nMinChrEnt = nXl + nM
-
-    # Add 1 due to . in float numbers
-    if bInt == 0:
-        nMinChrEnt = nMinChrEnt + 1
-
-    # Add 1 due to '-' in all negative numbers
-    if (arrA[arrA >= 0].size) == 0:
-        nMinChrEnt = nMinChrEnt + 1
-
-    # If there is nan in the array, the maximum value of the
-    # min number of characters in entries is 3
-    if (nNan > 0) and (nMinChrEnt > 3):
-        nMinChrEnt = 3
-
-    # If there is inf in the array, the maximum value of the
-    # min number of characters in entries is 3
-    if (nPInf > 0) and (nMinChrEnt > 3):
-        nMinChrEnt = 3
-
-    # If there is -inf in the array, the maximum value of the
-    # min number of characters in entries is 4
-    if (nNInf > 0) and (nMinChrEnt > 4):
-        nMinChrEnt = 4
-
-    # --------------------------------------------------------------------
-    # Restore correct positions of +inf, -inf and nan in the array
-    if nNan > 0:
-        arrA[arrA_nan] = np.nan
-    if nPInf > 0:
-        arrA[arrA_pinf] = np.inf
-    if nNInf > 0:
-        arrA[arrA_ninf] = -np.inf
-    # --------------------------------------------------------------------
-
-    return (nRows, nCols, nD, nMaxChrEnt, nMaxChrIndR, nMaxChrIndC, nMinChrEnt)
+    return (nD, nMaxChrIndR, nMaxChrIndC)
 
 
 # %%#########################################################################
@@ -1427,31 +6780,119 @@ def _2DgetLineParam(iMaxCols, iMaxEntr, nCols, nD, nMaxChrEnt, nMaxChrIndR,
     return (nLines, nEntrypLine, nEntrypLastLine)
 
 
+# %%#########################################################################
+def _2DgetLineWidths(iMaxCols, iMaxEntr, lPlaces, nMaxChrIndR):
+    """
+    Function computes the line printing parameters for 2D printing, if every
+    column has its own width
+
+    A line is filled with as many places for entries as fit in the line,
+    the places are taken by comparing their cumulative widths with the width
+    of a line.
+
+
+    Input:
+
+    - 1 **iMaxCols** (*int*)           The maximum number of text columns used
+                                       to print a single row
+
+    - 2 **iMaxEntr** (*int*)           The maximum number of entries printed
+                                       in a single line
+
+    - 3 **lPlaces** (*list*)           The number of characters in every
+                                       place for an entry (with a delimiter)
+
+    - 4 **nMaxChrIndR** (*int*)        The maximum number of characters
+                                       in indices of row
+
+    Output:
+
+    - 1 **lLines** (*list*)            Places for entries in every printed
+                                       line (see _getLines)
+
+    """
+
+    # The number of characters available for entries in one line
+    nChrLine = iMaxCols - 4 - 1 - nMaxChrIndR
+
+    # The number of characters in all the places up to the end of a place
+    arrEnd = np.cumsum(lPlaces)
+
+    lLines = []
+    iStart = 0
+    nChrBefore = 0
+    while iStart < len(lPlaces):
+        iStop = np.searchsorted(arrEnd, nChrBefore + nChrLine, side='right')
+        iStop = int(min(iStop, iStart + iMaxEntr))
+
+        # Check if it is possible to print at least one entry?
+        if (iStop <= iStart):
+            strMsg = 'The requested line is to short to print a single entry'
+            raise ValueError(strMsg)
+
+        lLines.append((iStart, iStop))
+        nChrBefore = arrEnd[iStop - 1]
+        iStart = iStop
+
+    return lLines
+
+
 # %%##########################################################################
-def _2DprintColumns(iStartCol, nEntries, strAddSpaceIndC, lSpacesIndC,
-                    nMaxChrIndR, nD):
+def _2DcreateFieldFormats(lFields, strFormat, strDelimiter):
     """
-    Function prints indices of columns for 2D array
+    Function creates formats which print indices and entries of consecutive
+    columns of 2D array, if every column has its own width
+
+    Indices and entries are aligned to the right of fields of columns.
 
 
     Input:
 
-    - 1 **iStartCol** (*int*)            Index of the first columns to
-                                         be printed
+    - 1 **lFields** (*list*)           The number of characters in fields of
+                                       the columns
+
+    - 2 **strFormat** (*string*)       Format of printing entries of the array
+
+    - 3 **strDelimiter** (*string*)    Delimiter printed between the entries
+                                       of the array
+
+    Output:
+
+    - 1 **strIndFormat** (*string*)    Format which prints indices of
+                                       the columns
 
-    - 2 **nEntries** (*int*)             The number of entries for which the
-                                         indices of columns will be printed
+    - 2 **strEntryFormat** (*string*)  Format which prints entries of
+                                       the columns
 
-    - 3 **strAddSpaceIndC** (*string*)   A string with an additional space
+    """
+
+    nD = len(strDelimiter)
+    strIndFormat = ''.join(['%%%dd:%s' % (nField - 1, nD * ' ')
+                            for nField in lFields])
+    strEntryFormat = ''.join([_createEntryFormat(strFormat, nField, '',
+                                                 strDelimiter)
+                              for nField in lFields])
+    return (strIndFormat, strEntryFormat)
+
+
+# %%##########################################################################
+def _2DprintColumns(rInd, strAddSpaceIndC, lSpacesIndC, nD):
+    """
+    Function prints indices of columns for 2D array
+
+
+    Input:
+
+    - 1 **rInd** (*range*)               Indices of the columns to be
+                                         printed
+
+    - 2 **strAddSpaceIndC** (*string*)   A string with an additional space
                                          added to indices of entries
 
-    - 4 **lSpacesIndC** (*list*)         A list with spaces which should be
+    - 3 **lSpacesIndC** (*list*)         A list with spaces which should be
                                          added to indices of columns
 
-    - 5 **nMaxChrIndR** (*int*)          A list with spaces which should be
-                                         added to indices of rows
-
-    - 6 **nD** (*int*)                   The number of characters in
+    - 4 **nD** (*int*)                   The number of characters in
                                          the delimter
 
     Output:
@@ -1461,27 +6902,14 @@ def _2DprintColumns(iStartCol, nEntries, strAddSpaceIndC, lSpacesIndC,
 
     """
 
-    # Print space which is over indices of rows + 2 characters margin
-    strArray = (nMaxChrIndR * ' ') + (2 * ' ')
-
-    # Get the lowest number of digits in indices of columns
-    nIndDigL = np.ceil(np.log10(iStartCol + 1)).astype(int)
-    if nIndDigL == 0:
-        nIndDigL = 1
-
-    nDigs = nIndDigL     # The current number of digits
-    iThr = 10 ** nDigs   # Next threshold which changes the number of digits
-
-    # Loop over all indices of columns
-    for inxCol in np.arange(iStartCol, iStartCol + nEntries):
-        if inxCol == iThr:       # Threshold is reached
-            nDigs = nDigs + 1    # The number of digits
-            iThr = iThr * 10     # Threshold
+    # Create the format which prints one index of a column, the index is
+    # aligned to the right, exactly as if spaces from lSpacesIndC were added
+    # before it
+    strIndFormat = '%s%%%dd:%s' \
+        % (strAddSpaceIndC, len(lSpacesIndC) - 1, nD * ' ')
 
-        # Print the current column
-        strArray = strArray + ('%s%s%d:%s') \
-            % (strAddSpaceIndC, lSpacesIndC[nDigs], inxCol, nD * ' ')
-    strArray = strArray + '\n'
+    # Print all the indices of columns in one go
+    strArray = (strIndFormat * len(rInd)) % tuple(rInd)
     return strArray
 
 
@@ -1518,30 +6946,32 @@ def _2DprintInxRow(inxRow, lSpacesIndR):
 
 
 # %%##########################################################################
-def _2DprintRow(arrA, inxRow, iStartCol, nEntries, nMaxChrEnt, strFormat,
-                strAddSpaceEnt, lSpacesEnt, strDelimiter):
+def _2DprintRow(lRow, iStartCol, nEntries, nMaxChrEnt, strFormat,
+                strEntryFormat, strAddSpaceEnt, lSpacesEnt, strDelimiter):
     """
     Function prints selected entries from the current row for a 2D array
 
 
     Input:
 
-    - 1 **arrA** (*NumPy array*)           Array to be printed
-
-    - 2 **inxRow** (*int*)                 Index of the rows from which the
-                                           entries are printed
+    - 1 **lRow** (*list*)                  List with entries of the row from
+                                           which the entries are printed
 
-    - 3 **iStartCol** (*int*)              Index of the first column from
+    - 2 **iStartCol** (*int*)              Index of the first column from
                                            which the entries are printed
 
-    - 4 **nEntries** (*int*)               The number of entries to be printed
+    - 3 **nEntries** (*int*)               The number of entries to be printed
 
-    - 5 **nMaxChrEnt** (*int*)             The maximum number of characters in
+    - 4 **nMaxChrEnt** (*int*)             The maximum number of characters in
                                            entries of the array
 
-    - 6 **strFormat** (*string*)           Format of printing entries of
+    - 5 **strFormat** (*string*)           Format of printing entries of
                                            the array
 
+    - 6 **strEntryFormat** (*string*)      Format which prints one aligned
+                                           entry (created by
+                                           _createEntryFormat)
+
     - 7 **strAddSpaceEnt** (*string*)      A string with an additional space
                                            added to entries
 
@@ -1557,24 +6987,183 @@ def _2DprintRow(arrA, inxRow, iStartCol, nEntries, nMaxChrEnt, strFormat,
 
     """
 
-    # Create a command which prints a single entry
-    strPrintEntry = '\'%s\' %% (arrA[inxRow, inxEntr])' % (strFormat)
+    # Print all the selected entries in one go
+    iStartCol = int(iStartCol)
+    strArray = _formatEntries(lRow[iStartCol:iStartCol + int(nEntries)],
+                              strFormat, strEntryFormat, nMaxChrEnt,
+                              strAddSpaceEnt, lSpacesEnt, strDelimiter)
+    return strArray
 
-    strArray = ''
-    # Loop over all entries in a row
-    for inxEntr in np.arange(iStartCol, iStartCol + nEntries):
 
-        # Create the current entry
-        strEntry = eval(strPrintEntry)
+# %%#########################################################################
+def _NDarray(arrA, strArrayName, strFormat, iRowBrake, strDelimiter, iMaxCols,
+             iMaxEntr, bPrintHeader, iLineSpaces, iRowSpaces, iBlockSize,
+             nWorkers, iEdgeItems, rRows, rCols, bColWidths, hStats,
+             hPlan):
+    """
+    Function prints N-D numpy array as 2D slices
 
-        # The number of characters in the current entry
-        nChrEntry = len(strEntry)
+    The array is printed as a stream of 2D slices (the last two dimensions
+    of the array). Every slice is labelled with its leading indices, e.g.
+    '[1, 0, :, :]', and it is printed exactly as a 2D array, with the layout
+    shared by all the slices. If only the first and the last iEdgeItems
+    entries are printed, there are gaps printed with '...' between the first
+    and the last slices in the leading dimensions.
 
-        # The lenght of a space which must be added
-        nSpace = nMaxChrEnt - nChrEntry
 
-        # Print the entry
-        strArray += ('%s%s%s%s') \
-            % (strAddSpaceEnt, lSpacesEnt[nSpace], strEntry, strDelimiter)
+    Input:
 
-    return strArray
+    - 1 ... 19                        The printing parameters,
+                                      statistics of printing and the
+                                      layout, the same as for _2Darray
+
+    Output:
+
+    - 1 **iterArray** (*generator*)   Generator which yields strings with
+                                      consecutive parts of the printed numpy
+                                      array
+
+    """
+
+    # Get the layout shared by all the slices of the array
+    hPlan = _getPlan(arrA, strFormat, iRowBrake, strDelimiter, iMaxCols,
+                     iMaxEntr, 0, iBlockSize, iEdgeItems, rRows, rCols,
+                     bColWidths, hStats, hPlan)
+
+    # Add a header, if requested
+    yield _printHeader(arrA, strArrayName, bPrintHeader)
+
+    # Print blocks of rows of all the slices, in order
+    iterTasks = _NDgetTasks(arrA, strArrayName, hPlan, iLineSpaces,
+                            iRowSpaces, iBlockSize, iEdgeItems,
+                            int(hStats is not None))
+    for (strBefore, strRows) in _2DrunTasks(iterTasks, nWorkers, hStats):
+        yield strBefore
+        yield strRows
+
+
+# %%#########################################################################
+def _NDgetTasks(arrA, strArrayName, hPlan, iLineSpaces, iRowSpaces,
+                iBlockSize, iEdgeItems, bStats):
+    """
+    Function creates tasks which print blocks of rows of 2D slices of N-D
+    numpy array
+
+    A task is a string printed before a block (a label of a slice or a gap)
+    and parameters of _2DprintBlock (see _2DrunTasks).
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      Array to be printed
+
+    - 2 **strArrayName** (*string*)   Name of the array
+
+    - 3 **hPlan** (*PrintPlan*)       The layout shared by all the slices
+
+    - 4 **iLineSpaces** (*int*)       The number of spaces between printed
+                                      lines
+
+    - 5 **iRowSpaces** (*int*)        The number of spaces between printed
+                                      rows
+
+    - 6 **iBlockSize** (*int*)        The number of entries of the array
+                                      which are printed in one block
+
+    - 7 **iEdgeItems** (*int*)        The number of the first and the last
+                                      printed entries in every dimension
+                                      (0 - all the entries are printed)
+
+    - 8 **bStats** (*int*)            Collect statistics of printing?
+
+    Output:
+
+    - 1 **iterTasks** (*generator*)   Generator which yields tasks
+
+    """
+
+    # Rows are taken from the slices in blocks
+    nRowsBlk = max(1, iBlockSize // max(hPlan.nColsV, 1))
+
+    for (tInd, arrS) in _NDiterSlices(arrA, iEdgeItems):
+
+        # A gap between the first and the last slices
+        if tInd is None:
+            yield ('...\n\n', None)
+            continue
+
+        # Label of the slice
+        strLabel = '%s[%s]\n' \
+            % (strArrayName, ', '.join(['%d' % i for i in tInd] + [':', ':']))
+
+        # If only the first and the last rows or columns are printed, print
+        # the parts of the slice, there is a gap between the parts
+        lParts = _getEdgeParts(arrS, iEdgeItems)
+        if (len(lParts) > 1) or (hPlan.nColsV < hPlan.nCols):
+            for (inxPart, (iStartRow, arrPart)) in enumerate(lParts):
+                if inxPart == 0:
+                    strBefore = strLabel
+                else:
+                    strBefore = '...'.rjust(hPlan.nMaxChrIndR) + '\n' + \
+                        iRowSpaces * '\n'
+                yield (strBefore, (arrPart, iStartRow, hPlan, iLineSpaces,
+                                   iRowSpaces, iBlockSize, bStats))
+
+        # Print all the rows of the slice, block by block
+        else:
+            for (iStartRow, arrBlk) in _iterBlocks(arrS, nRowsBlk):
+                strBefore = strLabel if iStartRow == 0 else ''
+                yield (strBefore, (arrBlk, iStartRow, hPlan, iLineSpaces,
+                                   iRowSpaces, iBlockSize, bStats))
+
+        yield ('\n', None)   # Add a new line at the end of the slice
+
+
+# %%#########################################################################
+def _NDiterSlices(arrA, iEdgeItems):
+    """
+    Function takes printed 2D slices of N-D numpy array
+
+    Slices are views of the array, nothing is copied. If only the first and
+    the last iEdgeItems entries are printed, only these slices are taken in
+    the leading dimensions, and a gap is marked between them.
+
+
+    Input:
+
+    - 1 **arrA** (*NumPy array*)      N-D array to be printed
+
+    - 2 **iEdgeItems** (*int*)        The number of the first and the last
+                                      printed entries in every dimension
+                                      (0 - all the entries are printed)
+
+    Output:
+
+    - 1 **iterSlices** (*generator*)  Generator which yields leading indices
+                                      of a slice and the slice, or None and
+                                      None for a gap between slices
+
+    """
+
+    # Printed indices in the leading dimensions
+    lIndices = []
+    for nEnt in arrA.shape[:-2]:
+        if _getEdgeSize(nEnt, iEdgeItems) < nEnt:
+            lEdges = list(range(iEdgeItems)) + \
+                list(range(nEnt - iEdgeItems, nEnt))
+            lIndices.append(lEdges)
+        else:
+            lIndices.append(range(nEnt))
+
+    tPrevInd = None
+    for tInd in itertools.product(*lIndices):
+
+        # There is a gap, if the first changed index skips some entries
+        if tPrevInd is not None:
+            iAxis = [iPrev == i for (iPrev, i) in zip(tPrevInd, tInd)] \
+                .index(False)
+            if tInd[iAxis] - tPrevInd[iAxis] > 1:
+                yield (None, None)
+
+        yield (tInd, arrA[tInd])
+        tPrevInd = tInd